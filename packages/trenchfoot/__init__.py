@@ -2,17 +2,20 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from .trench_scene_generator_v3 import (
     BoxSpec,
     GroundSpec,
+    MeshSizeSpec,
     NoiseSpec,
     PipeSpec,
     SceneSpec,
     SphereSpec,
     SurfaceMeshFiles,
     SurfaceMeshResult,
+    TessellationSpec,
+    TrenchPath,
     build_scene,
     generate_surface_mesh,
     load_scene_spec_from_json,
@@ -26,11 +29,14 @@ from .generate_scenarios import (
     gmsh_available,
 )
 
-try:  # optional gmsh dependency
+# The mesher imports gmsh lazily, so this import stays cheap; generate_trench_volume()
+# raises ImportError on first use when gmsh is missing.
+try:
     from .gmsh_sloped_trench_mesher import (
         VolumeMeshResult,
         build_trench_volume_from_spec,
         generate_trench_volume,
+        generate_trench_volume_levels,
     )
 except Exception as _gmsh_exc:  # pragma: no cover - triggered when gmsh unavailable
 
@@ -40,18 +46,26 @@ except Exception as _gmsh_exc:  # pragma: no cover - triggered when gmsh unavail
     def build_trench_volume_from_spec(*args: Any, **kwargs: Dict[str, Any]) -> str:
         raise ImportError("gmsh is required for volumetric mesh generation") from _gmsh_exc
 
+    def generate_trench_volume_levels(*args: Any, **kwargs: Dict[str, Any]) -> List["VolumeMeshResult"]:
+        raise ImportError("gmsh is required for volumetric mesh generation") from _gmsh_exc
+
     VolumeMeshResult = None  # type: ignore
 
+from .mesher_pool import MesherPool
+
 
 __all__ = [
     "BoxSpec",
     "GroundSpec",
+    "MeshSizeSpec",
     "NoiseSpec",
     "PipeSpec",
     "SceneSpec",
     "SphereSpec",
     "SurfaceMeshFiles",
     "SurfaceMeshResult",
+    "TessellationSpec",
+    "TrenchPath",
     "build_scene",
     "generate_surface_mesh",
     "load_scene_spec_from_json",
@@ -63,5 +77,7 @@ __all__ = [
     "gmsh_available",
     "VolumeMeshResult",
     "generate_trench_volume",
+    "generate_trench_volume_levels",
     "build_trench_volume_from_spec",
+    "MesherPool",
 ]
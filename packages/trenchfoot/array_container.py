@@ -0,0 +1,154 @@
+"""Single-file, memory-mappable container for named numpy arrays.
+
+Layout::
+
+    8 bytes   magic b"TFARRAY1"
+    8 bytes   little-endian uint64 header length
+    header    UTF-8 JSON {"arrays": {name: {dtype, shape, offset}}, "metadata": {...}}
+    data      every array C-contiguous at a 64-byte aligned offset
+
+Because each array sits at a fixed, aligned offset, a reader maps the file
+once and hands out zero-copy ``np.frombuffer`` views, so opening a container
+is cheap and only the arrays actually indexed are paged in.
+
+Written with ``compress=True``, arrays that shrink under zlib are stored
+compressed (their table entry gains ``"codec": "zlib"`` and ``"nbytes"``)
+and are inflated into memory when indexed; the rest stay mappable.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+import numpy as np
+
+MAGIC = b"TFARRAY1"
+ALIGNMENT = 64
+ZLIB_LEVEL = 1  # fast; integer tag/connectivity arrays compress well even at level 1
+
+
+def _align(n: int) -> int:
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_array_container(
+    path: str | Path,
+    arrays: Mapping[str, np.ndarray],
+    metadata: Optional[Dict[str, Any]] = None,
+    *,
+    compress: bool = False,
+) -> Path:
+    """Write ``arrays`` and JSON-serializable ``metadata`` to ``path``.
+
+    The file is written next to its target and renamed into place, so
+    readers never see a partially written container. ``compress`` stores
+    each array zlib-compressed when that makes it smaller.
+    """
+    target = Path(path)
+    prepared: Dict[str, Any] = {name: np.ascontiguousarray(arr) for name, arr in arrays.items()}
+
+    # Offsets are relative to the aligned start of the data section, which
+    # keeps the header size independent of the offsets it records.
+    table: Dict[str, Dict[str, Any]] = {}
+    cursor = 0
+    for name, arr in prepared.items():
+        table[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": cursor}
+        nbytes = arr.nbytes
+        if compress and nbytes:
+            packed = zlib.compress(arr.data, ZLIB_LEVEL)
+            if len(packed) < nbytes:
+                prepared[name] = packed
+                nbytes = len(packed)
+                table[name].update(codec="zlib", nbytes=nbytes)
+        cursor = _align(cursor + nbytes)
+    header = json.dumps({"arrays": table, "metadata": metadata or {}}).encode("utf-8")
+    data_start = _align(len(MAGIC) + 8 + len(header))
+
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as fh:
+        fh.write(MAGIC)
+        fh.write(len(header).to_bytes(8, "little"))
+        fh.write(header)
+        fh.write(b"\0" * (data_start - len(MAGIC) - 8 - len(header)))
+        for name, arr in prepared.items():
+            fh.write(b"\0" * (data_start + table[name]["offset"] - fh.tell()))
+            fh.write(arr if isinstance(arr, bytes) else arr.data)
+    os.replace(tmp, target)
+    return target
+
+
+class ArrayContainer:
+    """Reader for files produced by :func:`write_array_container`.
+
+    With ``mmap_mode="r"`` (the default) the file is mapped once and arrays
+    are read-only views into the mapping; with ``mmap_mode=None`` each array
+    is read into memory when it is first requested. Compressed arrays are
+    always inflated into memory (read-only under ``mmap_mode="r"``).
+    """
+
+    def __init__(self, path: str | Path, mmap_mode: Optional[str] = "r"):
+        if mmap_mode not in ("r", None):
+            raise ValueError("mmap_mode must be 'r' or None")
+        self.path = Path(path)
+        with self.path.open("rb") as fh:
+            if fh.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a trenchfoot array container")
+            header_len = int.from_bytes(fh.read(8), "little")
+            header = json.loads(fh.read(header_len).decode("utf-8"))
+            self._buffer = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) if mmap_mode else None
+        self._data_start = _align(len(MAGIC) + 8 + header_len)
+        self._table: Dict[str, Dict[str, Any]] = header["arrays"]
+        self.metadata: Dict[str, Any] = header["metadata"]
+
+    def is_compressed(self, name: str) -> bool:
+        """Whether ``name`` is stored zlib-compressed (and so not memory-mapped)."""
+        return self._table[name].get("codec") == "zlib"
+
+    def keys(self):
+        return self._table.keys()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._table
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        entry = self._table[name]
+        dtype = np.dtype(entry["dtype"])
+        shape = tuple(entry["shape"])
+        count = int(np.prod(shape, dtype=np.int64))
+        offset = self._data_start + entry["offset"]
+        if count == 0:
+            arr = np.empty(shape, dtype)
+            arr.flags.writeable = self._buffer is None
+            return arr
+        if entry.get("codec") == "zlib":
+            nbytes = int(entry["nbytes"])
+            if self._buffer is not None:
+                raw = zlib.decompress(self._buffer[offset : offset + nbytes])
+                arr = np.frombuffer(raw, dtype=dtype, count=count)
+            else:
+                with self.path.open("rb") as fh:
+                    fh.seek(offset)
+                    raw = bytearray(zlib.decompress(fh.read(nbytes)))
+                arr = np.frombuffer(raw, dtype=dtype, count=count)
+        elif self._buffer is not None:
+            arr = np.frombuffer(self._buffer, dtype=dtype, count=count, offset=offset)
+        else:
+            with self.path.open("rb") as fh:
+                fh.seek(offset)
+                arr = np.fromfile(fh, dtype=dtype, count=count)
+        return arr.reshape(shape)
+
+
+def read_array_container(path: str | Path, mmap_mode: Optional[str] = "r") -> ArrayContainer:
+    """Open an array container; see :class:`ArrayContainer`."""
+    return ArrayContainer(path, mmap_mode=mmap_mode)
@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmarks.py
+
+Performance harness for the surface generator and the gmsh mesher. Times
+``import trenchfoot`` in a fresh interpreter and every pipeline stage on the
+bundled presets (S01–S07) and on synthetic scaling families, writes
+machine-readable JSON, and compares a run against a stored baseline so
+regressions are caught before release.
+
+Usage:
+  python -m trenchfoot.benchmarks run --out bench/results.json
+  python -m trenchfoot.benchmarks run --quick --compare bench/baseline.json
+  python -m trenchfoot.benchmarks compare bench/baseline.json bench/results.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .generate_scenarios import default_scenarios, gmsh_available
+    from .gmsh_sloped_trench_mesher import generate_trench_volume
+    from .timing import prefixed
+    from .trench_scene_generator_v3 import generate_surface_mesh, scene_spec_from_dict
+    from .versions import gmsh_version, trenchfoot_version
+except ImportError:  # pragma: no cover - direct script invocation
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from trenchfoot.generate_scenarios import default_scenarios, gmsh_available  # type: ignore
+    from trenchfoot.gmsh_sloped_trench_mesher import generate_trench_volume  # type: ignore
+    from trenchfoot.timing import prefixed  # type: ignore
+    from trenchfoot.trench_scene_generator_v3 import generate_surface_mesh, scene_spec_from_dict  # type: ignore
+    from trenchfoot.versions import gmsh_version, trenchfoot_version  # type: ignore
+
+RESULTS_FORMAT = "trenchfoot-bench"
+RESULTS_VERSION = 1
+
+FAMILIES = ("import", "presets", "path_vertices", "pipe_count", "noise", "lc")
+
+# Scaling parameters (full, quick)
+PATH_VERTEX_COUNTS = ((10, 100, 1000, 10000), (10, 100))
+PIPE_COUNTS = ((1, 10, 100, 500), (1, 10))
+LC_VALUES = ((0.5, 0.4, 0.3, 0.2, 0.15, 0.1), (0.5, 0.3))
+PRESET_LC = 0.4
+LC_SWEEP_PRESET = "S05_wide_slope_pair"
+# Directory that holds the trenchfoot package, for the fresh import subprocess
+PACKAGE_PARENT = Path(__file__).resolve().parents[1]
+NOISE_PRESET = "S04_U_slope_multi_noise"
+
+# One case run: returns (stage timings, size counters)
+CaseRunner = Callable[[Path], Tuple[Dict[str, float], Dict[str, int]]]
+
+
+@dataclass
+class BenchCase:
+    """A named, parameterised workload timed by :func:`run_benchmarks`."""
+
+    name: str
+    family: str
+    param: Any
+    run: CaseRunner
+    needs_gmsh: bool = False
+
+
+@dataclass
+class CaseResult:
+    """Fastest-of-``repeat`` timing for one case."""
+
+    name: str
+    family: str
+    param: Any
+    total: Optional[float]
+    stages: Dict[str, float] = field(default_factory=dict)
+    size: Dict[str, int] = field(default_factory=dict)
+    repeats: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class Comparison:
+    """One case/stage timing set against the baseline."""
+
+    case: str
+    stage: str
+    baseline: Optional[float]
+    current: Optional[float]
+    status: str  # "ok", "regression", "improvement", "new", "missing", "error"
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if not self.baseline or self.current is None:
+            return None
+        return self.current / self.baseline
+
+
+# ---------------- Workloads ----------------
+
+def _surface_size(result) -> Dict[str, int]:
+    return {
+        "triangles": int(sum(len(F) for _, F in result.groups.values())),
+        "vertices": int(sum(len(V) for V, _ in result.groups.values())),
+    }
+
+
+def _surface_runner(spec: Dict[str, Any], *, persist: bool, previews: bool) -> CaseRunner:
+    def run(workdir: Path) -> Tuple[Dict[str, float], Dict[str, int]]:
+        result = generate_surface_mesh(scene_spec_from_dict(spec), make_preview=previews)
+        if persist:
+            result.persist(workdir, include_previews=previews)
+        return prefixed(result.timings, "surface"), _surface_size(result)
+
+    return run
+
+
+_IMPORT_SCRIPT = (
+    "import json, sys, time\n"
+    "import numpy\n"
+    "before = len(sys.modules)\n"
+    "t0 = time.perf_counter()\n"
+    "import trenchfoot\n"
+    "elapsed = time.perf_counter() - t0\n"
+    "print(json.dumps([elapsed, len(sys.modules) - before]))\n"
+)
+
+
+def _import_runner(workdir: Path) -> Tuple[Dict[str, float], Dict[str, int]]:
+    """Time ``import trenchfoot`` in a fresh interpreter, after numpy is loaded."""
+    python_path = [str(PACKAGE_PARENT), os.environ.get("PYTHONPATH", "")]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in python_path if p)}
+    proc = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SCRIPT], capture_output=True, text=True, env=env, cwd=workdir, check=True
+    )
+    elapsed, modules = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {"import.trenchfoot": float(elapsed)}, {"modules": int(modules)}
+
+
+def _volume_runner(spec: Dict[str, Any], lc: float) -> CaseRunner:
+    def run(workdir: Path) -> Tuple[Dict[str, float], Dict[str, int]]:
+        result = generate_trench_volume(spec, lc=lc, persist_path=workdir / "trench_volume.msh")
+        size = {
+            "nodes": int(len(result.nodes)),
+            "elements": int(sum(len(block.element_tags) for block in result.element_blocks)),
+        }
+        return prefixed(result.timings, "volume"), size
+
+    return run
+
+
+def synthetic_path_spec(n_vertices: int, length: float = 40.0) -> Dict[str, Any]:
+    """Open sinusoidal trench with ``n_vertices`` centreline vertices and one pipe."""
+    xs = np.linspace(0.0, length, int(n_vertices))
+    ys = 1.5 * np.sin(xs / length * 4.0 * math.pi)
+    return {
+        "path_xy": np.column_stack([xs, ys]).tolist(),
+        "width": 1.0,
+        "depth": 1.2,
+        "wall_slope": 0.1,
+        "pipes": [{"radius": 0.1, "length": 0.8, "angle_deg": 30.0, "s_center": 0.5}],
+        "boxes": [],
+        "spheres": [],
+        "noise": {"enable": False},
+    }
+
+
+def synthetic_pipe_spec(n_pipes: int) -> Dict[str, Any]:
+    """Straight trench long enough to hold ``n_pipes`` short pipes at mixed angles and depths."""
+    length = max(5.0, 0.5 * n_pipes)
+    pipes = [
+        {
+            "radius": 0.08,
+            "length": 0.8,
+            "angle_deg": float((37 * i) % 180 - 90),
+            "s_center": (i + 0.5) / n_pipes,
+            "z": -0.3 - 0.6 * ((i * 0.618) % 1.0),
+        }
+        for i in range(n_pipes)
+    ]
+    return {
+        "path_xy": [[0.0, 0.0], [length, 0.0]],
+        "width": 1.2,
+        "depth": 1.2,
+        "wall_slope": 0.1,
+        "pipes": pipes,
+        "boxes": [],
+        "spheres": [],
+        "noise": {"enable": False},
+    }
+
+
+def benchmark_cases(
+    *,
+    quick: bool = False,
+    families: Sequence[str] = FAMILIES,
+    previews: bool = True,
+) -> List[BenchCase]:
+    """Build the case list. ``quick`` trims the scaling families to their smallest sizes."""
+    unknown = set(families) - set(FAMILIES)
+    if unknown:
+        raise ValueError(f"Unknown benchmark families: {sorted(unknown)}")
+    tier = 1 if quick else 0
+    presets = {d.name: d.spec for d in default_scenarios()}
+    cases: List[BenchCase] = []
+    if "import" in families:
+        cases.append(BenchCase("import/trenchfoot", "import", "trenchfoot", _import_runner))
+    if "presets" in families:
+        for name, spec in presets.items():
+            cases.append(
+                BenchCase(f"presets/{name}/surface", "presets", name, _surface_runner(spec, persist=True, previews=previews))
+            )
+            cases.append(
+                BenchCase(f"presets/{name}/volume", "presets", name, _volume_runner(spec, PRESET_LC), needs_gmsh=True)
+            )
+    if "path_vertices" in families:
+        for n in PATH_VERTEX_COUNTS[tier]:
+            spec = synthetic_path_spec(n)
+            cases.append(
+                BenchCase(f"path_vertices/{n}", "path_vertices", n, _surface_runner(spec, persist=False, previews=False))
+            )
+    if "pipe_count" in families:
+        for n in PIPE_COUNTS[tier]:
+            spec = synthetic_pipe_spec(n)
+            cases.append(
+                BenchCase(f"pipe_count/{n}", "pipe_count", n, _surface_runner(spec, persist=False, previews=False))
+            )
+    if "noise" in families:
+        base = presets[NOISE_PRESET]
+        for enabled in (False, True):
+            spec = dict(base, noise=dict(base["noise"], enable=enabled))
+            label = "on" if enabled else "off"
+            cases.append(
+                BenchCase(f"noise/{label}", "noise", label, _surface_runner(spec, persist=False, previews=False))
+            )
+    if "lc" in families:
+        for lc in LC_VALUES[tier]:
+            cases.append(
+                BenchCase(f"lc/{lc:g}", "lc", lc, _volume_runner(presets[LC_SWEEP_PRESET], lc), needs_gmsh=True)
+            )
+    return cases
+
+
+# ---------------- Running ----------------
+
+def _environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "trenchfoot": trenchfoot_version(),
+        "gmsh": gmsh_version(),
+    }
+
+
+def _time_case(case: BenchCase, repeat: int) -> CaseResult:
+    best: Optional[CaseResult] = None
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="trenchfoot-bench-") as tmp:
+            start = time.perf_counter()
+            try:
+                stages, size = case.run(Path(tmp))
+            except Exception as exc:
+                return CaseResult(case.name, case.family, case.param, None, repeats=repeat, error=str(exc))
+            total = time.perf_counter() - start
+        if best is None or total < best.total:
+            best = CaseResult(case.name, case.family, case.param, total, stages, size, repeat)
+    assert best is not None
+    return best
+
+
+def run_benchmarks(
+    *,
+    quick: bool = False,
+    repeat: Optional[int] = None,
+    families: Sequence[str] = FAMILIES,
+    pattern: Optional[str] = None,
+    previews: bool = True,
+    volumes: bool = True,
+    progress: Optional[Callable[[CaseResult], None]] = None,
+) -> Dict[str, Any]:
+    """Time every selected case and return the results document.
+
+    Each case runs ``repeat`` times (default 3, or 1 with ``quick``) and keeps
+    the fastest repeat: its wall-clock ``total`` and the stage timings that
+    the generators recorded during it. Volume cases are skipped when gmsh is
+    unavailable or ``volumes`` is false; a case that raises is recorded with
+    its ``error`` instead of aborting the run.
+    """
+    repeat = repeat if repeat is not None else (1 if quick else 3)
+    if repeat < 1:
+        raise ValueError("repeat must be >= 1")
+    gmsh_ok = volumes and gmsh_available()
+    regex = re.compile(pattern) if pattern else None
+    results: List[CaseResult] = []
+    for case in benchmark_cases(quick=quick, families=families, previews=previews):
+        if regex is not None and not regex.search(case.name):
+            continue
+        if case.needs_gmsh and not gmsh_ok:
+            continue
+        result = _time_case(case, repeat)
+        results.append(result)
+        if progress is not None:
+            progress(result)
+    return {
+        "format": RESULTS_FORMAT,
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": _environment(),
+        "options": {
+            "quick": quick,
+            "repeat": repeat,
+            "families": list(families),
+            "filter": pattern,
+            "previews": previews,
+            "volumes": gmsh_ok,
+        },
+        "cases": [asdict(r) for r in results],
+    }
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    data = json.loads(Path(path).read_text())
+    if data.get("format") != RESULTS_FORMAT:
+        raise ValueError(f"{path} is not a {RESULTS_FORMAT} results file")
+    return data
+
+
+def write_results(path: Path, results: Dict[str, Any]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2))
+
+
+# ---------------- Comparing ----------------
+
+def _classify(baseline: float, current: float, threshold: float, min_seconds: float) -> str:
+    if abs(current - baseline) < min_seconds:
+        return "ok"
+    if current > baseline * (1.0 + threshold):
+        return "regression"
+    if current < baseline / (1.0 + threshold):
+        return "improvement"
+    return "ok"
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    *,
+    threshold: float = 0.25,
+    min_seconds: float = 0.01,
+) -> List[Comparison]:
+    """Compare case totals and stage timings of ``current`` against ``baseline``.
+
+    A timing regresses when it is more than ``threshold`` (relative) slower
+    *and* at least ``min_seconds`` slower, so sub-millisecond stages do not
+    flag on noise. A case that errors now but did not in the baseline is an
+    ``error``; cases only present on one side are ``new`` or ``missing``.
+    """
+    base_cases = {c["name"]: c for c in baseline.get("cases", [])}
+    cur_cases = {c["name"]: c for c in current.get("cases", [])}
+    rows: List[Comparison] = []
+    for name, cur in cur_cases.items():
+        base = base_cases.get(name)
+        if base is None:
+            rows.append(Comparison(name, "total", None, cur["total"], "new"))
+            continue
+        if cur["error"] is not None or base["error"] is not None:
+            status = "error" if cur["error"] is not None and base["error"] is None else "ok"
+            rows.append(Comparison(name, "total", base["total"], cur["total"], status))
+            continue
+        rows.append(
+            Comparison(name, "total", base["total"], cur["total"], _classify(base["total"], cur["total"], threshold, min_seconds))
+        )
+        for stage, seconds in cur["stages"].items():
+            if stage in base["stages"]:
+                base_seconds = base["stages"][stage]
+                status = _classify(base_seconds, seconds, threshold, min_seconds)
+                rows.append(Comparison(name, stage, base_seconds, seconds, status))
+    for name, base in base_cases.items():
+        if name not in cur_cases:
+            rows.append(Comparison(name, "total", base["total"], None, "missing"))
+    return rows
+
+
+def has_regressions(rows: Sequence[Comparison]) -> bool:
+    return any(row.status in ("regression", "error") for row in rows)
+
+
+# ---------------- Reporting ----------------
+
+def _fmt_seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.3f}"
+
+
+def _format_results_table(results: Dict[str, Any]) -> str:
+    header = f"{'Case':<44} {'Total (s)':>9}  {'Slowest stage':<32} {'Size':<24}"
+    rows = [header, "-" * len(header)]
+    for case in results["cases"]:
+        if case["error"] is not None:
+            slowest = f"error: {case['error']}"[:32]
+        elif case["stages"]:
+            stage, seconds = max(case["stages"].items(), key=lambda item: item[1])
+            slowest = f"{stage} ({seconds:.3f})"
+        else:
+            slowest = "-"
+        size = ", ".join(f"{k}={v}" for k, v in case["size"].items())
+        rows.append(f"{case['name']:<44} {_fmt_seconds(case['total']):>9}  {slowest:<32} {size:<24}")
+    return "\n".join(rows)
+
+
+def _format_comparison(rows: Sequence[Comparison], *, verbose: bool = False) -> str:
+    shown = [r for r in rows if verbose or r.status != "ok"]
+    counts: Dict[str, int] = {}
+    for row in rows:
+        counts[row.status] = counts.get(row.status, 0) + 1
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+    if not shown:
+        return f"No changes beyond threshold ({summary})."
+    header = f"{'Case':<44} {'Stage':<28} {'Base (s)':>9} {'Now (s)':>9} {'Ratio':>7}  Status"
+    lines = [header, "-" * len(header)]
+    for row in shown:
+        ratio = "-" if row.ratio is None else f"{row.ratio:.2f}x"
+        lines.append(
+            f"{row.case:<44} {row.stage:<28} {_fmt_seconds(row.baseline):>9} "
+            f"{_fmt_seconds(row.current):>9} {ratio:>7}  {row.status}"
+        )
+    lines.append(summary)
+    return "\n".join(lines)
+
+
+# ---------------- CLI ----------------
+
+def _add_compare_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Relative slowdown that counts as a regression (default: 0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.01,
+        help="Ignore differences smaller than this many seconds (default: 0.01)",
+    )
+    parser.add_argument("--verbose", action="store_true", help="List unchanged timings too")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark trenchfoot surface and volume generation.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="Run the benchmark cases and write JSON results")
+    run_p.add_argument("--out", type=Path, default=None, help="Write results JSON here")
+    run_p.add_argument("--quick", action="store_true", help="Smallest scaling sizes, one repeat")
+    run_p.add_argument("--repeat", type=int, default=None, help="Repeats per case (fastest is kept)")
+    run_p.add_argument(
+        "--family",
+        dest="families",
+        action="append",
+        choices=FAMILIES,
+        help="Only run this family (repeatable; default: all)",
+    )
+    run_p.add_argument("--filter", dest="pattern", default=None, help="Regex over case names")
+    run_p.add_argument("--no-preview", dest="previews", action="store_false", help="Skip preview rendering in preset cases")
+    run_p.add_argument("--skip-volumetric", dest="volumes", action="store_false", help="Skip gmsh cases")
+    run_p.add_argument("--compare", type=Path, default=None, help="Baseline results JSON to compare against")
+    _add_compare_options(run_p)
+
+    cmp_p = sub.add_parser("compare", help="Compare two results files")
+    cmp_p.add_argument("baseline", type=Path)
+    cmp_p.add_argument("current", type=Path)
+    _add_compare_options(cmp_p)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = run_benchmarks(
+            quick=args.quick,
+            repeat=args.repeat,
+            families=tuple(args.families) if args.families else FAMILIES,
+            pattern=args.pattern,
+            previews=args.previews,
+            volumes=args.volumes,
+            progress=lambda r: print(f"[bench] {r.name}: {_fmt_seconds(r.total)}", file=sys.stderr),
+        )
+        print(_format_results_table(results))
+        if args.out is not None:
+            write_results(args.out, results)
+            print(f"Results written to {args.out}")
+        baseline = load_results(args.compare) if args.compare is not None else None
+        if baseline is not None:
+            print()
+    else:
+        baseline = load_results(args.baseline)
+        results = load_results(args.current)
+
+    if baseline is None:
+        return 0
+    rows = compare_results(baseline, results, threshold=args.threshold, min_seconds=args.min_seconds)
+    print(_format_comparison(rows, verbose=args.verbose))
+    return 1 if has_regressions(rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,12 +9,14 @@ and optionally run the volumetric mesher (via Gmsh) when available.
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
 import shutil
 import sys
 import tempfile
-from dataclasses import dataclass, field
+import time
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Sequence
 
@@ -26,6 +28,8 @@ def _ensure_repo_on_path() -> None:
         sys.path.insert(0, str(_ROOT))
 
 try:
+    from .timing import prefixed, slowest_stage
+    from .versions import gmsh_version, trenchfoot_version
     from .trench_scene_generator_v3 import (
         SceneSpec,
         build_scene,
@@ -33,6 +37,8 @@ try:
     )
 except ImportError:  # pragma: no cover - direct script invocation
     _ensure_repo_on_path()
+    from trenchfoot.timing import prefixed, slowest_stage  # type: ignore
+    from trenchfoot.versions import gmsh_version, trenchfoot_version  # type: ignore
     from trenchfoot.trench_scene_generator_v3 import (  # type: ignore
         SceneSpec,
         build_scene,
@@ -56,6 +62,13 @@ def _load_gmsh_mesher() -> None:
         except Exception as exc:
             _gmsh_import_error = exc
             return
+    # The mesher defers ``import gmsh``; probe it here so availability still
+    # reflects whether gmsh itself can be loaded.
+    try:
+        _mesher.require_gmsh()
+    except Exception as exc:
+        _gmsh_import_error = exc
+        return
     _gmsh_mesher = _mesher
 
 
@@ -86,6 +99,10 @@ class ScenarioSummary:
     volumetric_lc: Optional[float]
     volumetric_error: Optional[str]
     pipe_clearances: List[Dict[str, Any]] = field(default_factory=list)
+    # Seconds per stage as "surface.<stage>" / "volume.<stage>", plus "total"
+    timings: Dict[str, float] = field(default_factory=dict)
+    # gmsh threads/algorithms the volume was meshed with (VolumeMeshResult.mesh_options)
+    volumetric_options: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -104,6 +121,8 @@ class ScenarioSummary:
             "volumetric_lc": self.volumetric_lc,
             "volumetric_error": self.volumetric_error,
             "pipe_clearances": self.pipe_clearances,
+            "timings": dict(self.timings),
+            "volumetric_options": dict(self.volumetric_options),
         }
 
 
@@ -117,6 +136,19 @@ class RunReport:
     volumetric_available: bool
     mesh_characteristic_length: float
     scenarios: List[ScenarioSummary]
+    cache_enabled: bool = False
+    cache_hits: List[str] = field(default_factory=list)
+    cache_misses: List[str] = field(default_factory=list)
+
+    def stage_totals(self) -> Dict[str, float]:
+        """Sum each stage's seconds over the scenarios built in this run (cache hits excluded)."""
+        totals: Dict[str, float] = {}
+        for scenario in self.scenarios:
+            if scenario.name in self.cache_hits:
+                continue
+            for stage, seconds in scenario.timings.items():
+                totals[stage] = totals.get(stage, 0.0) + seconds
+        return totals
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -125,6 +157,12 @@ class RunReport:
             "volumetric_requested": self.volumetric_requested,
             "volumetric_available": self.volumetric_available,
             "mesh_characteristic_length": self.mesh_characteristic_length,
+            "cache": {
+                "enabled": self.cache_enabled,
+                "hits": list(self.cache_hits),
+                "misses": list(self.cache_misses),
+            },
+            "timings": self.stage_totals(),
             "scenarios": [sc.to_dict() for sc in self.scenarios],
         }
 
@@ -459,14 +497,18 @@ def _build_surface(spec: SceneSpec, out_dir: Path, make_preview: bool) -> Dict[s
     return build_scene(spec, str(out_dir), make_preview=make_preview)
 
 
-def _build_volume(spec: Dict[str, Any], out_dir: Path, lc: float) -> tuple[Optional[Path], Optional[str], List[Dict[str, Any]]]:
+def _build_volume(
+    spec: Dict[str, Any], out_dir: Path, lc: float, mesh_options: Optional[Dict[str, Any]] = None
+) -> tuple[Optional[Path], Optional[str], List[Dict[str, Any]], Dict[str, float], Dict[str, Any]]:
     _load_gmsh_mesher()
     if _gmsh_mesher is None:
         reason = str(_gmsh_import_error) if _gmsh_import_error else "gmsh_not_available"
-        return None, reason, []
+        return None, reason, [], {}, {}
     out_dir.mkdir(parents=True, exist_ok=True)
     msh_path = out_dir / "trench_volume.msh"
     clearance_data: List[Dict[str, Any]] = []
+    timings: Dict[str, float] = {}
+    applied_options: Dict[str, Any] = {}
 
     try:
         if hasattr(_gmsh_mesher, "generate_trench_volume"):
@@ -474,12 +516,15 @@ def _build_volume(spec: Dict[str, Any], out_dir: Path, lc: float) -> tuple[Optio
                 spec,
                 lc=lc,
                 persist_path=str(msh_path),
+                **(mesh_options or {}),
             )
             clearance_data.extend(
                 [dict(entry) for entry in result.pipe_clearances]
                 if isinstance(result.pipe_clearances, list)
                 else []
             )
+            timings = dict(getattr(result, "timings", {}))
+            applied_options = dict(getattr(result, "mesh_options", {}))
             persisted = result.persisted_path if result.persisted_path is not None else Path(str(msh_path))
         else:
             _gmsh_mesher.build_trench_volume_from_spec(
@@ -487,10 +532,229 @@ def _build_volume(spec: Dict[str, Any], out_dir: Path, lc: float) -> tuple[Optio
             )
             persisted = Path(str(msh_path))
     except Exception as exc:  # pragma: no cover - gmsh failure
-        return None, str(exc), clearance_data
+        return None, str(exc), clearance_data, timings, applied_options
 
     final_path = Path(persisted)
-    return final_path, None, clearance_data
+    return final_path, None, clearance_data, timings, applied_options
+
+
+def _generate_scenario(
+    definition: ScenarioDefinition,
+    out_root: Path,
+    make_preview: bool,
+    gmsh_ok: bool,
+    mesh_characteristic_length: float,
+    mesh_options: Optional[Dict[str, Any]] = None,
+) -> ScenarioSummary:
+    """Generate one scenario's surface (+previews) and optional volume under ``out_root``."""
+    started = time.perf_counter()
+    scen_dir = out_root / definition.name
+    scen_dir.mkdir(parents=True, exist_ok=True)
+
+    spec_path = scen_dir / "scene.json"
+    _ensure_spec_written(spec_path, definition.spec)
+
+    scene_spec = scene_spec_from_dict(definition.spec)
+    surface_out = _build_surface(scene_spec, scen_dir, make_preview=make_preview)
+    timings = prefixed(surface_out["surface_result"].timings, "surface")
+
+    volumetric_path: Optional[Path] = None
+    volumetric_error: Optional[str] = None
+    pipe_clearances: List[Dict[str, Any]] = []
+    volumetric_options: Dict[str, Any] = {}
+    if gmsh_ok:
+        vol_dir = scen_dir / "volumetric"
+        (
+            volumetric_path,
+            volumetric_error,
+            pipe_clearances,
+            volume_timings,
+            volumetric_options,
+        ) = _build_volume(definition.spec, vol_dir, mesh_characteristic_length, mesh_options)
+        timings.update(prefixed(volume_timings, "volume"))
+        if volumetric_error:
+            print(
+                f"[volumetric] {definition.name} failed: {volumetric_error}",
+                file=sys.stderr,
+            )
+
+    return ScenarioSummary(
+        name=definition.name,
+        directory=scen_dir,
+        spec_path=spec_path,
+        surface_obj=Path(surface_out["obj_path"]),
+        metrics_path=scen_dir / "metrics.json",
+        preview_paths=[Path(p) for p in surface_out["previews"]],
+        preview_count=len(surface_out["previews"]),
+        object_counts=dict(surface_out["object_counts"]),
+        footprint_top=float(surface_out["metrics"]["footprint_area_top"]),
+        footprint_bottom=float(surface_out["metrics"]["footprint_area_bottom"]),
+        trench_from_surface=float(surface_out["metrics"]["volumes"]["trench_from_surface"]),
+        volumetric_path=volumetric_path,
+        volumetric_lc=mesh_characteristic_length if volumetric_path else None,
+        volumetric_error=volumetric_error,
+        pipe_clearances=pipe_clearances,
+        timings={**timings, "total": time.perf_counter() - started},
+        volumetric_options=volumetric_options,
+    )
+
+
+CACHE_STAMP_NAME = ".trenchfoot_cache.json"
+_CACHE_FORMAT = 1
+
+
+def _canonical(obj: Any) -> Any:
+    """Normalize a spec so equivalent JSON (``0`` vs ``0.0``, tuples vs lists) hashes alike."""
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    if isinstance(obj, bool) or obj is None or isinstance(obj, str):
+        return obj
+    if isinstance(obj, (int, float)):
+        return float(obj)
+    return str(obj)
+
+
+def scenario_cache_key(
+    spec: Dict[str, Any],
+    *,
+    make_preview: bool,
+    make_volumes: bool,
+    mesh_characteristic_length: float,
+    mesh_options: Optional[Dict[str, Any]] = None,
+) -> str:
+    """SHA-256 over the canonical spec, generation options and trenchfoot/gmsh versions.
+
+    ``make_volumes`` should be the effective setting (volumes requested *and* gmsh
+    available) so that a run without gmsh never satisfies a run that needs a mesh.
+    Of ``mesh_options`` everything set except the thread count (which does not
+    change the mesh) counts.
+    """
+    volume_options = {
+        k: v for k, v in (mesh_options or {}).items() if k != "threads" and v is not None and v is not False
+    }
+    payload = {
+        "format": _CACHE_FORMAT,
+        "spec": _canonical(asdict(scene_spec_from_dict(spec))),
+        "options": {
+            "make_preview": bool(make_preview),
+            "make_volumes": bool(make_volumes),
+            "lc": float(mesh_characteristic_length) if make_volumes else None,
+            **({"mesh_options": volume_options} if make_volumes and volume_options else {}),
+        },
+        "versions": {
+            "trenchfoot": trenchfoot_version(),
+            "gmsh": gmsh_version() if make_volumes else None,
+        },
+    }
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _summary_to_relative(summary: ScenarioSummary) -> Dict[str, Any]:
+    base = summary.directory
+
+    def rel(p: Optional[Path]) -> Optional[str]:
+        return None if p is None else Path(os.path.relpath(p, base)).as_posix()
+
+    data = summary.to_dict()
+    data.pop("directory")
+    data["spec_path"] = rel(summary.spec_path)
+    data["surface_obj"] = rel(summary.surface_obj)
+    data["metrics_path"] = rel(summary.metrics_path)
+    data["preview_paths"] = [rel(p) for p in summary.preview_paths]
+    data["volumetric_path"] = rel(summary.volumetric_path)
+    return data
+
+
+def _summary_from_relative(data: Dict[str, Any], scen_dir: Path) -> ScenarioSummary:
+    return ScenarioSummary(
+        name=data["name"],
+        directory=scen_dir,
+        spec_path=scen_dir / data["spec_path"],
+        surface_obj=scen_dir / data["surface_obj"],
+        metrics_path=scen_dir / data["metrics_path"],
+        preview_paths=[scen_dir / p for p in data["preview_paths"]],
+        preview_count=int(data["preview_count"]),
+        object_counts=dict(data["object_counts"]),
+        footprint_top=float(data["footprint_top"]),
+        footprint_bottom=float(data["footprint_bottom"]),
+        trench_from_surface=float(data["trench_from_surface"]),
+        volumetric_path=scen_dir / data["volumetric_path"] if data["volumetric_path"] else None,
+        volumetric_lc=data["volumetric_lc"],
+        volumetric_error=data["volumetric_error"],
+        pipe_clearances=list(data["pipe_clearances"]),
+        timings=dict(data.get("timings", {})),
+        volumetric_options=dict(data.get("volumetric_options", {})),
+    )
+
+
+def _summary_outputs_exist(summary: ScenarioSummary) -> bool:
+    paths = [summary.spec_path, summary.surface_obj, summary.metrics_path, *summary.preview_paths]
+    if summary.volumetric_path is not None:
+        paths.append(summary.volumetric_path)
+    return all(p.exists() for p in paths)
+
+
+def _read_cache_stamp(directory: Path, name: str, key: str) -> Optional[ScenarioSummary]:
+    stamp = directory / CACHE_STAMP_NAME
+    try:
+        data = json.loads(stamp.read_text())
+    except (OSError, ValueError):
+        return None
+    if data.get("key") != key:
+        return None
+    try:
+        summary = _summary_from_relative(data["summary"], directory)
+    except (KeyError, TypeError, ValueError):
+        return None
+    summary.name = name
+    return summary if _summary_outputs_exist(summary) else None
+
+
+def _write_cache_stamp(summary: ScenarioSummary, key: str) -> None:
+    stamp = summary.directory / CACHE_STAMP_NAME
+    stamp.write_text(json.dumps({"key": key, "summary": _summary_to_relative(summary)}, indent=2))
+
+
+def _cache_entry_dir(cache_dir: Path, key: str) -> Path:
+    return cache_dir / key[:2] / key
+
+
+def _lookup_cached_scenario(
+    scen_dir: Path, name: str, key: str, cache_dir: Optional[Path]
+) -> Optional[ScenarioSummary]:
+    """Return a summary for up-to-date outputs in ``scen_dir``, copying them from ``cache_dir`` if needed."""
+    summary = _read_cache_stamp(scen_dir, name, key)
+    if summary is not None or cache_dir is None:
+        return summary
+    entry = _cache_entry_dir(cache_dir, key)
+    if _read_cache_stamp(entry, name, key) is None:
+        return None
+    shutil.copytree(entry, scen_dir, dirs_exist_ok=True)
+    summary = _read_cache_stamp(scen_dir, name, key)
+    if summary is not None:
+        _write_cache_stamp(summary, key)
+    return summary
+
+
+def _store_cached_scenario(summary: ScenarioSummary, key: str, cache_dir: Optional[Path]) -> None:
+    _write_cache_stamp(summary, key)
+    if cache_dir is None:
+        return
+    entry = _cache_entry_dir(cache_dir, key)
+    tmp = entry.with_name(f".{entry.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    shutil.copytree(summary.directory, tmp)
+    shutil.rmtree(entry, ignore_errors=True)
+    os.replace(tmp, entry)
+
+
+def _resolve_jobs(jobs: Optional[int], n_scenarios: int) -> int:
+    if jobs is None or jobs <= 0:
+        jobs = os.cpu_count() or 1
+    return max(1, min(jobs, n_scenarios))
 
 
 def generate_scenarios(
@@ -501,60 +765,119 @@ def generate_scenarios(
     make_volumes: bool = True,
     mesh_characteristic_length: float = 0.3,
     write_summary_json: bool = True,
+    jobs: Optional[int] = 1,
+    use_cache: bool = False,
+    cache_dir: Optional[Path | str] = None,
+    mesh_threads: Optional[int] = None,
+    mesh_algorithm_2d: Optional[str] = None,
+    mesh_algorithm_3d: Optional[str] = None,
+    binary_msh: bool = False,
+    volume_container: bool = False,
+    compress_volume_container: bool = False,
 ) -> RunReport:
     """
     Generate trench scenarios, producing surface meshes (+previews) and optional volumetric meshes.
     Returns a RunReport describing the run.
+
+    ``jobs`` > 1 runs scenarios in a pool of that many worker processes (``None`` or
+    ``0`` means one per CPU). Workers are spawned fresh and handle a single scenario
+    each, so gmsh's global session is never shared between scenarios. The report
+    always lists scenarios in input order, whatever order they finish in.
+
+    With ``use_cache`` (implied by ``cache_dir``) each scenario directory is stamped
+    with :func:`scenario_cache_key`; a scenario whose stamp matches and whose outputs
+    still exist is skipped. ``cache_dir`` additionally keeps a content-addressed copy
+    of every generated scenario and copies it into place on a hit, so fresh output
+    roots can be filled without regenerating. Scenarios whose volume meshing failed
+    are never cached. Hits and misses are recorded on the returned report.
+
+    ``mesh_threads``, ``mesh_algorithm_2d`` and ``mesh_algorithm_3d`` are passed to
+    the gmsh mesher as ``threads``/``algorithm_2d``/``algorithm_3d``; with ``jobs``
+    > 1 keep ``mesh_threads * jobs`` within the CPU count. ``binary_msh`` writes
+    binary ``.msh`` files and ``volume_container`` (optionally compressed) adds
+    ``trench_volume.tfmesh`` next to each one for ``VolumeMeshResult.load()``.
     """
     out_root = Path(out_root)
     out_root.mkdir(parents=True, exist_ok=True)
 
     scenario_defs = list(scenarios) if scenarios is not None else default_scenarios()
-    results: List[ScenarioSummary] = []
     gmsh_ok = gmsh_available() if make_volumes else False
-
-    for definition in scenario_defs:
-        scen_dir = out_root / definition.name
-        scen_dir.mkdir(parents=True, exist_ok=True)
-
-        spec_path = scen_dir / "scene.json"
-        _ensure_spec_written(spec_path, definition.spec)
-
-        scene_spec = scene_spec_from_dict(definition.spec)
-        surface_out = _build_surface(scene_spec, scen_dir, make_preview=make_preview)
-
-        volumetric_path: Optional[Path] = None
-        volumetric_error: Optional[str] = None
-        pipe_clearances: List[Dict[str, Any]] = []
-        if gmsh_ok:
-            vol_dir = scen_dir / "volumetric"
-            volumetric_path, volumetric_error, pipe_clearances = _build_volume(
-                definition.spec, vol_dir, mesh_characteristic_length
+    cache_root = Path(cache_dir) if cache_dir is not None else None
+    use_cache = use_cache or cache_root is not None
+    mesh_options = {
+        k: v
+        for k, v in (
+            ("threads", mesh_threads),
+            ("algorithm_2d", mesh_algorithm_2d),
+            ("algorithm_3d", mesh_algorithm_3d),
+            ("binary_msh", binary_msh or None),
+            ("include_binary", (volume_container or compress_volume_container) or None),
+            ("compress_binary", compress_volume_container or None),
+        )
+        if v is not None
+    }
+
+    results: List[Optional[ScenarioSummary]] = [None] * len(scenario_defs)
+    keys: List[Optional[str]] = [None] * len(scenario_defs)
+    cache_hits: List[str] = []
+    cache_misses: List[str] = []
+    pending: List[int] = []
+    for idx, definition in enumerate(scenario_defs):
+        if use_cache:
+            key = scenario_cache_key(
+                definition.spec,
+                make_preview=make_preview,
+                make_volumes=gmsh_ok,
+                mesh_characteristic_length=mesh_characteristic_length,
+                mesh_options=mesh_options,
             )
-            if volumetric_error:
-                print(
-                    f"[volumetric] {definition.name} failed: {volumetric_error}",
-                    file=sys.stderr,
+            keys[idx] = key
+            cached = _lookup_cached_scenario(
+                out_root / definition.name, definition.name, key, cache_root
+            )
+            if cached is not None:
+                results[idx] = cached
+                cache_hits.append(definition.name)
+                continue
+            cache_misses.append(definition.name)
+        pending.append(idx)
+
+    n_jobs = _resolve_jobs(jobs, len(pending)) if pending else 1
+    if n_jobs == 1:
+        for idx in pending:
+            results[idx] = _generate_scenario(
+                scenario_defs[idx], out_root, make_preview, gmsh_ok, mesh_characteristic_length, mesh_options
+            )
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, mp_context=ctx, max_tasks_per_child=1
+        ) as pool:
+            futures = [
+                pool.submit(
+                    _generate_scenario,
+                    scenario_defs[idx],
+                    out_root,
+                    make_preview,
+                    gmsh_ok,
+                    mesh_characteristic_length,
+                    mesh_options,
                 )
-
-        summary = ScenarioSummary(
-            name=definition.name,
-            directory=scen_dir,
-            spec_path=spec_path,
-            surface_obj=Path(surface_out["obj_path"]),
-            metrics_path=scen_dir / "metrics.json",
-            preview_paths=[Path(p) for p in surface_out["previews"]],
-            preview_count=len(surface_out["previews"]),
-            object_counts=dict(surface_out["object_counts"]),
-            footprint_top=float(surface_out["metrics"]["footprint_area_top"]),
-            footprint_bottom=float(surface_out["metrics"]["footprint_area_bottom"]),
-            trench_from_surface=float(surface_out["metrics"]["volumes"]["trench_from_surface"]),
-            volumetric_path=volumetric_path,
-            volumetric_lc=mesh_characteristic_length if volumetric_path else None,
-            volumetric_error=volumetric_error,
-            pipe_clearances=pipe_clearances,
-        )
-        results.append(summary)
+                for idx in pending
+            ]
+            for idx, future in zip(pending, futures):
+                results[idx] = future.result()
+
+    if use_cache:
+        if cache_root is not None:
+            cache_root.mkdir(parents=True, exist_ok=True)
+        for idx in pending:
+            summary = results[idx]
+            if summary is not None and summary.volumetric_error is None:
+                _store_cached_scenario(summary, keys[idx], cache_root)
 
     report = RunReport(
         out_root=out_root,
@@ -562,7 +885,10 @@ def generate_scenarios(
         volumetric_requested=make_volumes,
         volumetric_available=gmsh_ok,
         mesh_characteristic_length=mesh_characteristic_length,
-        scenarios=results,
+        scenarios=[summary for summary in results if summary is not None],
+        cache_enabled=use_cache,
+        cache_hits=cache_hits,
+        cache_misses=cache_misses,
     )
 
     if write_summary_json:
@@ -618,7 +944,10 @@ def write_gallery(markdown_path: Path, report: RunReport, base: Optional[Path] =
 
 
 def _format_table(report: RunReport) -> str:
-    header = f"{'Scenario':<28} {'Surface OBJ':<40} {'Previews':<9} {'Volumetric':<12}"
+    header = (
+        f"{'Scenario':<28} {'Surface OBJ':<40} {'Previews':<9} {'Volumetric':<12} "
+        f"{'Time (s)':>8}  {'Slowest stage':<24}"
+    )
     rows = [header, "-" * len(header)]
     for scenario in report.scenarios:
         preview_label = f"{scenario.preview_count}"
@@ -634,11 +963,20 @@ def _format_table(report: RunReport) -> str:
                 vol_label = "skipped"
             else:
                 vol_label = "skipped"
+        stages = {k: v for k, v in scenario.timings.items() if k != "total"}
+        slowest = slowest_stage(stages)
+        slowest_label = f"{slowest} ({stages[slowest]:.2f})" if slowest else "-"
+        total = scenario.timings.get("total")
+        total_label = f"{total:.2f}" if total is not None else "-"
+        if scenario.name in report.cache_hits:
+            total_label, slowest_label = "-", "cached"
         rows.append(
             f"{scenario.name:<28} "
             f"{scenario.surface_obj.name:<40} "
             f"{preview_label:<9} "
-            f"{vol_label:<12}"
+            f"{vol_label:<12} "
+            f"{total_label:>8}  "
+            f"{slowest_label:<24}"
         )
     return "\n".join(rows)
 
@@ -710,6 +1048,36 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
         action="store_true",
         help="Copy the shipped scenario assets into the output directory before regeneration.",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=1,
+        help="Generate scenarios in this many worker processes (0 = one per CPU; default: 1).",
+    )
+    parser.add_argument(
+        "--cache",
+        dest="use_cache",
+        action="store_true",
+        help="Skip scenarios whose spec, options and trenchfoot/gmsh versions are unchanged.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        type=Path,
+        help="Content-addressed store of generated scenarios to reuse across output roots (implies --cache).",
+    )
+    try:
+        from .gmsh_sloped_trench_mesher import add_mesh_option_arguments, add_volume_output_arguments
+    except ImportError:  # pragma: no cover - direct script invocation
+        _ensure_repo_on_path()
+        from trenchfoot.gmsh_sloped_trench_mesher import (  # type: ignore
+            add_mesh_option_arguments,
+            add_volume_output_arguments,
+        )
+    add_mesh_option_arguments(parser)
+    add_volume_output_arguments(parser)
     parser.set_defaults(make_preview=True, make_volumes=True)
     args = parser.parse_args(argv)
 
@@ -729,9 +1097,24 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
         make_volumes=args.make_volumes,
         mesh_characteristic_length=args.lc,
         write_summary_json=True,
+        jobs=args.jobs,
+        use_cache=args.use_cache,
+        cache_dir=args.cache_dir,
+        mesh_threads=args.mesh_threads,
+        mesh_algorithm_2d=args.algorithm_2d,
+        mesh_algorithm_3d=args.algorithm_3d,
+        binary_msh=args.binary_msh,
+        volume_container=args.volume_container,
+        compress_volume_container=args.compress_container,
     )
 
     print(_format_table(report))
+    if report.cache_enabled:
+        print(
+            f"[trenchfoot] cache: {len(report.cache_hits)} hit(s), "
+            f"{len(report.cache_misses)} miss(es)",
+            file=sys.stderr,
+        )
     print()
     print(json.dumps(report.to_dict(), indent=2))
 
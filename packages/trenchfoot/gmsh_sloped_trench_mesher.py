@@ -7,20 +7,84 @@ Usage:
   python gmsh_sloped_trench_mesher.py --spec scene.json --out ./vol --lc 0.3
 """
 import json, math, os, sys, argparse
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 import numpy as np
-import gmsh  # pip install gmsh
+
+
+class _LazyGmsh:
+    """Stand-in for the ``gmsh`` module that imports it on first attribute access.
+
+    Importing gmsh loads its shared library, which is slow and fails on hosts
+    without the GL runtime; deferring it keeps this module importable (for
+    ``VolumeMeshResult`` and the helpers) until a mesh is actually built.
+    """
+
+    def __getattr__(self, name):
+        global gmsh
+        try:
+            import gmsh as _gmsh  # pip install gmsh
+        except Exception as exc:
+            raise ImportError("gmsh is required for volumetric mesh generation") from exc
+        gmsh = _gmsh
+        return getattr(_gmsh, name)
+
+
+gmsh = _LazyGmsh()
+
+
+def require_gmsh():
+    """Import gmsh now (raising ImportError if it is unusable) and return the module."""
+    gmsh.__name__  # noqa: B018 - attribute access triggers the import
+    return gmsh
+
+try:
+    from .array_container import read_array_container, write_array_container
+    from .timing import StageTimer
+    from .trench_scene_generator_v3 import MeshSizeSpec, TrenchPath
+except ImportError:  # pragma: no cover - direct script invocation
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from trenchfoot.array_container import read_array_container, write_array_container  # type: ignore
+    from trenchfoot.timing import StageTimer  # type: ignore
+    from trenchfoot.trench_scene_generator_v3 import MeshSizeSpec, TrenchPath  # type: ignore
 
 PIPE_CLEARANCE_BASE = 0.05  # baseline minimum (metres) between pipe surfaces and trench walls
 
+# File name used by VolumeMeshResult.load() for a directory, and next to persisted .msh files
+VOLUME_MESH_BINARY_NAME = "trench_volume.tfmesh"
+
+# gmsh Mesh.Algorithm / Mesh.Algorithm3D codes by name
+MESH_ALGORITHMS_2D = {
+    "meshadapt": 1,
+    "auto": 2,
+    "delaunay": 5,
+    "frontal-delaunay": 6,
+    "bamg": 7,
+    "frontal-quad": 8,
+    "packing-parallelograms": 9,
+    "quasi-structured-quad": 11,
+}
+MESH_ALGORITHMS_3D = {
+    "delaunay": 1,
+    "frontal": 4,
+    "mmg3d": 7,
+    "r-tree": 9,
+    "hxt": 10,  # parallel Delaunay; uses General.NumThreads
+}
+# gmsh's own defaults, restored when an option is not given
+_GMSH_DEFAULT_THREADS = 1
+_GMSH_DEFAULT_ALGORITHM_2D = MESH_ALGORITHMS_2D["frontal-delaunay"]
+_GMSH_DEFAULT_ALGORITHM_3D = MESH_ALGORITHMS_3D["delaunay"]
+
 
 @dataclass(frozen=True)
 class VolumeElementBlock:
     gmsh_type: int
     element_tags: np.ndarray
     node_tags: np.ndarray
+    # Per-element physical group tag (0 = none) of the element's dimension, aligned with element_tags
+    physical_tags: Optional[np.ndarray] = None
 
 
 @dataclass(frozen=True)
@@ -41,6 +105,194 @@ class VolumeMeshResult:
     pipe_clearances: List[Dict[str, object]]
     persisted_path: Optional[Path]
     mesh_characteristic_length: Optional[float]
+    # Resolved graded sizes (far_size, wall_size, pipe_sizes, growth) when a size field was used
+    mesh_size: Optional[Dict[str, object]] = None
+    # gmsh settings in effect: threads, occ_parallel, algorithm_2d, algorithm_3d
+    mesh_options: Dict[str, object] = field(default_factory=dict)
+    # Wall-clock seconds per stage: initialize, geometry, fragment, mesh (or refine), write, readback, write_binary
+    timings: Dict[str, float] = field(default_factory=dict)
+    # Array container written alongside persisted_path (include_binary=True)
+    binary_path: Optional[Path] = None
+    # Uniform refinements of the last directly meshed level (generate_trench_volume_levels)
+    refinement_level: int = 0
+
+    def write_binary(self, path: str | Path, *, compress: bool = False) -> Path:
+        """Write nodes, element blocks and physical groups to one array container.
+
+        Arrays are stored as ``nodes/tags``, ``nodes/coords``,
+        ``blocks/<gmsh_type>/{element_tags,node_tags,physical_tags}`` and
+        ``groups/<dim>/<tag>/<gmsh_type>``; everything else goes in the JSON
+        metadata. ``compress`` zlib-compresses the arrays that shrink, at the
+        cost of inflating them (instead of mapping them) in :meth:`load`.
+        """
+        arrays: Dict[str, np.ndarray] = {
+            "nodes/tags": self.node_tags,
+            "nodes/coords": np.asarray(self.nodes, np.float64).reshape(-1, 3),
+        }
+        for block in self.element_blocks:
+            prefix = f"blocks/{block.gmsh_type}"
+            arrays[f"{prefix}/element_tags"] = block.element_tags
+            arrays[f"{prefix}/node_tags"] = block.node_tags
+            if block.physical_tags is not None:
+                arrays[f"{prefix}/physical_tags"] = block.physical_tags
+        for group in self.physical_groups:
+            for etype, tags in group.element_tags.items():
+                arrays[f"groups/{group.dimension}/{group.tag}/{etype}"] = tags
+        metadata = {
+            "kind": "volume_mesh",
+            "format_version": 1,
+            "blocks": [block.gmsh_type for block in self.element_blocks],
+            "physical_groups": [
+                {
+                    "dimension": group.dimension,
+                    "tag": group.tag,
+                    "name": group.name,
+                    "entity_tags": list(group.entity_tags),
+                    "element_types": list(group.element_tags),
+                }
+                for group in self.physical_groups
+            ],
+            "pipe_clearances": self.pipe_clearances,
+            "msh_path": self.persisted_path.as_posix() if self.persisted_path else None,
+            "mesh_characteristic_length": self.mesh_characteristic_length,
+            "mesh_size": self.mesh_size,
+            "mesh_options": self.mesh_options,
+            "timings": self.timings,
+            "refinement_level": self.refinement_level,
+        }
+        return write_array_container(path, arrays, metadata, compress=compress)
+
+    @classmethod
+    def load(cls, path: str | Path, *, mmap_mode: Optional[str] = "r") -> "VolumeMeshResult":
+        """Load a result written by :meth:`write_binary`; gmsh is not needed.
+
+        ``path`` is the container file or the directory holding
+        ``trench_volume.tfmesh``. With the default ``mmap_mode="r"`` the
+        uncompressed arrays are read-only views into the mapped file and are
+        only paged in when touched.
+        """
+        target = Path(path)
+        if target.is_dir():
+            target = target / VOLUME_MESH_BINARY_NAME
+        container = read_array_container(target, mmap_mode=mmap_mode)
+        meta = container.metadata
+        if meta.get("kind") != "volume_mesh":
+            raise ValueError(f"{target} does not hold a volume mesh")
+        blocks = []
+        for gmsh_type in meta["blocks"]:
+            prefix = f"blocks/{gmsh_type}"
+            blocks.append(
+                VolumeElementBlock(
+                    gmsh_type=int(gmsh_type),
+                    element_tags=container[f"{prefix}/element_tags"],
+                    node_tags=container[f"{prefix}/node_tags"],
+                    physical_tags=(
+                        container[f"{prefix}/physical_tags"] if f"{prefix}/physical_tags" in container else None
+                    ),
+                )
+            )
+        groups = [
+            PhysicalGroupInfo(
+                dimension=int(g["dimension"]),
+                tag=int(g["tag"]),
+                name=g["name"],
+                entity_tags=tuple(g["entity_tags"]),
+                element_tags={
+                    int(etype): container[f"groups/{g['dimension']}/{g['tag']}/{etype}"]
+                    for etype in g["element_types"]
+                },
+            )
+            for g in meta["physical_groups"]
+        ]
+        msh_path = meta.get("msh_path")
+        return cls(
+            node_tags=container["nodes/tags"],
+            nodes=container["nodes/coords"],
+            element_blocks=blocks,
+            physical_groups=groups,
+            pipe_clearances=list(meta.get("pipe_clearances", [])),
+            persisted_path=Path(msh_path) if msh_path else None,
+            mesh_characteristic_length=meta.get("mesh_characteristic_length"),
+            mesh_size=meta.get("mesh_size"),
+            mesh_options=dict(meta.get("mesh_options", {})),
+            timings=dict(meta.get("timings", {})),
+            binary_path=target,
+            refinement_level=int(meta.get("refinement_level", 0)),
+        )
+
+def _tag_dtype(max_tag: int) -> type:
+    """int32 when every tag up to ``max_tag`` fits, int64 otherwise."""
+    return np.int32 if int(max_tag) <= np.iinfo(np.int32).max else np.int64
+
+
+def _read_mesh() -> Tuple[np.ndarray, np.ndarray, List[VolumeElementBlock], List[PhysicalGroupInfo]]:
+    """Bulk-read nodes, element blocks and physical groups of the current gmsh model.
+
+    Elements are fetched once per entity as numpy arrays and concatenated per
+    element type, so no tag ever passes through a Python int. Tags are stored as
+    int32 when the model's largest tag allows it.
+    """
+    node_dtype = _tag_dtype(gmsh.model.mesh.getMaxNodeTag())
+    elem_dtype = _tag_dtype(gmsh.model.mesh.getMaxElementTag())
+
+    node_tags, node_coords, _ = gmsh.model.mesh.getNodes(returnParametricCoord=False)
+    node_tags_arr = np.asarray(node_tags).astype(node_dtype)
+    nodes = np.asarray(node_coords, dtype=float).reshape(-1, 3)
+
+    group_entities: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+    entity_group: Dict[Tuple[int, int], int] = {}
+    for dim, tag in gmsh.model.getPhysicalGroups():
+        entities = tuple(int(e) for e in gmsh.model.getEntitiesForPhysicalGroup(dim, tag))
+        group_entities[(dim, tag)] = entities
+        for entity in entities:
+            entity_group.setdefault((dim, entity), tag)
+
+    # etype -> [(element tags, connectivity, physical tag)], in entity order
+    chunks: Dict[int, List[Tuple[np.ndarray, np.ndarray, int]]] = {}
+    entity_elements: Dict[Tuple[int, int], Dict[int, np.ndarray]] = {}
+    for dim, entity in gmsh.model.getEntities():
+        et_types, et_tags, et_nodes = gmsh.model.mesh.getElements(dim, entity)
+        physical = entity_group.get((dim, entity), 0)
+        for etype, tags, conn in zip(et_types, et_tags, et_nodes):
+            tags_arr = np.asarray(tags).astype(elem_dtype)
+            chunks.setdefault(int(etype), []).append((tags_arr, np.asarray(conn).astype(node_dtype), physical))
+            entity_elements.setdefault((dim, entity), {})[int(etype)] = tags_arr
+
+    element_blocks: List[VolumeElementBlock] = []
+    for etype, parts in chunks.items():
+        tags_arr = np.concatenate([p[0] for p in parts])
+        conn_arr = np.concatenate([p[1] for p in parts])
+        conn_arr = conn_arr.reshape(tags_arr.size, -1) if tags_arr.size else np.empty((0, 0), node_dtype)
+        physical_arr = np.repeat(
+            np.array([p[2] for p in parts], dtype=np.int32), [p[0].size for p in parts]
+        )
+        element_blocks.append(
+            VolumeElementBlock(
+                gmsh_type=etype,
+                element_tags=tags_arr,
+                node_tags=conn_arr,
+                physical_tags=physical_arr,
+            )
+        )
+
+    physical_groups: List[PhysicalGroupInfo] = []
+    for (dim, tag), entities in group_entities.items():
+        name = gmsh.model.getPhysicalName(dim, tag) or f"dim{dim}_tag{tag}"
+        per_type: Dict[int, List[np.ndarray]] = {}
+        for entity in entities:
+            for etype, tags_arr in entity_elements.get((dim, entity), {}).items():
+                per_type.setdefault(etype, []).append(tags_arr)
+        physical_groups.append(
+            PhysicalGroupInfo(
+                dimension=dim,
+                tag=tag,
+                name=name,
+                entity_tags=entities,
+                element_tags={etype: np.concatenate(arrays) for etype, arrays in per_type.items()},
+            )
+        )
+    return node_tags_arr, nodes, element_blocks, physical_groups
+
 
 def _normalize(v): 
     n = np.linalg.norm(v); 
@@ -48,73 +300,6 @@ def _normalize(v):
 
 def _rotate_ccw(v): return np.array([-v[1], v[0]], float)
 
-def _is_path_closed(path, threshold=0.01):
-    """Detect if path is explicitly closed (first and last points nearly identical)."""
-    if len(path) < 3:
-        return False
-    P = np.array(path, float)
-    first_last_dist = np.linalg.norm(P[0] - P[-1])
-    return first_last_dist < threshold
-
-def _offset_closed_polyline(path, offset):
-    """Offset a closed polyline, returning a single closed ring."""
-    P = np.array(path, float)
-    n = len(P)
-    if n < 3:
-        raise ValueError("Closed polyline needs at least 3 points")
-    tangents = []
-    normals = []
-    for i in range(n):
-        t = _normalize(P[(i+1) % n] - P[i])
-        if np.linalg.norm(t) < 1e-12:
-            t = np.array([1.0, 0.0])
-        tangents.append(t)
-        normals.append(np.array([-t[1], t[0]], float))
-    offset_pts = []
-    for k in range(n):
-        t_prev, n_prev = tangents[(k-1) % n], normals[(k-1) % n]
-        t_next, n_next = tangents[k], normals[k]
-        L1_p = P[k] + offset * n_prev
-        L1_d = t_prev
-        L2_p = P[k] + offset * n_next
-        L2_d = t_next
-        pt = _line_intersection_2d(L1_p, L1_d, L2_p, L2_d)
-        if pt is None:
-            pt = 0.5 * (L1_p + L2_p)
-        offset_pts.append(pt)
-    return offset_pts
-
-def _line_intersection_2d(p, d, q, e):
-    M = np.array([d, -e], float).T; det = np.linalg.det(M)
-    if abs(det) < 1e-12: return None
-    t, s = np.linalg.solve(M, (q - p)); return p + t * d
-
-def _offset_polyline(path, offset):
-    P = np.array(path, float); n = len(P)
-    tangents=[]; normals=[]
-    for i in range(n-1):
-        t = _normalize(P[i+1]-P[i]); 
-        if np.linalg.norm(t) < 1e-12: t = np.array([1.0, 0.0])
-        tangents.append(t); normals.append(np.array([-t[1], t[0]], float))
-    L=[P[0] + offset*normals[0]]; R=[P[0] - offset*normals[0]]
-    for k in range(1,n-1):
-        t_prev, n_prev = tangents[k-1], normals[k-1]
-        t_next, n_next = tangents[k], normals[k]
-        L1_p = P[k] + offset * n_prev; L1_d = t_prev
-        L2_p = P[k] + offset * n_next; L2_d = t_next
-        R1_p = P[k] - offset * n_prev; R1_d = t_prev
-        R2_p = P[k] - offset * n_next; R2_d = t_next
-        Lp = _line_intersection_2d(L1_p, L1_d, L2_p, L2_d)
-        Rp = _line_intersection_2d(R1_p, R1_d, R2_p, R2_d)
-        if Lp is None: Lp = 0.5*(L1_p+L2_p)
-        if Rp is None: Rp = 0.5*(R1_p+R2_p)
-        L.append(Lp); R.append(Rp)
-    L.append(P[-1] + offset*normals[-1])
-    R.append(P[-1] - offset*normals[-1])
-    return L, R
-
-def _ring_from_LR(L, R): return np.array(L + list(R[::-1]), float)
-
 def _add_closed_wire_xyz(points_xyz):
     pt = [gmsh.model.occ.addPoint(float(x), float(y), float(z)) for x,y,z in points_xyz]
     lines = []
@@ -124,26 +309,6 @@ def _add_closed_wire_xyz(points_xyz):
     loop = gmsh.model.occ.addCurveLoop(lines)
     return loop
 
-def _sample_polyline_at_s(path, s):
-    P = np.array(path, float)
-    segs = P[1:] - P[:-1]; lens = np.linalg.norm(segs, axis=1)
-    cum = np.concatenate([[0.0], np.cumsum(lens)]); total = float(cum[-1])
-    if total == 0: return P[0], np.array([1.0, 0.0])
-    s_abs = s * total; i = int(np.searchsorted(cum, s_abs, side="right") - 1); i = max(0, min(i, len(P)-2))
-    seg = P[i+1] - P[i]; L = np.linalg.norm(seg)
-    if L == 0: return P[i], np.array([1.0, 0.0])
-    u = (s_abs - cum[i]) / L; pos = (1-u)*P[i] + u*P[i+1]; t = seg / L; 
-    return pos, t
-
-def _polyline_lengths(path):
-    P = np.array(path, float)
-    if len(P) < 2:
-        return np.array([0.0]), 0.0
-    segs = P[1:] - P[:-1]
-    lens = np.linalg.norm(segs, axis=1)
-    cum = np.concatenate([[0.0], np.cumsum(lens)])
-    return cum, float(cum[-1])
-
 def _line_segment_intersection_param(p, direction, a, b):
     seg = np.array(b, float) - np.array(a, float)
     M = np.array([direction, -seg]).T
@@ -182,6 +347,135 @@ def _pipe_clearance(radius: float, wall_slope: float) -> float:
     slope_term = abs(float(wall_slope)) * 0.02 * radius
     return max(PIPE_CLEARANCE_BASE, radius_term + slope_term)
 
+def _algorithm_code(value, table: Dict[str, int], label: str) -> Optional[int]:
+    """gmsh code for an algorithm given by name or number (``None`` means gmsh's default)."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        key = value.strip().lower().replace("_", "-")
+        if key.isdigit():
+            value = int(key)
+        elif key in table:
+            return table[key]
+        else:
+            raise ValueError(f"Unknown {label} {value!r}; expected one of {sorted(table)}")
+    code = int(value)
+    if code not in table.values():
+        raise ValueError(f"Unknown {label} code {code}; expected one of {sorted(table.values())}")
+    return code
+
+def _algorithm_name(code: float, table: Dict[str, int]) -> str:
+    names = {v: k for k, v in table.items()}
+    return names.get(int(code), str(int(code)))
+
+def _apply_mesh_options(threads: Optional[int], algorithm_2d: Optional[int], algorithm_3d: Optional[int]) -> Dict[str, object]:
+    """Set thread count and algorithms on the live gmsh session and report the settings in effect.
+
+    Options given as ``None`` are reset to gmsh's defaults rather than left
+    as a previous call on the same session set them.
+    """
+    threads = _GMSH_DEFAULT_THREADS if threads is None else threads
+    gmsh.option.setNumber("General.NumThreads", threads)
+    # Parallel OCC booleans speed up fragment() on multi-pipe scenes
+    gmsh.option.setNumber("Geometry.OCCParallel", 1 if threads > 1 else 0)
+    gmsh.option.setNumber(
+        "Mesh.Algorithm", _GMSH_DEFAULT_ALGORITHM_2D if algorithm_2d is None else algorithm_2d
+    )
+    gmsh.option.setNumber(
+        "Mesh.Algorithm3D", _GMSH_DEFAULT_ALGORITHM_3D if algorithm_3d is None else algorithm_3d
+    )
+    return {
+        "threads": int(gmsh.option.getNumber("General.NumThreads")),
+        "occ_parallel": bool(gmsh.option.getNumber("Geometry.OCCParallel")),
+        "algorithm_2d": _algorithm_name(gmsh.option.getNumber("Mesh.Algorithm"), MESH_ALGORITHMS_2D),
+        "algorithm_3d": _algorithm_name(gmsh.option.getNumber("Mesh.Algorithm3D"), MESH_ALGORITHMS_3D),
+    }
+
+def _resolve_mesh_size(cfg, mesh_size) -> Optional[MeshSizeSpec]:
+    """Explicit ``mesh_size`` argument, else the spec's ``"mesh_size"`` block; ``None`` when disabled."""
+    if mesh_size is None:
+        mesh_size = cfg.get("mesh_size")
+    if isinstance(mesh_size, dict):
+        mesh_size = MeshSizeSpec(**mesh_size)
+    if mesh_size is None or not mesh_size.enable:
+        return None
+    return mesh_size
+
+def _boundary_surfaces(volume_tags) -> set:
+    dimtags = gmsh.model.getBoundary([(3, t) for t in volume_tags], combined=False, oriented=False)
+    return {t for (d, t) in dimtags if d == 2}
+
+def _add_threshold_field(surface_tags, size: float, far_size: float, growth: float) -> int:
+    """Size ``size`` within one element of ``surface_tags``, growing linearly to ``far_size``."""
+    extent = 0.0
+    for tag in surface_tags:
+        xmin, ymin, zmin, xmax, ymax, zmax = gmsh.model.getBoundingBox(2, tag)
+        extent = max(extent, xmax - xmin, ymax - ymin, zmax - zmin)
+    field_api = gmsh.model.mesh.field
+    dist = field_api.add("Distance")
+    field_api.setNumbers(dist, "SurfacesList", sorted(surface_tags))
+    # Sample each surface at roughly the target size so distances are exact where it matters
+    field_api.setNumber(dist, "Sampling", int(min(400, max(20, math.ceil(extent / size) + 1))))
+    thr = field_api.add("Threshold")
+    field_api.setNumber(thr, "InField", dist)
+    field_api.setNumber(thr, "SizeMin", size)
+    field_api.setNumber(thr, "SizeMax", far_size)
+    field_api.setNumber(thr, "DistMin", size)
+    field_api.setNumber(thr, "DistMax", size + (far_size - size) / growth)
+    return thr
+
+def _apply_mesh_size_fields(
+    spec: MeshSizeSpec,
+    lc: Optional[float],
+    trench_tags: List[int],
+    pipe_volumes: List[List[int]],
+    pipe_cfgs: List[Dict[str, object]],
+) -> Dict[str, object]:
+    """Install Distance/Threshold fields around pipes (and walls) as the background mesh."""
+    far_size = spec.far_size if spec.far_size is not None else lc
+    if far_size is None or not far_size > 0:
+        raise ValueError("mesh_size needs a positive far_size (or lc)")
+    if not spec.growth > 0:
+        raise ValueError("mesh_size.growth must be > 0")
+    far_size = float(far_size)
+    fields: List[int] = []
+    pipe_sizes: List[float] = []
+    pipe_surfaces: set = set()
+    for i, vols in enumerate(pipe_volumes):
+        p = pipe_cfgs[i]
+        size = p.get("mesh_size") or spec.pipe_size or spec.pipe_radius_factor * float(p["radius"])
+        if not size > 0:
+            raise ValueError(f"mesh size for pipe[{i}] must be > 0")
+        size = min(float(size), far_size)
+        pipe_sizes.append(size)
+        surfaces = _boundary_surfaces(vols) if vols else set()
+        pipe_surfaces |= surfaces
+        if surfaces and size < far_size:
+            fields.append(_add_threshold_field(surfaces, size, far_size, spec.growth))
+    wall_size = None
+    if spec.wall_size is not None:
+        if not spec.wall_size > 0:
+            raise ValueError("mesh_size.wall_size must be > 0")
+        wall_size = min(float(spec.wall_size), far_size)
+        walls = _boundary_surfaces(trench_tags) - pipe_surfaces
+        if walls and wall_size < far_size:
+            fields.append(_add_threshold_field(walls, wall_size, far_size, spec.growth))
+    if fields:
+        combined = gmsh.model.mesh.field.add("Min")
+        gmsh.model.mesh.field.setNumbers(combined, "FieldsList", fields)
+        gmsh.model.mesh.field.setAsBackgroundMesh(combined)
+    gmsh.option.setNumber("Mesh.CharacteristicLengthMin", min([far_size, *pipe_sizes, wall_size or far_size]))
+    gmsh.option.setNumber("Mesh.CharacteristicLengthMax", far_size)
+    # Let the background field alone drive sizes, as gmsh recommends for graded meshes
+    gmsh.option.setNumber("Mesh.CharacteristicLengthExtendFromBoundary", 0)
+    gmsh.option.setNumber("Mesh.CharacteristicLengthFromPoints", 0)
+    return {
+        "far_size": far_size,
+        "wall_size": wall_size,
+        "pipe_sizes": pipe_sizes,
+        "growth": float(spec.growth),
+    }
+
 def generate_trench_volume(
     cfg,
     *,
@@ -190,10 +484,148 @@ def generate_trench_volume(
     finalize: bool = True,
     debug_callback: Optional[Callable[[Dict[str, object]], None]] = None,
     debug_export: Optional[str] = None,
+    mesh_size: Optional[MeshSizeSpec | Dict[str, object]] = None,
+    threads: Optional[int] = None,
+    algorithm_2d: Optional[str | int] = None,
+    algorithm_3d: Optional[str | int] = None,
+    binary_msh: bool = False,
+    include_binary: bool = False,
+    compress_binary: bool = False,
 ):
-    gmsh.initialize()
-    persist_path_obj = Path(persist_path) if persist_path is not None else None
+    """Mesh the trench air and pipes with gmsh and return the nodes, elements and groups.
+
+    ``lc`` is the uniform element size. A ``mesh_size`` (``MeshSizeSpec`` or
+    dict; defaults to ``cfg["mesh_size"]``) grades it instead: fine on pipe
+    surfaces and optionally the walls, ``lc`` (or ``far_size``) in open air.
+
+    ``threads`` sets ``General.NumThreads`` (``0`` means one per CPU) and
+    enables parallel OCC booleans when above one. ``algorithm_2d`` and
+    ``algorithm_3d`` pick gmsh algorithms by name (see ``MESH_ALGORITHMS_2D``
+    and ``MESH_ALGORITHMS_3D``) or code; ``"hxt"`` is the parallel 3D mesher.
+    ``None`` resets the option to gmsh's default, so settings from an earlier
+    call on a live session do not leak into this one. The values in effect
+    are recorded in ``VolumeMeshResult.mesh_options``.
+
+    With ``persist_path``, ``binary_msh`` writes the ``.msh`` in gmsh's binary
+    format (``Mesh.Binary``) and ``include_binary`` also writes the arrays to
+    a ``.tfmesh`` container next to it (see :meth:`VolumeMeshResult.write_binary`,
+    ``compress_binary`` for its ``compress``) that :meth:`VolumeMeshResult.load`
+    memory-maps without gmsh.
+    """
+    return _generate_volume_levels(
+        cfg,
+        [lc],
+        refine_levels=0,
+        persist_paths=[Path(persist_path) if persist_path is not None else None],
+        finalize=finalize,
+        debug_callback=debug_callback,
+        debug_export=debug_export,
+        mesh_size=mesh_size,
+        threads=threads,
+        algorithm_2d=algorithm_2d,
+        algorithm_3d=algorithm_3d,
+        binary_msh=binary_msh,
+        include_binary=include_binary,
+        compress_binary=compress_binary,
+    )[0]
+
+
+def generate_trench_volume_levels(
+    cfg,
+    lcs: Sequence[Optional[float]],
+    *,
+    refine_levels: int = 0,
+    persist_dir: Optional[str | Path] = None,
+    finalize: bool = True,
+    debug_callback: Optional[Callable[[Dict[str, object]], None]] = None,
+    debug_export: Optional[str] = None,
+    mesh_size: Optional[MeshSizeSpec | Dict[str, object]] = None,
+    threads: Optional[int] = None,
+    algorithm_2d: Optional[str | int] = None,
+    algorithm_3d: Optional[str | int] = None,
+    binary_msh: bool = False,
+    include_binary: bool = False,
+    compress_binary: bool = False,
+) -> List[VolumeMeshResult]:
+    """Build the OCC geometry once and mesh it at every size in ``lcs``.
+
+    Each level is meshed exactly as :func:`generate_trench_volume` would mesh
+    it with that ``lc``, but the loft, healing, pipes and fragment run only
+    once. ``refine_levels`` then appends that many levels made by uniformly
+    refining the last one (gmsh ``mesh.refine``: every tetrahedron split in
+    eight, edge length halved), which is much cheaper than meshing from
+    scratch and gives nested meshes for multigrid ladders. So that the last
+    level is the finest, ``lcs`` must then be given in descending order.
+
+    Returns one ``VolumeMeshResult`` per level, in order. The shared geometry
+    stages are timed on the first level only. With ``persist_dir`` level ``i``
+    is written to ``<persist_dir>/level<i>/trench_volume.msh`` (plus its
+    container with ``include_binary``). Other options are as for
+    :func:`generate_trench_volume`.
+    """
+    if not lcs:
+        raise ValueError("lcs must name at least one characteristic length")
+    if refine_levels < 0:
+        raise ValueError("refine_levels must be >= 0")
+    if refine_levels and len(lcs) > 1:
+        if any(lc is None for lc in lcs):
+            raise ValueError("refine_levels needs explicit lcs to tell which level is the finest")
+        if any(a < b for a, b in zip(lcs, lcs[1:])):
+            raise ValueError(
+                f"refine_levels refines the last level, so lcs must be descending (finest last); got {list(lcs)}"
+            )
+    count = len(lcs) + int(refine_levels)
+    root = Path(persist_dir) if persist_dir is not None else None
+    return _generate_volume_levels(
+        cfg,
+        list(lcs),
+        refine_levels=int(refine_levels),
+        persist_paths=[root / f"level{i}" / "trench_volume.msh" if root else None for i in range(count)],
+        finalize=finalize,
+        debug_callback=debug_callback,
+        debug_export=debug_export,
+        mesh_size=mesh_size,
+        threads=threads,
+        algorithm_2d=algorithm_2d,
+        algorithm_3d=algorithm_3d,
+        binary_msh=binary_msh,
+        include_binary=include_binary,
+        compress_binary=compress_binary,
+    )
+
+
+def _generate_volume_levels(
+    cfg,
+    lcs: List[Optional[float]],
+    *,
+    refine_levels: int,
+    persist_paths: List[Optional[Path]],
+    finalize: bool,
+    debug_callback: Optional[Callable[[Dict[str, object]], None]],
+    debug_export: Optional[str],
+    mesh_size: Optional[MeshSizeSpec | Dict[str, object]],
+    threads: Optional[int],
+    algorithm_2d: Optional[str | int],
+    algorithm_3d: Optional[str | int],
+    binary_msh: bool,
+    include_binary: bool,
+    compress_binary: bool,
+) -> List[VolumeMeshResult]:
+    size_spec = _resolve_mesh_size(cfg, mesh_size)
+    if threads is not None:
+        threads = int(threads)
+        if threads < 0:
+            raise ValueError("threads must be >= 0")
+        threads = threads or (os.cpu_count() or 1)
+    algorithm_2d = _algorithm_code(algorithm_2d, MESH_ALGORITHMS_2D, "2D mesh algorithm")
+    algorithm_3d = _algorithm_code(algorithm_3d, MESH_ALGORITHMS_3D, "3D mesh algorithm")
+    timer = StageTimer()
+    if not gmsh.isInitialized():  # long-lived sessions (MesherPool workers) stay initialized
+        gmsh.initialize()
+    timer.lap("initialize")
+    persist_path_obj = persist_paths[0]
     try:
+        mesh_options = _apply_mesh_options(threads, algorithm_2d, algorithm_3d)
         gmsh.model.add("trench_volume")
 
         path_xy = [tuple(map(float, p)) for p in cfg["path_xy"]]
@@ -209,14 +641,18 @@ def generate_trench_volume(
         half_top = width_top / 2.0
         half_bot = max(1e-3, half_top - slope * depth)
 
-        is_closed = _is_path_closed(path_xy)
+        path = TrenchPath.from_xy(path_xy)
+        is_closed = path.is_closed
 
         if is_closed:
-            # For closed paths, create annular (ring-shaped) trench with outer and inner walls
-            outer_top = np.array(_offset_closed_polyline(path_xy, half_top), float)
-            inner_top = np.array(_offset_closed_polyline(path_xy, -half_top), float)
-            outer_bot = np.array(_offset_closed_polyline(path_xy, half_bot), float)
-            inner_bot = np.array(_offset_closed_polyline(path_xy, -half_bot), float)
+            # For closed paths, create annular (ring-shaped) trench with outer and inner walls.
+            # Rings are offset along the centerline's left normal (TrenchPath offsets outward).
+            # The duplicated closing point is dropped, so each ring has one vertex
+            # fewer than path_xy and no zero-length closing edge.
+            outer_top = path.offset_ring(-half_top)
+            inner_top = path.offset_ring(half_top)
+            outer_bot = path.offset_ring(-half_bot)
+            inner_bot = path.offset_ring(half_bot)
 
             outer_top_xyz = [(x, y, g(x, y)) for (x, y) in outer_top]
             inner_top_xyz = [(x, y, g(x, y)) for (x, y) in inner_top]
@@ -273,10 +709,8 @@ def generate_trench_volume(
             ring_top = outer_top
         else:
             # Original logic for open paths
-            Ltop, Rtop = _offset_polyline(path_xy, half_top)
-            Lbot, Rbot = _offset_polyline(path_xy, half_bot)
-            ring_top = _ring_from_LR(Ltop, Rtop)
-            ring_bot = _ring_from_LR(Lbot, Rbot)
+            ring_top = path.footprint_ring(half_top)
+            ring_bot = path.footprint_ring(half_bot)
 
             ring_top_xyz = [(x, y, g(x, y)) for (x, y) in ring_top]
             ring_bot_xyz = [(x, y, g(x, y) - depth) for (x, y) in ring_bot]
@@ -304,7 +738,7 @@ def generate_trench_volume(
             trench_vol = vols[0]
 
         pipe_cfgs = cfg.get("pipes", [])
-        cum_lengths, total_length = _polyline_lengths(path_xy)
+        total_length = path.total_length
         pipe_dimtags = []
         clearance_records: List[Dict[str, object]] = []
         for i, p in enumerate(pipe_cfgs):
@@ -317,7 +751,7 @@ def generate_trench_volume(
             clearance_scale = float(p.get("clearance_scale", 1.0))
             if not math.isfinite(clearance_scale) or clearance_scale <= 0:
                 raise ValueError(f"clearance_scale for pipe[{i}] must be > 0")
-            pos_xy, tangent = _sample_polyline_at_s(path_xy, s_center)
+            pos_xy, tangent = path.sample_at_s(s_center)
             axis_xy = _normalize(np.array(
                 [
                     math.cos(angle) * tangent[0] - math.sin(angle) * tangent[1],
@@ -451,6 +885,9 @@ def generate_trench_volume(
                     )
 
         gmsh.model.occ.synchronize()
+        timer.lap("geometry")
+        pipe_volumes: List[List[int]] = [[] for _ in pipe_dimtags]
+        trench_tags: List[int] = []
         if pipe_dimtags:
             outDT, outMap = gmsh.model.occ.fragment(
                 [(3, trench_vol)], pipe_dimtags, removeObject=True, removeTool=True
@@ -476,6 +913,7 @@ def generate_trench_volume(
                 gmsh.model.addPhysicalGroup(3, trench_tags, tag=1, name="TrenchAir")
             for i, lst in enumerate(pipes_new_lists):
                 vol_tags = [t for (d, t) in lst if d == 3 and t in available_vols]
+                pipe_volumes[i] = vol_tags
                 if vol_tags:
                     gmsh.model.addPhysicalGroup(3, vol_tags, tag=100 + i, name=f"Pipe{i}")
         else:
@@ -483,6 +921,7 @@ def generate_trench_volume(
             trench_tags = [t for t in available_vols] or ([trench_vol] if trench_vol in available_vols else [])
             if trench_tags:
                 gmsh.model.addPhysicalGroup(3, trench_tags, tag=1, name="TrenchAir")
+        timer.lap("fragment")
 
         if debug_export:
             os.makedirs(debug_export, exist_ok=True)
@@ -501,76 +940,75 @@ def generate_trench_volume(
             except Exception as exc:  # pragma: no cover - debug aid only
                 print(f"[trenchfoot] debug_callback failed: {exc}")
 
-        if lc is not None:
-            gmsh.option.setNumber("Mesh.CharacteristicLengthMin", lc)
-            gmsh.option.setNumber("Mesh.CharacteristicLengthMax", lc)
-        gmsh.model.mesh.generate(3)
-
-        persisted = None
-        if persist_path_obj is not None:
-            persist_path_obj.parent.mkdir(parents=True, exist_ok=True)
-            gmsh.write(persist_path_obj.as_posix())
-            persisted = persist_path_obj
-
-        node_tags, node_coords, _ = gmsh.model.mesh.getNodes()
-        node_tags_arr = np.array(node_tags, dtype=int)
-        node_coords_arr = np.array(node_coords, dtype=float)
-        nodes = node_coords_arr.reshape(-1, 3) if node_coords_arr.size else np.zeros((0, 3), float)
-
-        elem_types, elem_tags, elem_node_tags = gmsh.model.mesh.getElements()
-        element_blocks: List[VolumeElementBlock] = []
-        for etype, tags, node_conn in zip(elem_types, elem_tags, elem_node_tags):
-            tags_arr = np.array(tags, dtype=int)
-            node_conn_arr = np.array(node_conn, dtype=int)
-            if tags_arr.size:
-                if node_conn_arr.size:
-                    nodes_per_elem = node_conn_arr.size // tags_arr.size
-                    node_conn_arr = node_conn_arr.reshape(tags_arr.size, nodes_per_elem)
-                else:
-                    node_conn_arr = np.empty((tags_arr.size, 0), dtype=int)
+        timer.reset_lap()  # debug hooks are not charged to any stage
+        results: List[VolumeMeshResult] = []
+        level_lc: Optional[float] = None
+        size_summary = None
+        for index in range(len(lcs) + refine_levels):
+            level_path = persist_paths[index]
+            if index:
+                timer = StageTimer()  # later levels time only their own stages
+            if index < len(lcs):
+                level_lc = lcs[index]
+                if index:
+                    gmsh.model.mesh.clear()
+                    for tag in gmsh.model.mesh.field.list():
+                        gmsh.model.mesh.field.remove(tag)
+                size_summary = None
+                if size_spec is not None:
+                    size_summary = _apply_mesh_size_fields(
+                        size_spec, level_lc, trench_tags, pipe_volumes, pipe_cfgs
+                    )
+                elif level_lc is not None:
+                    gmsh.option.setNumber("Mesh.CharacteristicLengthMin", level_lc)
+                    gmsh.option.setNumber("Mesh.CharacteristicLengthMax", level_lc)
+                    gmsh.option.setNumber("Mesh.CharacteristicLengthExtendFromBoundary", 1)
+                    gmsh.option.setNumber("Mesh.CharacteristicLengthFromPoints", 1)
+                gmsh.model.mesh.generate(3)
+                timer.lap("mesh")
             else:
-                node_conn_arr = np.empty((0, 0), dtype=int)
-            element_blocks.append(
-                VolumeElementBlock(
-                    gmsh_type=int(etype),
-                    element_tags=tags_arr,
-                    node_tags=node_conn_arr,
-                )
-            )
+                gmsh.model.mesh.refine()
+                level_lc = level_lc / 2.0 if level_lc is not None else None
+                if size_summary is not None:
+                    size_summary = {
+                        **size_summary,
+                        "far_size": size_summary["far_size"] / 2.0,
+                        "wall_size": size_summary["wall_size"] / 2.0 if size_summary["wall_size"] else None,
+                        "pipe_sizes": [size / 2.0 for size in size_summary["pipe_sizes"]],
+                    }
+                timer.lap("refine")
 
-        physical_groups: List[PhysicalGroupInfo] = []
-        for dim, tag in gmsh.model.getPhysicalGroups():
-            name = gmsh.model.getPhysicalName(dim, tag) or f"dim{dim}_tag{tag}"
-            entities = tuple(gmsh.model.getEntitiesForPhysicalGroup(dim, tag))
-            elem_accum: Dict[int, List[int]] = {}
-            for entity_tag in entities:
-                et_types, et_elem_tags, _ = gmsh.model.mesh.getElements(dim, entity_tag)
-                for etype, tags in zip(et_types, et_elem_tags):
-                    bucket = elem_accum.setdefault(int(etype), [])
-                    bucket.extend(int(t) for t in tags)
-            elements_map: Dict[int, np.ndarray] = {
-                etype: np.array(values, dtype=int)
-                for etype, values in elem_accum.items()
-            }
-            physical_groups.append(
-                PhysicalGroupInfo(
-                    dimension=dim,
-                    tag=tag,
-                    name=name,
-                    entity_tags=entities,
-                    element_tags=elements_map,
-                )
-            )
+            persisted = None
+            if level_path is not None:
+                level_path.parent.mkdir(parents=True, exist_ok=True)
+                gmsh.option.setNumber("Mesh.Binary", 1 if binary_msh else 0)
+                gmsh.write(level_path.as_posix())
+                persisted = level_path
+                timer.lap("write")
 
-        return VolumeMeshResult(
-            node_tags=node_tags_arr,
-            nodes=nodes,
-            element_blocks=element_blocks,
-            physical_groups=physical_groups,
-            pipe_clearances=clearance_records,
-            persisted_path=persisted,
-            mesh_characteristic_length=float(lc) if lc is not None else None,
-        )
+            node_tags_arr, nodes, element_blocks, physical_groups = _read_mesh()
+            timer.lap("readback")
+
+            result = VolumeMeshResult(
+                node_tags=node_tags_arr,
+                nodes=nodes,
+                element_blocks=element_blocks,
+                physical_groups=physical_groups,
+                pipe_clearances=clearance_records,
+                persisted_path=persisted,
+                mesh_characteristic_length=float(level_lc) if level_lc is not None else None,
+                mesh_size=size_summary,
+                mesh_options=mesh_options,
+                timings=timer.timings,
+                refinement_level=max(0, index - len(lcs) + 1),
+            )
+            if persisted is not None and include_binary:
+                result.binary_path = result.write_binary(
+                    persisted.with_suffix(".tfmesh"), compress=compress_binary
+                )
+                timer.lap("write_binary")
+            results.append(result)
+        return results
     finally:
         if finalize:
             gmsh.finalize()
@@ -584,6 +1022,12 @@ def build_trench_volume_from_spec(
     finalize: bool = True,
     debug_callback: Optional[Callable[[Dict[str, object]], None]] = None,
     debug_export: Optional[str] = None,
+    threads: Optional[int] = None,
+    algorithm_2d: Optional[str | int] = None,
+    algorithm_3d: Optional[str | int] = None,
+    binary_msh: bool = False,
+    include_binary: bool = False,
+    compress_binary: bool = False,
 ):
     result = generate_trench_volume(
         cfg,
@@ -592,22 +1036,120 @@ def build_trench_volume_from_spec(
         finalize=finalize,
         debug_callback=debug_callback,
         debug_export=debug_export,
+        threads=threads,
+        algorithm_2d=algorithm_2d,
+        algorithm_3d=algorithm_3d,
+        binary_msh=binary_msh,
+        include_binary=include_binary,
+        compress_binary=compress_binary,
     )
     if result.persisted_path is None:
         return out_msh
     return result.persisted_path.as_posix()
 
 
+def add_mesh_option_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add ``--mesh-threads``, ``--algorithm-2d`` and ``--algorithm-3d`` to a CLI."""
+    parser.add_argument(
+        "--mesh-threads",
+        type=int,
+        default=None,
+        help="gmsh threads for meshing and OCC booleans (0 = one per CPU; default: gmsh's own)",
+    )
+    parser.add_argument(
+        "--algorithm-2d",
+        choices=sorted(MESH_ALGORITHMS_2D),
+        default=None,
+        help="gmsh surface mesh algorithm (default: gmsh's own)",
+    )
+    parser.add_argument(
+        "--algorithm-3d",
+        choices=sorted(MESH_ALGORITHMS_3D),
+        default=None,
+        help="gmsh volume mesh algorithm; 'hxt' meshes in parallel (default: gmsh's Delaunay)",
+    )
+
+def add_volume_output_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add ``--binary-msh``, ``--volume-container`` and ``--compress-container`` to a CLI."""
+    parser.add_argument(
+        "--binary-msh", action="store_true", help="Write the .msh in gmsh's binary format (Mesh.Binary)"
+    )
+    parser.add_argument(
+        "--volume-container",
+        action="store_true",
+        help=f"Also write {VOLUME_MESH_BINARY_NAME}, a memory-mappable array container (VolumeMeshResult.load)",
+    )
+    parser.add_argument(
+        "--compress-container",
+        action="store_true",
+        help="zlib-compress the container's arrays (smaller, but inflated instead of mapped on load)",
+    )
+
+
 def main():
     ap = argparse.ArgumentParser(description="Volumetric sloped-trench mesher (ground-aware)")
     ap.add_argument("--spec", required=True)
     ap.add_argument("--out", required=True)
     ap.add_argument("--lc", type=float, default=0.3, help="Target mesh size")
+    ap.add_argument(
+        "--lc-levels",
+        type=float,
+        nargs="+",
+        default=None,
+        help="Mesh one geometry build at each size, into OUT/level<i>/ (overrides --lc; descending with --refine-levels)",
+    )
+    ap.add_argument(
+        "--refine-levels",
+        type=int,
+        default=0,
+        help="Append this many levels by uniform refinement of the finest one (implies level mode)",
+    )
+    add_mesh_option_arguments(ap)
+    add_volume_output_arguments(ap)
     args = ap.parse_args()
     with open(args.spec, "r") as f: cfg = json.load(f)
     os.makedirs(args.out, exist_ok=True)
-    msh = build_trench_volume_from_spec(cfg, lc=args.lc, out_msh=os.path.join(args.out, "trench_volume.msh"))
-    print(json.dumps({"msh": msh}, indent=2))
+    options = dict(
+        threads=args.mesh_threads,
+        algorithm_2d=args.algorithm_2d,
+        algorithm_3d=args.algorithm_3d,
+        binary_msh=args.binary_msh,
+        include_binary=args.volume_container or args.compress_container,
+        compress_binary=args.compress_container,
+    )
+
+    def describe(result: VolumeMeshResult) -> Dict[str, object]:
+        summary = {"msh": result.persisted_path.as_posix(), "mesh_options": result.mesh_options}
+        if result.binary_path is not None:
+            summary["container"] = result.binary_path.as_posix()
+        return summary
+
+    if args.lc_levels or args.refine_levels:
+        results = generate_trench_volume_levels(
+            cfg,
+            args.lc_levels or [args.lc],
+            refine_levels=args.refine_levels,
+            persist_dir=args.out,
+            **options,
+        )
+        levels = [
+            {
+                "lc": r.mesh_characteristic_length,
+                "refinement_level": r.refinement_level,
+                "elements": int(sum(len(b.element_tags) for b in r.element_blocks if b.gmsh_type == 4)),
+                **describe(r),
+            }
+            for r in results
+        ]
+        print(json.dumps({"levels": levels}, indent=2))
+        return
+    result = generate_trench_volume(
+        cfg,
+        lc=args.lc,
+        persist_path=os.path.join(args.out, "trench_volume.msh"),
+        **options,
+    )
+    print(json.dumps(describe(result), indent=2))
 
 if __name__ == "__main__":
     main()
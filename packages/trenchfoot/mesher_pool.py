@@ -0,0 +1,260 @@
+"""Pool of long-lived gmsh worker processes for batch volumetric meshing.
+
+gmsh is process-global, so concurrent meshes need separate processes. Each
+worker initializes gmsh once and clears the model (and options) between jobs,
+so a sweep pays the gmsh startup cost once per worker rather than once per
+mesh. Jobs that exceed their timeout, or workers that die (for example on
+hitting ``memory_limit_mb``), fail only their own job; the worker is
+replaced before the next one.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import queue
+import threading
+import traceback
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, List, Optional
+
+_DEFAULT = object()
+_REJECTED_OPTIONS = ("finalize", "debug_callback")
+_STARTUP_TIMEOUT = 120.0
+
+
+def _limit_memory(memory_limit_mb: int) -> None:
+    import resource
+
+    limit = int(memory_limit_mb) * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _portable_exception(exc: BaseException) -> BaseException:
+    """``exc`` with the worker traceback attached, or a RuntimeError copy if it cannot be pickled."""
+    remote = "".join(traceback.format_exception(exc))
+    try:
+        pickle.loads(pickle.dumps(exc))
+    except Exception:
+        exc = RuntimeError(f"{type(exc).__name__}: {exc}")
+    exc.add_note(f"Raised in mesher worker pid {os.getpid()}:\n{remote}")
+    return exc
+
+
+def _worker_main(conn, memory_limit_mb: Optional[int]) -> None:
+    """Worker loop: keep gmsh initialized and mesh each ``(cfg, options)`` job received."""
+    try:
+        if memory_limit_mb:
+            _limit_memory(memory_limit_mb)
+        from trenchfoot.gmsh_sloped_trench_mesher import generate_trench_volume, require_gmsh
+
+        gmsh = require_gmsh()
+        gmsh.initialize(interruptible=False)
+        terminal = gmsh.option.getNumber("General.Terminal")
+    except BaseException as exc:
+        conn.send(("error", _portable_exception(exc)))
+        return
+    conn.send(("ready", os.getpid()))
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        cfg, options = job
+        gmsh.clear()
+        gmsh.option.restoreDefaults()
+        gmsh.option.setNumber("General.Terminal", terminal)
+        try:
+            reply = ("ok", generate_trench_volume(cfg, finalize=False, **options))
+        except BaseException as exc:
+            # gmsh reports std::bad_alloc as a bare Exception with no message
+            if memory_limit_mb and type(exc) is Exception and not str(exc):
+                exc = MemoryError(f"volume mesh job exceeded memory_limit_mb={memory_limit_mb}")
+            reply = ("error", _portable_exception(exc))
+        gmsh.clear()  # release the mesh before idling
+        conn.send(reply)
+    gmsh.finalize()
+
+
+class _Worker:
+    """Parent-side handle on one worker process."""
+
+    def __init__(self, ctx, memory_limit_mb: Optional[int], name: str):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, memory_limit_mb), name=name, daemon=True)
+        self.process.start()
+        child.close()
+        self.memory_limit_mb = memory_limit_mb
+        self.ready = False
+
+    def _receive(self, timeout: Optional[float], what: str):
+        if not self.conn.poll(timeout):
+            self.kill()
+            raise TimeoutError(f"{what} exceeded {timeout:g}s; mesher worker restarted")
+        try:
+            return self.conn.recv()
+        except (EOFError, OSError):
+            code = self.kill()
+            hint = f" (memory_limit_mb={self.memory_limit_mb})" if self.memory_limit_mb else ""
+            raise RuntimeError(f"mesher worker died during {what} with exit code {code}{hint}") from None
+
+    def run(self, cfg: Dict[str, Any], options: Dict[str, Any], timeout: Optional[float]):
+        if not self.ready:
+            status, payload = self._receive(_STARTUP_TIMEOUT, "worker startup")
+            if status == "error":
+                self.kill()
+                raise payload
+            self.ready = True
+        self.conn.send((cfg, options))
+        status, payload = self._receive(timeout, "volume mesh job")
+        if status == "error":
+            raise payload
+        return payload
+
+    def kill(self) -> Optional[int]:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+        return self.process.exitcode
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=10)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class MesherPool:
+    """Long-lived gmsh worker processes that run :func:`generate_trench_volume` jobs.
+
+    ``workers`` defaults to one per CPU. ``timeout`` (seconds) and
+    ``memory_limit_mb`` (address-space cap per worker, POSIX only) apply to
+    every job; :meth:`submit` can override the timeout. A job that times
+    out raises ``TimeoutError``, one that exhausts the cap ``MemoryError`` and
+    a worker crash ``RuntimeError``; the worker is then replaced and the
+    remaining jobs keep running. Mesher errors are re-raised as-is.
+
+    Use as a context manager, or call :meth:`close` when done::
+
+        with MesherPool(workers=4, timeout=120) as pool:
+            results = pool.map(specs, lc=0.3)
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        *,
+        timeout: Optional[float] = None,
+        memory_limit_mb: Optional[int] = None,
+    ):
+        import multiprocessing
+
+        if workers is None or workers <= 0:
+            workers = os.cpu_count() or 1
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be > 0")
+        if memory_limit_mb is not None:
+            if memory_limit_mb <= 0:
+                raise ValueError("memory_limit_mb must be > 0")
+            try:
+                import resource  # noqa: F401
+            except ImportError as exc:
+                raise ValueError("memory_limit_mb needs the POSIX resource module") from exc
+        self.workers = int(workers)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self._ctx = multiprocessing.get_context("spawn")
+        self._jobs: "queue.SimpleQueue[Optional[tuple]]" = queue.SimpleQueue()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._serve, args=(i,), name=f"trenchfoot-mesher-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _serve(self, index: int) -> None:
+        worker: Optional[_Worker] = None
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            future, cfg, options, timeout = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            if worker is None:
+                worker = _Worker(self._ctx, self.memory_limit_mb, name=f"trenchfoot-mesher-{index}")
+            try:
+                result = worker.run(cfg, options, timeout)
+            except BaseException as exc:
+                # Replace workers that died, timed out or ran out of memory
+                if isinstance(exc, MemoryError) or not worker.process.is_alive():
+                    worker.kill()
+                    worker = None
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+        if worker is not None:
+            worker.stop()
+
+    def submit(self, cfg: Dict[str, Any], *, timeout: Any = _DEFAULT, **options: Any) -> Future:
+        """Queue one mesh; ``options`` are passed to :func:`generate_trench_volume`.
+
+        The returned future resolves to a ``VolumeMeshResult``. ``persist_path``
+        is written by the worker process.
+        """
+        if self._closed:
+            raise RuntimeError("MesherPool is closed")
+        rejected = [name for name in _REJECTED_OPTIONS if name in options]
+        if rejected:
+            raise TypeError(f"MesherPool jobs do not accept {', '.join(rejected)}")
+        job_timeout = self.timeout if timeout is _DEFAULT else timeout
+        future: Future = Future()
+        self._jobs.put((future, dict(cfg), options, job_timeout))
+        return future
+
+    def map(
+        self,
+        cfgs: Iterable[Dict[str, Any]],
+        *,
+        timeout: Any = _DEFAULT,
+        return_exceptions: bool = False,
+        **options: Any,
+    ) -> List[Any]:
+        """Mesh every spec with the same options; results come back in input order.
+
+        With ``return_exceptions`` a failed job's exception takes its place in
+        the list instead of being raised, so a sweep survives bad cases.
+        """
+        futures = [self.submit(cfg, timeout=timeout, **options) for cfg in cfgs]
+        results: List[Any] = []
+        for future in futures:
+            exc = future.exception()
+            if exc is not None and not return_exceptions:
+                raise exc
+            results.append(exc if exc is not None else future.result())
+        return results
+
+    def close(self, wait: bool = True) -> None:
+        """Stop accepting jobs, let queued ones finish and shut the workers down."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._jobs.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self) -> "MesherPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -11,25 +11,28 @@ from pathlib import Path
 from typing import Optional
 
 from .render_colors import color_for_group, opacity_for_group
-from .trench_scene_generator_v3 import parse_obj_groups
+from .trench_scene_generator_v3 import load_obj_groups
 
-try:  # Optional dependency
-    import plotly.graph_objects as go
-except Exception:  # pragma: no cover - handled at runtime
-    go = None
+go = None  # plotly.graph_objects, imported on first use
 
 
 def _ensure_plotly_available() -> None:
-    if go is None:
+    global go
+    if go is not None:
+        return
+    try:  # Optional dependency
+        import plotly.graph_objects as _go
+    except Exception as exc:  # pragma: no cover - handled at runtime
         raise RuntimeError(
             "plotly is required for this command. Install with 'pip install trenchfoot[viz]'"
-        )
+        ) from exc
+    go = _go
 
 
 def _mesh_traces_from_obj(obj_path: Path) -> list:
     import numpy as np
 
-    V, faces_by_group = parse_obj_groups(str(obj_path))
+    V, faces_by_group = load_obj_groups(str(obj_path))
     traces = []
     for name, faces in faces_by_group.items():
         if faces.size == 0:
@@ -54,6 +57,7 @@ def _mesh_traces_from_obj(obj_path: Path) -> list:
 
 
 def _figure_for_mesh(path: Path) -> "go.Figure":
+    _ensure_plotly_available()
     suffix = path.suffix.lower()
     if suffix == ".obj":
         traces = _mesh_traces_from_obj(path)
@@ -0,0 +1,334 @@
+"""Numpy-only z-buffer rasterizer for surface mesh previews.
+
+Renders flat-shaded triangles with a depth buffer, so overlapping geometry is
+resolved per pixel instead of by matplotlib's per-polygon painter's sort, and
+encodes the result straight to PNG bytes (zlib + struct, no imaging library).
+
+Group colours and opacities come from :mod:`trenchfoot.render_colors`. Opacity
+is honoured for the common case that matters in trench previews: a
+translucent surface (walls, floor, ground) in front of an object (pipe, box,
+sphere) is blended over that object, otherwise over the background.
+"""
+from __future__ import annotations
+
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .render_colors import color_for_group, is_object_group, opacity_for_group
+
+# (name, (elevation_deg, azimuth_deg)) using matplotlib's view_init convention
+PREVIEW_VIEWS: Tuple[Tuple[str, Tuple[float, float]], ...] = (
+    ("top", (90.0, 0.0)),
+    ("side", (0.0, 0.0)),
+    ("oblique", (22.0, -60.0)),
+)
+DEFAULT_SIZE = (1200, 1050)  # width, height in pixels (matches the old 8x7in @ 150dpi)
+
+_BACKGROUND = (1.0, 1.0, 1.0)
+_AMBIENT = 0.35
+_MARGIN_FRAC = 0.04
+# Upper bound on candidate pixels tested per rasterization batch
+_PIXEL_BUDGET = 1 << 22
+_INSIDE_EPS = -1e-9
+_DEPTH_LEVELS = (1 << 30) - 1
+
+
+def _hex_to_rgb(color: str) -> Tuple[float, float, float]:
+    color = color.lstrip("#")
+    return tuple(int(color[i : i + 2], 16) / 255.0 for i in (0, 2, 4))  # type: ignore[return-value]
+
+
+@dataclass(frozen=True)
+class PreparedTriangles:
+    """Triangle soup shared by every view of one scene.
+
+    ``corners`` is ``(T, 3, 3)``; ``normals`` are unit face normals; ``rgb``,
+    ``alpha`` and ``is_object`` are per-face lookups from the group palette.
+    """
+
+    corners: np.ndarray
+    normals: np.ndarray
+    rgb: np.ndarray
+    alpha: np.ndarray
+    is_object: np.ndarray
+    bounds: Tuple[np.ndarray, np.ndarray]
+
+
+def prepare_triangles(
+    groups: Dict[str, Tuple[np.ndarray, np.ndarray]],
+    exclude_groups: Optional[Iterable[str]] = None,
+) -> Optional[PreparedTriangles]:
+    """Flatten ``groups`` into per-face arrays, or ``None`` if nothing is drawable."""
+    excluded = frozenset(exclude_groups or ())
+    corners, rgb, alpha, is_obj = [], [], [], []
+    for name, (V, F) in groups.items():
+        if name in excluded or F.shape[0] == 0:
+            continue
+        V = np.asarray(V, dtype=float)
+        corners.append(V[np.asarray(F, dtype=np.int64)])
+        n = F.shape[0]
+        rgb.append(np.broadcast_to(_hex_to_rgb(color_for_group(name)), (n, 3)))
+        alpha.append(np.full(n, opacity_for_group(name)))
+        is_obj.append(np.full(n, is_object_group(name)))
+    if not corners:
+        return None
+    tri = np.concatenate(corners)
+    normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+    flat = tri.reshape(-1, 3)
+    return PreparedTriangles(
+        corners=tri,
+        normals=normals,
+        rgb=np.concatenate(rgb),
+        alpha=np.concatenate(alpha),
+        is_object=np.concatenate(is_obj),
+        bounds=(flat.min(axis=0), flat.max(axis=0)),
+    )
+
+
+def _camera_basis(elev: float, azim: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Eye direction, screen-right and screen-up vectors (matplotlib convention)."""
+    el, az = np.radians(elev), np.radians(azim)
+    eye = np.array([np.cos(el) * np.cos(az), np.cos(el) * np.sin(az), np.sin(el)])
+    right = np.array([-np.sin(az), np.cos(az), 0.0])
+    up = np.cross(eye, right)
+    return eye, right, up
+
+
+def _rasterize(
+    screen: np.ndarray,
+    nearness: np.ndarray,
+    width: int,
+    height: int,
+) -> np.ndarray:
+    """Return the index of the nearest triangle per pixel (``-1`` where empty).
+
+    ``screen`` is ``(T, 3, 2)`` pixel coordinates and ``nearness`` ``(T, 3)``
+    a value that is affine in screen space and larger for closer points.
+    """
+    empty = np.iinfo(np.int64).max
+    # One int64 per pixel packs quantized distance (high bits) over triangle id
+    # (low 32 bits), so ``np.minimum.at`` resolves depth and identity at once.
+    zbuf = np.full(width * height, empty, dtype=np.int64)
+    if screen.shape[0] == 0:
+        return np.full(width * height, -1, dtype=np.int64)
+    near_hi = float(nearness.max())
+    near_span = max(near_hi - float(nearness.min()), 1e-12)
+    quant = float(_DEPTH_LEVELS) / near_span
+
+    x, y = screen[..., 0], screen[..., 1]
+    # Pixel centres sit at integer + 0.5; rows whose centre lies in the triangle's y-range.
+    y0 = np.clip(np.ceil(y.min(axis=1) - 0.5), 0, height).astype(np.int64)
+    y1 = np.clip(np.floor(y.max(axis=1) - 0.5), -1, height - 1).astype(np.int64)
+    x_lo = np.maximum(x.min(axis=1), 0.0)
+    x_hi = np.minimum(x.max(axis=1), float(width))
+
+    # Barycentric weights and nearness as planes in pixel space: q = a*px + b*py + c
+    xa, xb, xc = x[:, 0], x[:, 1], x[:, 2]
+    ya, yb, yc = y[:, 0], y[:, 1], y[:, 2]
+    det = (yb - yc) * (xa - xc) + (xc - xb) * (ya - yc)
+    keep = (y1 >= y0) & (x_hi > x_lo) & (np.abs(det) > 1e-12)
+    tri_ids = np.flatnonzero(keep)
+    if tri_ids.size == 0:
+        return np.full(width * height, -1, dtype=np.int64)
+    inv = 1.0 / det[tri_ids]
+    xa, xb, xc, ya, yb, yc = (v[tri_ids] for v in (xa, xb, xc, ya, yb, yc))
+    l0 = np.stack([(yb - yc) * inv, (xc - xb) * inv, -((yb - yc) * xc + (xc - xb) * yc) * inv])
+    l1 = np.stack([(yc - ya) * inv, (xa - xc) * inv, -((yc - ya) * xc + (xa - xc) * yc) * inv])
+    l2 = -l0 - l1
+    l2[2] += 1.0
+    near = nearness[tri_ids]
+    kp = l0 * (near[:, 0] - near[:, 2]) + l1 * (near[:, 1] - near[:, 2])
+    kp[2] += near[:, 2]
+
+    # Expand every triangle into its rows and intersect each row with the three
+    # barycentric half-planes to get an exact pixel span; only covered pixels
+    # are ever generated.
+    rows_per_tri = (y1 - y0 + 1)[tri_ids]
+    row_tri = np.repeat(np.arange(tri_ids.size), rows_per_tri)
+    row_y = y0[tri_ids][row_tri] + (
+        np.arange(row_tri.size) - np.repeat(np.cumsum(rows_per_tri) - rows_per_tri, rows_per_tri)
+    )
+    cy = row_y + 0.5
+    left = x_lo[tri_ids][row_tri]
+    right = x_hi[tri_ids][row_tri]
+    for plane in (l0, l1, l2):
+        slope = plane[0][row_tri]
+        rest = plane[1][row_tri] * cy + plane[2][row_tri] - _INSIDE_EPS
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cross = -rest / slope
+        left = np.where(slope > 0, np.maximum(left, cross), left)
+        right = np.where(slope < 0, np.minimum(right, cross), right)
+        flat_out = (slope == 0) & (rest < 0)
+        right = np.where(flat_out, -np.inf, right)
+    px0 = np.maximum(np.ceil(left - 0.5), 0).astype(np.int64)
+    px1 = np.minimum(np.floor(right - 0.5), width - 1)
+    px1 = np.where(np.isfinite(px1), px1, -1).astype(np.int64)
+    span = np.maximum(px1 - px0 + 1, 0)
+    live = span > 0
+    row_tri, px0, span, cy = row_tri[live], px0[live], span[live], cy[live]
+    row_base = row_y[live] * width
+    row_depth = kp[1][row_tri] * cy + kp[2][row_tri]
+    row_slope = kp[0][row_tri]
+    row_id = tri_ids[row_tri]
+
+    bounds = np.cumsum(span)
+    start = 0
+    while start < span.size:
+        base = bounds[start - 1] if start else 0
+        stop = max(int(np.searchsorted(bounds, base + _PIXEL_BUDGET, side="right")), start + 1)
+        cnt = span[start:stop]
+        rep = np.repeat(np.arange(start, stop), cnt)
+        px = px0[rep] + (np.arange(rep.size) - np.repeat(np.cumsum(cnt) - cnt, cnt))
+        depth = row_slope[rep] * (px + 0.5) + row_depth[rep]
+        dist = np.clip((near_hi - depth) * quant, 0, _DEPTH_LEVELS).astype(np.int64)
+        np.minimum.at(zbuf, row_base[rep] + px, (dist << 32) | row_id[rep])
+        start = stop
+    idbuf = zbuf & 0xFFFFFFFF
+    idbuf[zbuf == empty] = -1
+    return idbuf
+
+
+def render_view(
+    tris: PreparedTriangles,
+    elev: float,
+    azim: float,
+    *,
+    size: Tuple[int, int] = DEFAULT_SIZE,
+    projection: str = "ortho",
+    background: Sequence[float] = _BACKGROUND,
+) -> np.ndarray:
+    """Render one view to an ``(H, W, 3)`` uint8 image.
+
+    ``projection`` is ``"ortho"`` or ``"persp"`` (camera placed at twice the
+    scene radius, so perspective is noticeable but not extreme).
+    """
+    if projection not in ("ortho", "persp"):
+        raise ValueError("projection must be 'ortho' or 'persp'")
+    width, height = int(size[0]), int(size[1])
+    eye, right, up = _camera_basis(elev, azim)
+    lo, hi = tris.bounds
+    center = 0.5 * (lo + hi)
+    radius = max(0.5 * float(np.linalg.norm(hi - lo)), 1e-9)
+
+    P = tris.corners - center
+    sx = P @ right
+    sy = P @ up
+    along = P @ eye
+    if projection == "persp":
+        dist = 2.0 * radius
+        z = np.maximum(dist - along, 1e-6 * radius)
+        sx = sx * (dist / z)
+        sy = sy * (dist / z)
+        nearness = 1.0 / z
+    else:
+        nearness = along
+
+    span_x = max(float(sx.max() - sx.min()), 1e-9)
+    span_y = max(float(sy.max() - sy.min()), 1e-9)
+    usable = 1.0 - 2.0 * _MARGIN_FRAC
+    scale = min(width * usable / span_x, height * usable / span_y)
+    mid_x = 0.5 * (sx.max() + sx.min())
+    mid_y = 0.5 * (sy.max() + sy.min())
+    screen = np.empty(tris.corners.shape[:2] + (2,))
+    screen[..., 0] = 0.5 * width + (sx - mid_x) * scale
+    screen[..., 1] = 0.5 * height - (sy - mid_y) * scale
+
+    light = eye + 0.4 * up - 0.3 * right
+    light /= np.linalg.norm(light)
+    shade = _AMBIENT + (1.0 - _AMBIENT) * np.abs(tris.normals @ light)
+    face_rgb = tris.rgb * shade[:, None]
+
+    bg = np.asarray(background, dtype=float)
+    front = _rasterize(screen, nearness, width, height)
+    obj_ids = np.flatnonzero(tris.is_object)
+    behind = np.full_like(front, -1)
+    if obj_ids.size and not tris.is_object.all():
+        hit = _rasterize(screen[obj_ids], nearness[obj_ids], width, height)
+        covered = hit >= 0
+        behind[covered] = obj_ids[hit[covered]]
+
+    # Translucent faces are pre-blended over the background; only surface pixels
+    # with an object behind them need a per-pixel blend.
+    alpha = tris.alpha[:, None]
+    over_bg = np.clip((alpha * face_rgb + (1.0 - alpha) * bg) * 255.0 + 0.5, 0, 255).astype(np.uint8)
+    image = np.empty((width * height, 3), dtype=np.uint8)
+    image[:] = np.clip(bg * 255.0 + 0.5, 0, 255).astype(np.uint8)
+    drawn = np.flatnonzero(front >= 0)
+    f = front[drawn]
+    image[drawn] = over_bg[f]
+    b = behind[drawn]
+    see_through = (b >= 0) & ~tris.is_object[f]
+    if see_through.any():
+        fs, bs = f[see_through], b[see_through]
+        blend = alpha[fs] * face_rgb[fs] + (1.0 - alpha[fs]) * face_rgb[bs]
+        image[drawn[see_through]] = np.clip(blend * 255.0 + 0.5, 0, 255).astype(np.uint8)
+    return image.reshape(height, width, 3)
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    """Encode an ``(H, W, 3)`` uint8 array as an 8-bit RGB PNG."""
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    height, width = image.shape[:2]
+    raw = np.empty((height, 1 + width * 3), dtype=np.uint8)
+    raw[:, 0] = 0  # filter type "None" for every scanline
+    raw[:, 1:] = image.reshape(height, width * 3)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw.tobytes(), 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _map_views(
+    render: Callable[[Tuple[float, float]], bytes],
+    views: Sequence[Tuple[str, Tuple[float, float]]],
+    max_workers: Optional[int] = None,
+) -> Dict[str, bytes]:
+    """Run ``render((elev, azim))`` for every view, on a thread pool unless ``max_workers == 1``.
+
+    Results keep the order of ``views``.
+    """
+    workers = len(views) if max_workers is None else max(1, min(max_workers, len(views)))
+    if workers <= 1:
+        return {name: render(angles) for name, angles in views}
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="trenchfoot-preview") as pool:
+        futures = [(name, pool.submit(render, angles)) for name, angles in views]
+        return {name: future.result() for name, future in futures}
+
+
+def render_previews(
+    groups: Dict[str, Tuple[np.ndarray, np.ndarray]],
+    exclude_groups: Optional[Iterable[str]] = None,
+    *,
+    views: Sequence[Tuple[str, Tuple[float, float]]] = PREVIEW_VIEWS,
+    size: Tuple[int, int] = DEFAULT_SIZE,
+    projection: str = "ortho",
+    max_workers: Optional[int] = None,
+) -> Dict[str, bytes]:
+    """Render ``views`` of ``groups`` and return ``{view_name: png_bytes}``.
+
+    The triangle arrays are prepared once and shared by every view; views are
+    rendered on up to ``max_workers`` threads (default: one per view).
+    """
+    tris = prepare_triangles(groups, exclude_groups)
+    if tris is None:
+        return {}
+    return _map_views(
+        lambda angles: encode_png(render_view(tris, *angles, size=size, projection=projection)),
+        views,
+        max_workers,
+    )
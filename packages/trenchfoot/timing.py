@@ -0,0 +1,55 @@
+"""Lightweight wall-clock stage timers for the generation pipeline."""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Mapping, Optional
+
+
+class StageTimer:
+    """Accumulates wall-clock seconds per named stage.
+
+    Use :meth:`stage` to time a block, or :meth:`lap` to charge the time since
+    the previous lap (or construction) to a stage, which keeps long functions
+    instrumentable without re-indenting them. Repeated stages add up, so a
+    stage timed inside a loop reports the loop's total.
+    """
+
+    def __init__(self, timings: Optional[Dict[str, float]] = None):
+        self.timings: Dict[str, float] = timings if timings is not None else {}
+        self._last = time.perf_counter()
+
+    def add(self, name: str, seconds: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + float(seconds)
+
+    def lap(self, name: str) -> float:
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self.add(name, elapsed)
+        self._last = now
+        return elapsed
+
+    def reset_lap(self) -> None:
+        self._last = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.add(name, end - start)
+            self._last = end
+
+
+def prefixed(timings: Mapping[str, float], prefix: str) -> Dict[str, float]:
+    """Return ``timings`` with every key prefixed by ``prefix + "."``."""
+    return {f"{prefix}.{name}": value for name, value in timings.items()}
+
+
+def slowest_stage(timings: Mapping[str, float]) -> Optional[str]:
+    """Name of the stage with the largest time, or ``None`` for no timings."""
+    if not timings:
+        return None
+    return max(timings.items(), key=lambda item: item[1])[0]
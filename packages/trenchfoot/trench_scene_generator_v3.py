@@ -19,23 +19,42 @@ from __future__ import annotations
 
 import io
 import os, json, math, argparse
+import functools
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Sequence
 import numpy as np
 
+from .array_container import read_array_container, write_array_container
+from .preview_raster import PREVIEW_VIEWS, _map_views, render_previews
 from .render_colors import color_for_group, opacity_for_group
+from .timing import StageTimer
 
-try:
-    import matplotlib.pyplot as plt
-    from mpl_toolkits.mplot3d.art3d import Poly3DCollection
-except Exception:
-    plt = None
-    Poly3DCollection = None
+
+
+@functools.lru_cache(maxsize=None)
+def _load_matplotlib() -> Optional[Tuple[Any, Any, Any]]:
+    """Import the matplotlib pieces used for previews on first use.
+
+    Returns ``(Figure, FigureCanvasAgg, Poly3DCollection)`` or ``None`` when
+    matplotlib is unavailable. Only the object-oriented Agg API is used: no
+    pyplot figure manager, so figures can be built and saved from worker threads.
+    """
+    try:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from mpl_toolkits.mplot3d import Axes3D  # noqa: F401  (registers the "3d" projection)
+        from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+    except Exception:
+        return None
+    return Figure, FigureCanvasAgg, Poly3DCollection
 
 # Groups kept for internal metrics but excluded from OBJ export and previews
 _INTERNAL_GROUPS = frozenset({"trench_cap_for_volume", "inner_column_lid"})
 
+# File name used by SurfaceMeshResult.persist(include_binary=True) and load()
+SURFACE_MESH_BINARY_NAME = "trench_scene.tfmesh"
+
 # ---------------- Geometry helpers ----------------
 
 def _normalize(v: np.ndarray) -> np.ndarray:
@@ -56,26 +75,200 @@ def _line_intersection_2d(p: np.ndarray, d: np.ndarray, q: np.ndarray, e: np.nda
     t, s = np.linalg.solve(M, (q - p))
     return p + t * d
 
+def _miter_offset_points(
+    P: np.ndarray,
+    t_prev: np.ndarray, n_prev: np.ndarray,
+    t_next: np.ndarray, n_next: np.ndarray,
+    offset: float,
+) -> np.ndarray:
+    """Vectorized _line_intersection_2d for the offset lines meeting at each vertex.
+
+    Falls back to the midpoint of the two offset points where the adjacent
+    segments are parallel.
+    """
+    p1 = P + offset * n_prev
+    p2 = P + offset * n_next
+    det = t_prev[:, 0] * -t_next[:, 1] + t_next[:, 0] * t_prev[:, 1]
+    rhs = p2 - p1
+    parallel = np.abs(det) < 1e-12
+    t = (rhs[:, 0] * -t_next[:, 1] + t_next[:, 0] * rhs[:, 1]) / np.where(parallel, 1.0, det)
+    return np.where(parallel[:, None], 0.5 * (p1 + p2), p1 + t[:, None] * t_prev)
+
+
+def _readonly(a: np.ndarray) -> np.ndarray:
+    a.setflags(write=False)
+    return a
+
+
+# Upper bound on the (points x segments) work array built per projection chunk
+_PROJECTION_CHUNK = 1 << 20
+
+
+class TrenchPath:
+    """Compiled trench centerline shared by every geometry stage.
+
+    Holds the cumulative arclength, per-segment tangents and left normals,
+    the closure status and memoized offset rings, so that offsetting,
+    sampling and projecting never re-derive them from ``path_xy``. Build one
+    with ``TrenchPath.from_xy`` (memoized per point sequence) or through
+    ``SceneSpec.trench_path``; all arrays are read-only.
+    """
+
+    def __init__(self, path_xy: Any, closed_threshold: float = 0.01):
+        P = np.array(path_xy, float).reshape(-1, 2)
+        if len(P) < 2:
+            raise ValueError("Polyline needs at least 2 points")
+        D = P[1:] - P[:-1]
+        seg_len = np.linalg.norm(D, axis=1)
+        valid = seg_len > 0
+        tangents = np.tile(np.array([1.0, 0.0]), (len(D), 1))
+        tangents[valid] = D[valid] / seg_len[valid, None]
+        inv_len_sq = np.zeros(len(D))
+        inv_len_sq[valid] = 1.0 / seg_len[valid] ** 2
+
+        self.points = _readonly(P)
+        self.segments = _readonly(D)
+        self.segment_lengths = _readonly(seg_len)
+        self.cum_length = _readonly(np.concatenate([[0.0], np.cumsum(seg_len)]))
+        self.total_length = float(self.cum_length[-1])
+        self.tangents = _readonly(tangents)
+        self.normals = _readonly(np.column_stack([-tangents[:, 1], tangents[:, 0]]))
+        self.is_closed = bool(
+            len(P) >= 3 and np.linalg.norm(P[0] - P[-1]) < closed_threshold
+        )
+        self._inv_len_sq = inv_len_sq
+        self._offset_cache: Dict[Tuple[str, float], Any] = {}
+
+    @classmethod
+    def from_xy(cls, path_xy: Any) -> "TrenchPath":
+        """Return the compiled path for ``path_xy``, reusing an earlier build."""
+        if isinstance(path_xy, cls):
+            return path_xy
+        key = tuple((float(x), float(y)) for x, y in path_xy)
+        return _compile_trench_path(key)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def sample_at_s(self, s: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """Position and unit tangent at normalized arclength ``s`` (scalar or array)."""
+        s_arr = np.asarray(s, float)
+        flat = s_arr.reshape(-1)
+        P = self.points
+        if self.total_length == 0:
+            pos = np.tile(P[0], (flat.size, 1))
+            tangent = np.tile(np.array([1.0, 0.0]), (flat.size, 1))
+        else:
+            s_abs = flat * self.total_length
+            i = np.clip(np.searchsorted(self.cum_length, s_abs, side="right") - 1, 0, len(P) - 2)
+            L = self.segment_lengths[i]
+            zero = L == 0
+            u = (s_abs - self.cum_length[i]) / np.where(zero, 1.0, L)
+            pos = (1 - u)[:, None] * P[i] + u[:, None] * P[i + 1]
+            pos[zero] = P[i[zero]]
+            tangent = self.tangents[i].copy()
+        if s_arr.ndim == 0:
+            return pos[0], tangent[0]
+        return pos.reshape(s_arr.shape + (2,)), tangent.reshape(s_arr.shape + (2,))
+
+    def project(self, points_xy: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Exact closest-point projection of many XY points onto the polyline.
+
+        Every point is projected onto every segment at once and the nearest
+        projection wins (ties go to the earlier segment). Zero-length segments
+        project onto their start point and use the +x tangent.
+
+        Returns (positions (N, 2), tangents (N, 2), segment indices (N,)).
+        """
+        Q = np.asarray(points_xy, float).reshape(-1, 2)
+        A = self.points[:-1]
+        D = self.segments
+        n = Q.shape[0]
+        seg_idx = np.zeros(n, dtype=int)
+        params = np.zeros(n, float)
+        chunk = max(1, _PROJECTION_CHUNK // len(D))
+        for start in range(0, n, chunk):
+            q = Q[start:start + chunk]
+            rel = q[:, None, :] - A[None, :, :]
+            t = np.clip(np.einsum("nmk,mk->nm", rel, D) * self._inv_len_sq, 0.0, 1.0)
+            diff = rel - t[:, :, None] * D[None, :, :]
+            best = np.argmin(np.einsum("nmk,nmk->nm", diff, diff), axis=1)
+            seg_idx[start:start + chunk] = best
+            params[start:start + chunk] = t[np.arange(len(q)), best]
+        pos = A[seg_idx] + params[:, None] * D[seg_idx]
+        return pos, self.tangents[seg_idx], seg_idx
+
+    def offset_sides(self, offset: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Left/right mitered offsets of the open polyline (memoized per offset)."""
+        key = ("sides", float(offset))
+        cached = self._offset_cache.get(key)
+        if cached is None:
+            P = self.points
+            T = self.tangents
+            N = self.normals
+            inner_P = P[1:-1]
+            left = _miter_offset_points(inner_P, T[:-1], N[:-1], T[1:], N[1:], offset)
+            right = _miter_offset_points(inner_P, T[:-1], N[:-1], T[1:], N[1:], -offset)
+            L = np.vstack([P[0] + offset * N[0], left, P[-1] + offset * N[-1]])
+            R = np.vstack([P[0] - offset * N[0], right, P[-1] - offset * N[-1]])
+            cached = (_readonly(L), _readonly(R))
+            self._offset_cache[key] = cached
+        return cached
+
+    def offset_ring(self, offset: float) -> np.ndarray:
+        """Single mitered ring for a closed path (memoized per offset).
+
+        Positive offsets move outward for a CCW centerline; the duplicated
+        closing point is dropped before offsetting.
+        """
+        key = ("ring", float(offset))
+        cached = self._offset_cache.get(key)
+        if cached is None:
+            P = np.asarray(self.points)
+            if len(P) > 1 and np.linalg.norm(P[0] - P[-1]) < 0.01:
+                P = P[:-1]
+            n = len(P)
+            if n < 3:
+                raise ValueError("Closed polyline needs at least 3 points")
+            D = np.roll(P, -1, axis=0) - P
+            seg_len = np.linalg.norm(D, axis=1)
+            T = np.tile(np.array([1.0, 0.0]), (n, 1))
+            valid = seg_len >= 1e-12
+            T[valid] = D[valid] / seg_len[valid, None]
+            # CW rotation gives the outward normal for a CCW polygon
+            N = np.column_stack([T[:, 1], -T[:, 0]])
+            T_prev = np.roll(T, 1, axis=0)
+            N_prev = np.roll(N, 1, axis=0)
+            cached = _readonly(_miter_offset_points(P, T_prev, N_prev, T, N, offset))
+            self._offset_cache[key] = cached
+        return cached
+
+    def footprint_ring(self, half_width: float) -> np.ndarray:
+        """Open-path footprint polygon: left side followed by reversed right side."""
+        key = ("footprint", float(half_width))
+        cached = self._offset_cache.get(key)
+        if cached is None:
+            L, R = self.offset_sides(half_width)
+            cached = _readonly(np.vstack([L, R[::-1]]))
+            self._offset_cache[key] = cached
+        return cached
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_trench_path(key: Tuple[Tuple[float, float], ...]) -> TrenchPath:
+    return TrenchPath(key)
+
+
+def _as_trench_path(path: Any) -> TrenchPath:
+    return TrenchPath.from_xy(path)
+
+
 def _polyline_lengths(path: List[Tuple[float,float]]):
-    P = np.array(path, float)
-    segs = P[1:] - P[:-1]
-    lens = np.linalg.norm(segs, axis=1)
-    cum = np.concatenate([[0.0], np.cumsum(lens)])
-    return cum, float(cum[-1])
+    tp = _as_trench_path(path)
+    return tp.cum_length, tp.total_length
 
 def _sample_polyline_at_s(path: List[Tuple[float,float]], s: float):
-    P = np.array(path, float)
-    cum, total = _polyline_lengths(path)
-    if total == 0: return P[0], np.array([1.0, 0.0])
-    s_abs = s * total
-    i = np.searchsorted(cum, s_abs, side="right") - 1
-    i = int(np.clip(i, 0, len(P)-2))
-    seg = P[i+1] - P[i]; L = np.linalg.norm(seg)
-    if L == 0:
-        t = np.array([1.0, 0.0]); pos = P[i]
-    else:
-        t = seg / L; u = (s_abs - cum[i]) / L; pos = (1-u)*P[i] + u*P[i+1]
-    return pos, t
+    return _as_trench_path(path).sample_at_s(s)
 
 def _is_path_closed(path: List[Tuple[float,float]], threshold: float = 0.01) -> bool:
     """Detect if a path is explicitly closed (first and last points nearly identical).
@@ -84,6 +277,10 @@ def _is_path_closed(path: List[Tuple[float,float]], threshold: float = 0.01) ->
     Use a small threshold (default 0.01) to only catch truly closed paths where
     the endpoint is repeated.
     """
+    if isinstance(path, TrenchPath):
+        if threshold == 0.01:
+            return path.is_closed
+        path = path.points
     if len(path) < 3:
         return False
     P = np.array(path, float)
@@ -91,30 +288,9 @@ def _is_path_closed(path: List[Tuple[float,float]], threshold: float = 0.01) ->
     return first_last_dist < threshold
 
 def _offset_polyline(path: List[Tuple[float,float]], offset: float):
-    P = np.array(path, float); n = len(P)
-    if n < 2: raise ValueError("Polyline needs at least 2 points")
-    tangents = []; normals = []
-    for i in range(n-1):
-        t = _normalize(P[i+1]-P[i])
-        if np.linalg.norm(t) < 1e-12: t = np.array([1.0, 0.0])
-        tangents.append(t); normals.append(_rotate_ccw(t))
-    left_pts = [P[0] + offset * normals[0]]
-    right_pts = [P[0] - offset * normals[0]]
-    for k in range(1, n-1):
-        t_prev, n_prev = tangents[k-1], normals[k-1]
-        t_next, n_next = tangents[k], normals[k]
-        L1_p = P[k] + offset * n_prev; L1_d = t_prev
-        L2_p = P[k] + offset * n_next; L2_d = t_next
-        R1_p = P[k] - offset * n_prev; R1_d = t_prev
-        R2_p = P[k] - offset * n_next; R2_d = t_next
-        L = _line_intersection_2d(L1_p, L1_d, L2_p, L2_d)
-        R = _line_intersection_2d(R1_p, R1_d, R2_p, R2_d)
-        if L is None: L = 0.5*(L1_p + L2_p)
-        if R is None: R = 0.5*(R1_p + R2_p)
-        left_pts.append(L); right_pts.append(R)
-    left_pts.append(P[-1] + offset * normals[-1])
-    right_pts.append(P[-1] - offset * normals[-1])
-    return left_pts, right_pts
+    tp = _as_trench_path(path)
+    L, R = tp.offset_sides(offset)
+    return list(L), list(R)
 
 def _offset_closed_polyline(path: List[Tuple[float,float]], offset: float) -> List[np.ndarray]:
     """Offset a closed polyline, returning a single closed ring.
@@ -122,40 +298,7 @@ def _offset_closed_polyline(path: List[Tuple[float,float]], offset: float) -> Li
     Unlike _offset_polyline which returns left/right sides for open paths,
     this returns a single continuous closed ring for paths where first ≈ last point.
     """
-    P = np.array(path, float)
-    # Remove duplicate closing point if present (first ≈ last)
-    if len(P) > 1 and np.linalg.norm(P[0] - P[-1]) < 0.01:
-        P = P[:-1]
-    n = len(P)
-    if n < 3:
-        raise ValueError("Closed polyline needs at least 3 points")
-
-    # Compute tangents treating path as closed loop
-    # For CCW-oriented polygons, use CW rotation to get outward-pointing normals
-    tangents = []
-    normals = []
-    for i in range(n):
-        t = _normalize(P[(i+1) % n] - P[i])
-        if np.linalg.norm(t) < 1e-12:
-            t = np.array([1.0, 0.0])
-        tangents.append(t)
-        normals.append(_rotate_cw(t))  # CW rotation gives outward normal for CCW polygon
-
-    # Compute offset points with proper miter at each vertex
-    offset_pts = []
-    for k in range(n):
-        t_prev, n_prev = tangents[(k-1) % n], normals[(k-1) % n]
-        t_next, n_next = tangents[k], normals[k]
-        L1_p = P[k] + offset * n_prev
-        L1_d = t_prev
-        L2_p = P[k] + offset * n_next
-        L2_d = t_next
-        pt = _line_intersection_2d(L1_p, L1_d, L2_p, L2_d)
-        if pt is None:
-            pt = 0.5 * (L1_p + L2_p)
-        offset_pts.append(pt)
-
-    return offset_pts
+    return list(_as_trench_path(path).offset_ring(offset))
 
 def _polygon_area_2d(poly_xy: np.ndarray) -> float:
     x = poly_xy[:,0]; y = poly_xy[:,1]
@@ -164,47 +307,80 @@ def _polygon_area_2d(poly_xy: np.ndarray) -> float:
 def _ensure_ccw(poly_xy: np.ndarray) -> np.ndarray:
     return poly_xy if _polygon_area_2d(poly_xy) > 0 else poly_xy[::-1].copy()
 
-def _cross2d(a: np.ndarray, b: np.ndarray) -> float:
-    return float(a[0]*b[1] - a[1]*b[0])
-
-def _ear_clipping_triangulation(poly_xy: np.ndarray) -> np.ndarray:
-    def is_convex(a, b, c): return _cross2d(b - a, c - b) > 0
-    def point_in_tri(p, a, b, c):
-        v0=c-a; v1=b-a; v2=p-a
-        den=v0[0]*v1[1]-v1[0]*v0[1]
-        if abs(den)<1e-15: return False
-        u=(v2[0]*v1[1]-v1[0]*v2[1])/den
-        v=(v0[0]*v2[1]-v2[0]*v0[1])/den
-        return (u>=-1e-12) and (v>=-1e-12) and (u+v<=1+1e-12)
-    V = list(range(len(poly_xy))); tris=[]; it=0
-    while len(V)>3 and it<10000:
-        ear=False; m=len(V)
-        for vi in range(m):
-            i0=V[(vi-1)%m]; i1=V[vi]; i2=V[(vi+1)%m]
-            a,b,c = poly_xy[i0], poly_xy[i1], poly_xy[i2]
-            if not is_convex(a,b,c): continue
-            inside=False
-            for j in range(m):
-                if j in [(vi-1)%m,vi,(vi+1)%m]: continue
-                pj = poly_xy[V[j]]
-                if point_in_tri(pj,a,b,c): inside=True; break
-            if inside: continue
-            tris.append([i0,i1,i2]); del V[vi]; ear=True; break
-        if not ear:
-            V2=V.copy()
-            for k in range(1,len(V2)-1): tris.append([V2[0],V2[k],V2[k+1]])
-            V=[V2[0],V2[-1],V2[-2]]
-        it+=1
-    tris.append([V[0],V[1],V[2]])
-    return np.array(tris,int)
+@dataclass(frozen=True)
+class BoundaryLoop:
+    """One closed boundary loop of a triangulated surface."""
+    indices: np.ndarray        # Vertex indices in traversal order (loop not repeated)
+    vertices_xy: np.ndarray    # (k, 2) XY coordinates in the same order
+    signed_area: float         # Shoelace area in XY; > 0 for counter-clockwise
+
+    @property
+    def orientation(self) -> str:
+        return "ccw" if self.signed_area > 0 else "cw"
+
+
+def _extract_boundary_loops(V: np.ndarray, F: np.ndarray) -> List[BoundaryLoop]:
+    """Extract every boundary loop of a triangulated mesh, largest first.
+
+    Boundary edges are the undirected edges used by exactly one face (found
+    with a single ``np.unique`` over packed (min, max) vertex keys). Each keeps the
+    direction it has in its face, so loops follow the face winding: for a
+    counter-clockwise surface the outer loop is CCW and holes are CW. Loops
+    are chained without Python-level walking: every boundary edge is linked to
+    the edge leaving its end vertex, then pointer jumping labels each cycle by
+    its smallest edge and ranks edges along it. Assumes a manifold boundary
+    (one outgoing boundary edge per boundary vertex).
+    """
+    F = np.asarray(F, dtype=np.int64)
+    if F.size == 0:
+        return []
+    directed = F[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    lo = directed.min(axis=1)
+    hi = directed.max(axis=1)
+    keys = lo * (int(directed.max()) + 1) + hi
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    boundary = directed[counts[inverse] == 1]
+    if boundary.shape[0] == 0:
+        return []
+
+    src, dst = boundary[:, 0], boundary[:, 1]
+    n = src.size
+    by_src = np.argsort(src, kind="stable")
+    pos = np.clip(np.searchsorted(src[by_src], dst), 0, n - 1)
+    succ = by_src[pos]
+    succ = np.where(src[succ] == dst, succ, np.arange(n))  # dangling edge: stop here
+
+    rounds = max(1, int(np.ceil(np.log2(n))) + 1)
+    label = np.arange(n)
+    jump = succ.copy()
+    for _ in range(rounds):
+        label = np.minimum(label, label[jump])
+        jump = jump[jump]
+
+    # Distance from each edge to the last edge before its loop's leader.
+    nxt = np.where(label[succ] == succ, np.arange(n), succ)
+    rank = (nxt != np.arange(n)).astype(np.int64)
+    for _ in range(rounds):
+        rank = rank + rank[nxt]
+        nxt = nxt[nxt]
+
+    order = np.lexsort((-rank, label))
+    starts = np.flatnonzero(np.r_[True, label[order][1:] != label[order][:-1]])
+    loops: List[BoundaryLoop] = []
+    for chunk in np.split(order, starts[1:]):
+        if chunk.size < 3:
+            continue
+        idx = src[chunk]
+        xy = np.asarray(V, dtype=float)[idx, :2]
+        x, y = xy[:, 0], xy[:, 1]
+        area = 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+        loops.append(BoundaryLoop(indices=idx, vertices_xy=xy, signed_area=area))
+    loops.sort(key=lambda loop: -abs(loop.signed_area))
+    return loops
 
 
 def _extract_boundary_polygon(V: np.ndarray, F: np.ndarray) -> Optional[np.ndarray]:
-    """Extract ordered boundary polygon from a triangulated mesh.
-
-    Finds boundary edges (edges appearing in only one face) and chains
-    them together to form an ordered polygon. This correctly handles
-    non-convex shapes like L-shaped or U-shaped boundaries.
+    """Extract the ordered outer boundary polygon from a triangulated mesh.
 
     Parameters
     ----------
@@ -216,88 +392,141 @@ def _extract_boundary_polygon(V: np.ndarray, F: np.ndarray) -> Optional[np.ndarr
     Returns
     -------
     np.ndarray or None
-        Ordered boundary vertices XY coordinates (k, 2), or None if
-        no boundary edges found (closed mesh).
+        XY coordinates (k, 2) of the loop enclosing the largest area, or
+        None if no boundary edges are found (closed mesh). Use
+        :func:`_extract_boundary_loops` to get holes as well.
     """
-    if F.size == 0:
-        return None
-
-    # Count edge occurrences - boundary edges appear exactly once
-    edge_count: Dict[Tuple[int, int], int] = {}
-    for face in F:
-        for i in range(3):
-            v0, v1 = int(face[i]), int(face[(i + 1) % 3])
-            edge = (min(v0, v1), max(v0, v1))
-            edge_count[edge] = edge_count.get(edge, 0) + 1
-
-    # Boundary edges appear exactly once
-    boundary_edges = [edge for edge, count in edge_count.items() if count == 1]
-
-    if not boundary_edges:
-        return None  # No boundary (closed mesh)
-
-    # Build adjacency from boundary edges
-    adj: Dict[int, List[int]] = {}
-    for v0, v1 in boundary_edges:
-        adj.setdefault(v0, []).append(v1)
-        adj.setdefault(v1, []).append(v0)
-
-    # Chain the boundary edges starting from any vertex
-    start = boundary_edges[0][0]
-    polygon = [start]
-    prev = None
-    curr = start
-
-    max_iter = len(boundary_edges) + 1
-    for _ in range(max_iter):
-        neighbors = adj.get(curr, [])
-        # Pick the neighbor that isn't the previous vertex
-        next_candidates = [n for n in neighbors if n != prev]
-        if not next_candidates:
-            break
-        next_v = next_candidates[0]
-        if next_v == start:
-            break  # Completed the loop
-        polygon.append(next_v)
-        prev = curr
-        curr = next_v
-
-    # Extract XY coordinates
-    return V[polygon, :2]
+    loops = _extract_boundary_loops(V, F)
+    return loops[0].vertices_xy if loops else None
 
 
 # ---------------- Mesh IO & metrics ----------------
 
+_OBJ_CHUNK_ROWS = 1 << 16
+
+
 def write_obj_with_groups(path: str, groups: Dict[str, Tuple[np.ndarray, np.ndarray]]):
-    lines=[]; offset=1
-    for g,(V,F) in groups.items():
-        lines.append(f"g {g}")
-        for v in V: lines.append(f"v {v[0]:.9g} {v[1]:.9g} {v[2]:.9g}")
-        for tri in F:
-            a,b,c = tri + offset
-            lines.append(f"f {a} {b} {c}")
-        offset += V.shape[0]
-    with open(path,"w") as f: f.write("\n".join(lines))
+    """Write groups to an OBJ file, streaming one block of rows at a time.
+
+    Lines are newline-separated with no trailing newline; vertices use
+    ``%.9g`` and faces are 1-based. Each block of up to ``_OBJ_CHUNK_ROWS``
+    rows is formatted with a single ``%`` operation and written as bytes, so
+    the output is the same on every platform and peak memory stays at one
+    block rather than the whole file.
+    """
+    offset = 1
+    sep = b""
+    with open(path, "wb") as f:
+        for g, (V, F) in groups.items():
+            f.write(sep + f"g {g}".encode("utf-8"))
+            sep = b"\n"
+            V = np.asarray(V, float).reshape(-1, 3)
+            for start in range(0, len(V), _OBJ_CHUNK_ROWS):
+                block = V[start:start + _OBJ_CHUNK_ROWS]
+                text = ("\nv %.9g %.9g %.9g" * len(block)) % tuple(block.ravel().tolist())
+                f.write(text.encode("ascii"))
+            F = np.asarray(F).reshape(-1, 3)
+            for start in range(0, len(F), _OBJ_CHUNK_ROWS):
+                block = F[start:start + _OBJ_CHUNK_ROWS] + offset
+                text = ("\nf %d %d %d" * len(block)) % tuple(block.ravel().tolist())
+                f.write(text.encode("ascii"))
+            offset += V.shape[0]
+
+_OBJ_LINE_OTHER, _OBJ_LINE_V, _OBJ_LINE_F, _OBJ_LINE_G = 0, 1, 2, 3
+
+
+def _parse_obj_run(chunk: bytes, n_lines: int, dtype) -> np.ndarray:
+    """Parse a run of consecutive ``v`` or ``f`` lines into an (n, 3) array.
+
+    The whole run is read by one ``np.loadtxt`` call over columns 1-3, which
+    also keeps the first three values of quads and ``v x y z w`` lines;
+    runs that it rejects (``f a/b/c`` slashes, short lines) fall back to
+    taking the first three values of each line, like the line-by-line parser.
+    """
+    if dtype is float or b"/" not in chunk:
+        try:
+            values = np.loadtxt(
+                io.BytesIO(chunk),
+                dtype=np.float64 if dtype is float else np.int64,
+                usecols=(1, 2, 3),
+                ndmin=2,
+            )
+        except ValueError:
+            values = None
+        if values is not None and len(values) == n_lines:
+            return values
+    rows = [line.split()[1:4] for line in chunk.split(b"\n") if line.strip()]
+    if dtype is float:
+        return np.array(rows, dtype=bytes).astype(np.float64).reshape(-1, 3)
+    return np.array([[int(p.split(b"/")[0]) for p in row] for row in rows], np.int64).reshape(-1, 3)
+
 
 def parse_obj_groups(path: str):
-    verts=[]; faces_by_group={}; current="default"
-    with open(path,"r") as f:
-        for line in f:
-            if not line.strip(): continue
-            if line.startswith("v "):
-                _,x,y,z = line.strip().split()
-                verts.append([float(x),float(y),float(z)])
-            elif line.startswith("g "):
-                current = line.strip().split(maxsplit=1)[1]
-                faces_by_group.setdefault(current, [])
-            elif line.startswith("f "):
-                parts = line.strip().split()
-                idxs = [int(p.split('/')[0])-1 for p in parts[1:4]]
-                faces_by_group.setdefault(current, []).append(idxs)
-    V=np.array(verts,float)
-    faces_by_group = {k:(np.array(v,int) if len(v) else np.zeros((0,3),int)) for k,v in faces_by_group.items()}
+    """Parse an OBJ file into (V, {group: F}) with 0-based triangle indices.
+
+    Lines are classified with numpy and every run of consecutive vertex or
+    face lines is converted in one shot, so large files parse at numpy speed.
+    Faces before the first ``g`` line land in ``"default"``; only the first
+    three indices of each face are kept.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    buf = np.frombuffer(data, np.uint8)
+    newlines = np.flatnonzero(buf == ord("\n"))
+    starts = np.concatenate([[0], newlines + 1])
+    ends = np.concatenate([newlines, [len(buf)]])
+    padded = np.concatenate([buf, np.zeros(2, np.uint8)])
+    first, second = padded[starts], padded[starts + 1]
+    kind = np.full(len(starts), _OBJ_LINE_OTHER, np.int8)
+    is_tagged = second == ord(" ")
+    kind[is_tagged & (first == ord("v"))] = _OBJ_LINE_V
+    kind[is_tagged & (first == ord("f"))] = _OBJ_LINE_F
+    kind[is_tagged & (first == ord("g"))] = _OBJ_LINE_G
+
+    run_starts = np.concatenate([[0], np.flatnonzero(np.diff(kind)) + 1])
+    run_ends = np.concatenate([run_starts[1:], [len(kind)]])
+    verts: List[np.ndarray] = []
+    faces: Dict[str, List[np.ndarray]] = {}
+    current = "default"
+    for a, b in zip(run_starts.tolist(), run_ends.tolist()):
+        k = kind[a]
+        if k == _OBJ_LINE_G:
+            for i in range(a, b):
+                line = data[starts[i]:ends[i]].decode("utf-8").strip()
+                current = line.split(maxsplit=1)[1] if " " in line else "default"
+                faces.setdefault(current, [])
+        elif k == _OBJ_LINE_V:
+            verts.append(_parse_obj_run(data[starts[a]:ends[b - 1]], b - a, float))
+        elif k == _OBJ_LINE_F:
+            F = _parse_obj_run(data[starts[a]:ends[b - 1]], b - a, int)
+            faces.setdefault(current, []).append(F - 1)
+    V = np.vstack(verts) if verts else np.zeros((0, 3), float)
+    faces_by_group = {
+        k: (np.vstack(v).astype(int) if v else np.zeros((0, 3), int)) for k, v in faces.items()
+    }
     return V, faces_by_group
 
+
+# Only the most recent file is kept: the metric helpers read one file in a
+# row, and each entry pins a whole mesh in memory.
+@functools.lru_cache(maxsize=1)
+def _load_obj_groups_cached(path: str, mtime_ns: int, size: int):
+    V, faces_by_group = parse_obj_groups(path)
+    return _readonly(V), {k: _readonly(F) for k, F in faces_by_group.items()}
+
+
+def load_obj_groups(path: str):
+    """Cached parse_obj_groups: one parse per (path, mtime, size).
+
+    Only the most recently loaded file stays cached. Returned arrays are
+    shared between callers and therefore read-only; use parse_obj_groups
+    for private, writable copies.
+    """
+    resolved = os.path.realpath(os.fspath(path))
+    st = os.stat(resolved)
+    V, faces_by_group = _load_obj_groups_cached(resolved, st.st_mtime_ns, st.st_size)
+    return V, dict(faces_by_group)
+
 def triangle_areas(V,F):
     p0=V[F[:,0]]; p1=V[F[:,1]]; p2=V[F[:,2]]
     return 0.5*np.linalg.norm(np.cross(p1-p0,p2-p0),axis=1)
@@ -305,7 +534,7 @@ def triangle_areas(V,F):
 def surface_area(V,F): return float(triangle_areas(V,F).sum())
 
 def surface_area_by_group(obj_path: str):
-    V, fbg = parse_obj_groups(obj_path)
+    V, fbg = load_obj_groups(obj_path)
     return {g: float(surface_area(V,F)) for g,F in fbg.items()}
 
 def signed_volume_of_closed_surface(V,F):
@@ -314,14 +543,14 @@ def signed_volume_of_closed_surface(V,F):
     return float(vol.sum()/6.0)
 
 def volume_by_groups_as_closed(obj_path: str, names):
-    V, fbg = parse_obj_groups(obj_path)
+    V, fbg = load_obj_groups(obj_path)
     Fs=[fbg[n] for n in names if n in fbg]
     if not Fs: return 0.0
     F=np.vstack(Fs)
     return signed_volume_of_closed_surface(V,F)
 
 def flux_volume_from_closed_groups(obj_path: str, names):
-    V, fbg = parse_obj_groups(obj_path)
+    V, fbg = load_obj_groups(obj_path)
     F_all = np.vstack([fbg[n] for n in names if n in fbg])
     p0=V[F_all[:,0]]; p1=V[F_all[:,1]]; p2=V[F_all[:,2]]
     cent=(p0+p1+p2)/3.0; Fvec=cent/3.0; nvec=np.cross(p1-p0,p2-p0)
@@ -387,11 +616,61 @@ def _compute_surface_metrics(
     return metrics
 
 
+PREVIEW_RENDERERS = ("raster", "matplotlib")
+
+
+def _render_matplotlib_view(
+    triangles: Sequence[Tuple[str, np.ndarray]],
+    mins: np.ndarray,
+    maxs: np.ndarray,
+    elev: float,
+    azim: float,
+) -> bytes:
+    Figure, FigureCanvasAgg, Poly3DCollection = _load_matplotlib()
+    fig = Figure(figsize=(8, 7))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111, projection="3d")
+    for group_name, tris in triangles:
+        pc = Poly3DCollection(tris, linewidths=0.1)
+        color = color_for_group(group_name)
+        pc.set_facecolor(color)
+        pc.set_edgecolor(color)
+        pc.set_alpha(opacity_for_group(group_name))
+        ax.add_collection3d(pc)
+    ax.set_xlim(mins[0], maxs[0])
+    ax.set_ylim(mins[1], maxs[1])
+    ax.set_zlim(mins[2], maxs[2])
+    ax.set_xlabel("X")
+    ax.set_ylabel("Y")
+    ax.set_zlabel("Z")
+    ax.view_init(elev=elev, azim=azim)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=150, bbox_inches="tight")
+    return buf.getvalue()
+
+
 def _render_surface_previews(
     groups: Dict[str, Tuple[np.ndarray, np.ndarray]],
     exclude_groups: Optional[frozenset] = None,
+    renderer: str = "raster",
+    max_workers: Optional[int] = None,
 ) -> Dict[str, bytes]:
-    if plt is None or not groups:
+    """Render top/side/oblique PNG previews of ``groups``.
+
+    ``renderer="raster"`` (default) uses the numpy z-buffer rasterizer in
+    :mod:`trenchfoot.preview_raster`; ``"matplotlib"`` draws labelled 3D axes
+    with ``Poly3DCollection`` on Agg figures and returns ``{}`` when matplotlib
+    is missing. Triangle arrays are built once and shared by every view; the
+    views render concurrently on up to ``max_workers`` threads (default: one
+    per view, ``1`` renders serially).
+    """
+    if renderer not in PREVIEW_RENDERERS:
+        raise ValueError(f"renderer must be one of {PREVIEW_RENDERERS}, got {renderer!r}")
+    if not groups:
+        return {}
+    if renderer == "raster":
+        return render_previews(groups, exclude_groups, views=PREVIEW_VIEWS, max_workers=max_workers)
+    if _load_matplotlib() is None:
         return {}
     if exclude_groups:
         groups = {k: v for k, v in groups.items() if k not in exclude_groups}
@@ -400,36 +679,16 @@ def _render_surface_previews(
         return {}
     stack = np.vstack(all_vertices)
     mins, maxs = stack.min(axis=0), stack.max(axis=0)
-    previews: Dict[str, bytes] = {}
-    viewset = [("top", (90, 0)), ("side", (0, 0)), ("oblique", (22, -60))]
-    for name, (elev, azim) in viewset:
-        fig = plt.figure(figsize=(8, 7))
-        ax = fig.add_subplot(111, projection="3d")
-        for group_name, (V, F) in groups.items():
-            if F.shape[0] == 0:
-                continue
-            tris = [V[idx] for idx in F]
-            if not tris:
-                continue
-            pc = Poly3DCollection(tris, linewidths=0.1)
-            color = color_for_group(group_name)
-            alpha = opacity_for_group(group_name)
-            pc.set_facecolor(color)
-            pc.set_edgecolor(color)
-            pc.set_alpha(alpha)
-            ax.add_collection3d(pc)
-        ax.set_xlim(mins[0], maxs[0])
-        ax.set_ylim(mins[1], maxs[1])
-        ax.set_zlim(mins[2], maxs[2])
-        ax.set_xlabel("X")
-        ax.set_ylabel("Y")
-        ax.set_zlabel("Z")
-        ax.view_init(elev=elev, azim=azim)
-        buf = io.BytesIO()
-        fig.savefig(buf, format="png", dpi=150, bbox_inches="tight")
-        plt.close(fig)
-        previews[name] = buf.getvalue()
-    return previews
+    triangles = [
+        (group_name, np.asarray(V, dtype=float)[np.asarray(F, dtype=np.int64)])
+        for group_name, (V, F) in groups.items()
+        if F.shape[0] > 0
+    ]
+    return _map_views(
+        lambda view: _render_matplotlib_view(triangles, mins, maxs, *view),
+        PREVIEW_VIEWS,
+        max_workers,
+    )
 
 # ---------------- Scene & primitives ----------------
 
@@ -444,6 +703,7 @@ class PipeSpec:
     n_theta: int = 96
     n_along: int = 48
     clearance_scale: float = 1.0
+    mesh_size: Optional[float] = None  # volumetric element size on this pipe; overrides MeshSizeSpec
 
 @dataclass
 class BoxSpec:
@@ -478,6 +738,44 @@ class GroundSpec:
     size_margin: float = 3.0
     fill_interior: bool = False  # For closed paths: fill the interior with ground surface
 
+@dataclass
+class TessellationSpec:
+    """Scene-wide curved-surface density; overrides per-object segment counts.
+
+    ``target_edge_length`` bounds the triangle edge length (m) around and along
+    each pipe/sphere; ``chord_tolerance`` bounds the distance (m) between a
+    facet and the true surface. With both set, the finer count wins.
+    ``min_segments``/``max_segments`` bound the count around a ring;
+    ``max_along_segments`` optionally caps the divisions along a pipe axis,
+    which are otherwise uncapped so long pipes keep the target spacing.
+    """
+    target_edge_length: Optional[float] = None
+    chord_tolerance: Optional[float] = None
+    min_segments: int = 8
+    max_segments: int = 256
+    max_along_segments: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.target_edge_length is not None or self.chord_tolerance is not None
+
+@dataclass
+class MeshSizeSpec:
+    """Graded volumetric element sizes; replaces the mesher's uniform ``lc``.
+
+    Elements are ``pipe_size`` on pipe surfaces (or ``pipe_radius_factor``
+    times each radius when unset; ``PipeSpec.mesh_size`` overrides both) and
+    ``wall_size`` on the trench boundary, then grow by at most ``growth`` m per
+    m of distance up to ``far_size`` in open air. ``far_size`` defaults to the
+    mesher's ``lc``; without ``wall_size`` the walls are not refined.
+    """
+    enable: bool = True
+    far_size: Optional[float] = None
+    pipe_size: Optional[float] = None
+    pipe_radius_factor: float = 0.5
+    wall_size: Optional[float] = None
+    growth: float = 0.4
+
 @dataclass
 class SceneSpec:
     path_xy: List[Tuple[float,float]]
@@ -490,6 +788,13 @@ class SceneSpec:
     spheres: List[SphereSpec] = field(default_factory=list)
     noise: NoiseSpec = field(default_factory=NoiseSpec)
     ground: GroundSpec = field(default_factory=GroundSpec)
+    tessellation: Optional[TessellationSpec] = None
+    mesh_size: Optional[MeshSizeSpec] = None  # volumetric only
+
+    @property
+    def trench_path(self) -> TrenchPath:
+        """Compiled centerline shared by all geometry stages for this spec."""
+        return TrenchPath.from_xy(self.path_xy)
 
 
 @dataclass(frozen=True)
@@ -498,6 +803,7 @@ class SurfaceMeshFiles:
     metrics_path: Path
     preview_paths: Tuple[Path, ...]
     sdf_metadata_path: Optional[Path] = None
+    binary_path: Optional[Path] = None
 
 
 @dataclass
@@ -507,30 +813,56 @@ class SurfaceMeshResult:
     object_counts: Dict[str, int]
     metrics: Dict[str, Any]
     previews: Dict[str, bytes]
+    # Wall-clock seconds per stage; persist() adds "persist.*" entries
+    timings: Dict[str, float] = field(default_factory=dict)
+    # SDF metadata stored in a binary container, restored by load()
+    sdf_metadata: Optional[Dict[str, Any]] = None
+    # True when load() kept only some groups; such results are read-only
+    partial: bool = False
+
+    def _check_complete(self, action: str) -> None:
+        if self.partial:
+            raise ValueError(
+                f"Cannot {action} a SurfaceMeshResult loaded with a subset of groups; "
+                "load it without groups=... first"
+            )
 
     def _build_sdf_metadata(self) -> Dict[str, Any]:
         """Build SDF metadata for downstream consumers.
 
         This metadata enables generic mesh-to-SDF pipelines to correctly
         interpret the mesh geometry without trenchfoot-specific heuristics.
+        Partial loads return the stored metadata of the full scene, since
+        the missing groups (walls, opening) cannot be rebuilt.
         """
+        if self.partial:
+            if self.sdf_metadata is None:
+                self._check_complete("build SDF metadata for")
+            return {"sdf_metadata": self.sdf_metadata}
         # Extract trench opening polygon from the trench cap geometry
         trench_opening_vertices = None
+        trench_opening_orientation = None
+        trench_opening_holes: List[Dict[str, Any]] = []
         if "trench_cap_for_volume" in self.groups:
             V_cap, F_cap = self.groups["trench_cap_for_volume"]
             if V_cap.size > 0:
-                # Extract boundary polygon by finding boundary edges (edges in only one face)
-                # and chaining them together. This correctly handles non-convex shapes
-                # like L-shaped or U-shaped trenches.
-                boundary_xy = _extract_boundary_polygon(V_cap, F_cap)
-                if boundary_xy is not None:
-                    trench_opening_vertices = boundary_xy.tolist()
+                # Boundary loops come from edges used by only one face, so non-convex
+                # openings (L/U shapes) keep their inner corners and annular caps
+                # (closed wells) report the central column as a hole.
+                loops = _extract_boundary_loops(V_cap, F_cap)
+                if loops:
+                    trench_opening_vertices = loops[0].vertices_xy.tolist()
+                    trench_opening_orientation = loops[0].orientation
+                    trench_opening_holes = [
+                        {"vertices_xy": loop.vertices_xy.tolist(), "orientation": loop.orientation}
+                        for loop in loops[1:]
+                    ]
                 else:
                     # Fallback: just use all vertices (unordered)
                     trench_opening_vertices = V_cap[:, :2].tolist()
 
         # Determine geometry type
-        is_closed = _is_path_closed(self.spec.path_xy)
+        is_closed = self.spec.trench_path.is_closed
         geometry_type = "closed_well" if is_closed else "open_trench"
 
         # Build surface group info
@@ -559,6 +891,8 @@ class SurfaceMeshResult:
                 "trench_opening": {
                     "type": "polygon",
                     "vertices_xy": trench_opening_vertices,
+                    "orientation": trench_opening_orientation,
+                    "holes": trench_opening_holes,
                     "z_level": self.spec.ground.z0 if self.spec.ground else 0.0,
                 },
                 "surface_groups": surface_groups,
@@ -570,43 +904,144 @@ class SurfaceMeshResult:
             }
         }
 
-    def persist(self, out_dir: str | Path, *, include_previews: bool = False, include_sdf_metadata: bool = True) -> SurfaceMeshFiles:
+    def persist(
+        self,
+        out_dir: str | Path,
+        *,
+        include_previews: bool = False,
+        include_sdf_metadata: bool = True,
+        include_binary: bool = False,
+    ) -> SurfaceMeshFiles:
+        self._check_complete("persist")
+        timer = StageTimer(self.timings)
         out_path = Path(out_dir)
         out_path.mkdir(parents=True, exist_ok=True)
         obj_path = out_path / "trench_scene.obj"
         # Exclude internal groups (like trench_cap_for_volume) from OBJ export
         export_groups = {k: v for k, v in self.groups.items() if k not in _INTERNAL_GROUPS}
-        write_obj_with_groups(obj_path.as_posix(), export_groups)
+        with timer.stage("persist.obj"):
+            write_obj_with_groups(obj_path.as_posix(), export_groups)
         metrics_path = out_path / "metrics.json"
-        with metrics_path.open("w") as fh:
-            json.dump(self.metrics, fh, indent=2)
+        with timer.stage("persist.metrics"):
+            # Timings cover generation and the OBJ write; later stages are on self.timings
+            with metrics_path.open("w") as fh:
+                json.dump({**self.metrics, "timings": dict(self.timings)}, fh, indent=2)
 
         # Export SDF metadata
         sdf_metadata_path = None
         if include_sdf_metadata:
-            sdf_metadata = self._build_sdf_metadata()
-            sdf_metadata_path = out_path / "sdf_metadata.json"
-            with sdf_metadata_path.open("w") as fh:
-                json.dump(sdf_metadata, fh, indent=2)
+            with timer.stage("persist.sdf_metadata"):
+                sdf_metadata = self._build_sdf_metadata()
+                sdf_metadata_path = out_path / "sdf_metadata.json"
+                with sdf_metadata_path.open("w") as fh:
+                    json.dump(sdf_metadata, fh, indent=2)
+
+        # Binary container with every group (internal ones included) for load()
+        binary_path = None
+        if include_binary:
+            with timer.stage("persist.binary"):
+                binary_path = self.write_binary(out_path / SURFACE_MESH_BINARY_NAME)
 
         preview_paths: List[Path] = []
         if include_previews and self.previews:
-            for name, data in self.previews.items():
-                target = out_path / f"preview_{name}.png"
-                target.write_bytes(data)
-                preview_paths.append(target)
+            with timer.stage("persist.previews"):
+                for name, data in self.previews.items():
+                    target = out_path / f"preview_{name}.png"
+                    target.write_bytes(data)
+                    preview_paths.append(target)
         return SurfaceMeshFiles(
             obj_path=obj_path,
             metrics_path=metrics_path,
             preview_paths=tuple(preview_paths),
             sdf_metadata_path=sdf_metadata_path,
+            binary_path=binary_path,
+        )
+
+    def write_binary(self, path: str | Path) -> Path:
+        """Write groups, spec, metrics and SDF metadata to one array container.
+
+        Each group is stored as ``<name>/vertices`` (float64) and
+        ``<name>/faces`` (int64) so :meth:`load` can memory-map them.
+        """
+        self._check_complete("write")
+        arrays: Dict[str, np.ndarray] = {}
+        for name, (V, F) in self.groups.items():
+            arrays[f"{name}/vertices"] = np.asarray(V, np.float64).reshape(-1, 3)
+            arrays[f"{name}/faces"] = np.asarray(F, np.int64).reshape(-1, 3)
+        metadata = {
+            "kind": "surface_mesh",
+            "format_version": 1,
+            "groups": list(self.groups),
+            "spec": asdict(self.spec),
+            "object_counts": self.object_counts,
+            "metrics": self.metrics,
+            "timings": self.timings,
+            "sdf_metadata": self._build_sdf_metadata()["sdf_metadata"],
+        }
+        return write_array_container(path, arrays, metadata)
+
+    @classmethod
+    def load(
+        cls,
+        path: str | Path,
+        *,
+        groups: Optional[Sequence[str]] = None,
+        mmap_mode: Optional[str] = "r",
+    ) -> "SurfaceMeshResult":
+        """Load a result written by ``persist(include_binary=True)``.
+
+        ``path`` is the container file or the directory holding it. With the
+        default ``mmap_mode="r"`` the group arrays are read-only views into
+        the mapped file, so only the groups that are touched get read;
+        ``groups`` restricts the result to a subset of group names; such a
+        result is marked ``partial`` and refuses :meth:`persist`, while its
+        ``sdf_metadata`` still describes the full scene. Previews are not
+        stored and come back empty.
+        """
+        target = Path(path)
+        if target.is_dir():
+            target = target / SURFACE_MESH_BINARY_NAME
+        container = read_array_container(target, mmap_mode=mmap_mode)
+        meta = container.metadata
+        if meta.get("kind") != "surface_mesh":
+            raise ValueError(f"{target} does not hold a surface mesh")
+        names = list(meta["groups"])
+        partial = False
+        if groups is not None:
+            missing = [g for g in groups if g not in names]
+            if missing:
+                raise KeyError(f"Groups not in {target}: {missing}")
+            partial = len(set(groups)) < len(names)
+            names = [g for g in names if g in set(groups)]
+        return cls(
+            spec=scene_spec_from_dict(meta["spec"]),
+            groups={n: (container[f"{n}/vertices"], container[f"{n}/faces"]) for n in names},
+            object_counts=dict(meta["object_counts"]),
+            metrics=meta["metrics"],
+            previews={},
+            timings=dict(meta.get("timings", {})),
+            sdf_metadata=meta.get("sdf_metadata"),
+            partial=partial,
         )
 
 def _ground_fn(g: GroundSpec):
+    """Planar ground height ``z0 + sx*x + sy*y``.
+
+    Scalars give a float; arrays (or any array argument) give an array of
+    heights evaluated in one pass.
+    """
     sx, sy = g.slope
-    def fn(x, y): return g.z0 + sx*float(x) + sy*float(y)
+    def fn(x, y):
+        if np.ndim(x) == 0 and np.ndim(y) == 0:
+            return g.z0 + sx*float(x) + sy*float(y)
+        return g.z0 + sx*np.asarray(x, float) + sy*np.asarray(y, float)
     return fn
 
+def _ground_z(g: GroundSpec, xy: np.ndarray) -> np.ndarray:
+    """Ground heights for an (N, 2) array of XY points."""
+    xy = np.asarray(xy, float).reshape(-1, 2)
+    return _ground_fn(g)(xy[:, 0], xy[:, 1])
+
 def _frame_from_axis(axis_dir: np.ndarray) -> np.ndarray:
     v=_normalize(axis_dir)
     helper=np.array([0.0,0.0,1.0],float)
@@ -614,6 +1049,64 @@ def _frame_from_axis(axis_dir: np.ndarray) -> np.ndarray:
     u=_normalize(np.cross(helper,v)); w=np.cross(v,u)
     return np.column_stack([u,v,w])
 
+@functools.lru_cache(maxsize=64)
+def _grid_faces(n_u: int, n_v: int) -> np.ndarray:
+    """Faces of an (n_u + 1) x (n_v + 1) vertex grid, two triangles per cell.
+
+    Row j, column i is vertex ``j * (n_u + 1) + i``; triangles are ordered
+    row by row as (v00, v01, v11), (v00, v11, v10).
+    """
+    i, j = np.meshgrid(np.arange(n_u), np.arange(n_v))
+    v00 = (j * (n_u + 1) + i).ravel()
+    v10 = v00 + 1
+    v01 = v00 + (n_u + 1)
+    v11 = v01 + 1
+    F = np.stack([np.column_stack([v00, v01, v11]), np.column_stack([v00, v11, v10])], axis=1)
+    return _readonly(F.reshape(-1, 3).astype(int))
+
+
+@functools.lru_cache(maxsize=64)
+def _ring_template(n_theta: int) -> np.ndarray:
+    """Closed unit ring (cos, sin) at ``n_theta + 1`` angles, seam repeated."""
+    thetas = np.linspace(0, 2 * np.pi, n_theta + 1)
+    return _readonly(np.column_stack([np.cos(thetas), np.sin(thetas)]))
+
+
+@functools.lru_cache(maxsize=64)
+def _fan_faces(n_theta: int, is_negative: bool) -> np.ndarray:
+    """Triangle fan around vertex 0 for a cap ring stored at 1..n_theta."""
+    i = np.arange(n_theta)
+    nxt = 1 + (i + 1) % n_theta
+    cols = [np.zeros(n_theta, int), nxt, 1 + i] if is_negative else [np.zeros(n_theta, int), 1 + i, nxt]
+    return _readonly(np.column_stack(cols))
+
+
+@functools.lru_cache(maxsize=64)
+def _sphere_template(n_theta: int, n_phi: int) -> np.ndarray:
+    """Unit sphere vertices on the (n_phi + 1) x (n_theta + 1) lat/long grid."""
+    ring = _ring_template(n_theta)
+    phis = np.linspace(0, np.pi, n_phi + 1)
+    sin_phi = np.sin(phis)[:, None]
+    V = np.empty((n_phi + 1, n_theta + 1, 3), float)
+    V[..., 0] = sin_phi * ring[:, 0]
+    V[..., 1] = sin_phi * ring[:, 1]
+    V[..., 2] = np.cos(phis)[:, None]
+    return _readonly(V.reshape(-1, 3))
+
+
+_BOX_CORNER_SIGNS = _readonly(
+    np.array([[sx, sy, sz] for sx in (-0.5, 0.5) for sy in (-0.5, 0.5) for sz in (-0.5, 0.5)], float)
+)
+_BOX_FACES = _readonly(np.array([
+    [4, 6, 7], [4, 7, 5],
+    [2, 6, 7], [2, 7, 3],
+    [1, 5, 7], [1, 7, 3],
+    [0, 4, 6], [0, 6, 2],
+    [0, 2, 3], [0, 3, 1],
+    [0, 4, 5], [0, 5, 1],
+], int))
+
+
 def make_cylinder(
     center: np.ndarray,
     axis_dir: np.ndarray,
@@ -673,43 +1166,26 @@ def make_cylinder(
     def xform(V: np.ndarray) -> np.ndarray:
         return (center + V @ M.T).astype(float)
 
-    # Generate cylinder side surface
-    thetas = np.linspace(0, 2 * np.pi, n_theta + 1)
+    # Generate cylinder side surface from the cached unit ring and grid faces
+    ring = _ring_template(n_theta)
     ys = np.linspace(y_neg, y_pos, n_along + 1)
-    Vloc = []
-    for j in range(n_along + 1):
-        y = ys[j]
-        for i in range(n_theta + 1):
-            th = thetas[i]
-            x = radius * np.cos(th)
-            z = radius * np.sin(th)
-            Vloc.append([x, y, z])
-    Vloc = np.array(Vloc, float)
-
-    def idx(i: int, j: int) -> int:
-        return j * (n_theta + 1) + i
-
-    F = []
-    for j in range(n_along):
-        for i in range(n_theta):
-            v00 = idx(i, j)
-            v10 = idx(i + 1, j)
-            v01 = idx(i, j + 1)
-            v11 = idx(i + 1, j + 1)
-            F.append([v00, v01, v11])
-            F.append([v00, v11, v10])
-    F = np.array(F, int)
+    Vloc = np.empty((n_along + 1, n_theta + 1, 3), float)
+    Vloc[..., 0] = radius * ring[:, 0]
+    Vloc[..., 1] = ys[:, None]
+    Vloc[..., 2] = radius * ring[:, 1]
+    Vloc = Vloc.reshape(-1, 3)
+    F = _grid_faces(n_theta, n_along).copy()
 
     out: Dict[str, Tuple[np.ndarray, np.ndarray]] = {"pipe_side": (xform(Vloc), F)}
 
     if with_caps:
         # Generate caps (either flat circular or angled elliptical)
         Vn, Fn = _make_cylinder_cap(
-            radius, y_neg, thetas[:-1], M, center, axis_dir,
+            radius, y_neg, ring[:-1], M, center, axis_dir,
             cap_plane_neg, is_negative=True
         )
         Vp, Fp = _make_cylinder_cap(
-            radius, y_pos, thetas[:-1], M, center, axis_dir,
+            radius, y_pos, ring[:-1], M, center, axis_dir,
             cap_plane_pos, is_negative=False
         )
         out['pipe_cap_neg'] = (Vn, Fn)
@@ -721,7 +1197,7 @@ def make_cylinder(
 def _make_cylinder_cap(
     radius: float,
     y_extent: float,
-    thetas: np.ndarray,
+    ring_dirs: np.ndarray,
     M: np.ndarray,
     center: np.ndarray,
     axis_dir: np.ndarray,
@@ -730,132 +1206,94 @@ def _make_cylinder_cap(
 ) -> Tuple[np.ndarray, np.ndarray]:
     """Generate a cylinder end cap, either flat or angled.
 
-    For angled caps, we compute where each point on the cylinder rim
+    ``ring_dirs`` holds the unit (cos, sin) rim directions, one per cap
+    vertex. For angled caps, we compute where each point on the cylinder rim
     intersects the cap plane, creating an elliptical cap.
     """
-    n_theta = len(thetas)
+    n_theta = len(ring_dirs)
+    F = _fan_faces(n_theta, is_negative).copy()
+
+    # Points on the cylinder rim at y_extent, transformed to world coordinates
+    ring_local = np.empty((n_theta, 3), float)
+    ring_local[:, 0] = radius * ring_dirs[:, 0]
+    ring_local[:, 1] = y_extent
+    ring_local[:, 2] = radius * ring_dirs[:, 1]
+    ring_world = center + ring_local @ M.T
+    flat_center = center + np.array([0.0, y_extent, 0.0]) @ M.T
 
     if cap_plane is None:
         # Flat circular cap perpendicular to axis
-        ring = np.array([
-            [radius * np.cos(t), y_extent, radius * np.sin(t)]
-            for t in thetas
-        ], float)
-        cap_center = np.array([[0.0, y_extent, 0.0]], float)
-        V = np.vstack([cap_center, ring])
+        return np.vstack([flat_center, ring_world]).astype(float), F
 
-        # Apply transformation to world coordinates
-        V_world = center + V @ M.T
+    # Angled cap: intersect cylinder rim with plane
+    plane_normal, plane_point = cap_plane
+    plane_normal = _normalize(plane_normal)
 
-        # Generate fan triangles
-        if is_negative:
-            # Negative cap: winding for outward normal (toward -axis)
-            F = np.array([[0, 1 + (i + 1) % n_theta, 1 + i] for i in range(n_theta)], int)
-        else:
-            # Positive cap: winding for outward normal (toward +axis)
-            F = np.array([[0, 1 + i, 1 + (i + 1) % n_theta] for i in range(n_theta)], int)
+    # Project every ring point along the axis onto the cap plane
+    # Line: P = ring_point + t * axis_dir
+    # Plane: dot(P - plane_point, plane_normal) = 0
+    # => t = dot(plane_point - ring_point, plane_normal) / dot(axis_dir, plane_normal)
+    denom = np.dot(axis_dir, plane_normal)
+    if abs(denom) < 1e-10:
+        # Axis is parallel to plane - fall back to flat cap
+        return np.vstack([flat_center, ring_world]).astype(float), F
 
-        return V_world.astype(float), F
-    else:
-        # Angled cap: intersect cylinder rim with plane
-        plane_normal, plane_point = cap_plane
-        plane_normal = _normalize(plane_normal)
-
-        # Points on the cylinder rim at y_extent (in local coords before xform)
-        ring_local = np.array([
-            [radius * np.cos(t), y_extent, radius * np.sin(t)]
-            for t in thetas
-        ], float)
+    t = (plane_point - ring_world) @ plane_normal / denom
+    cap_verts = ring_world + t[:, None] * axis_dir
 
-        # Transform ring to world coordinates
-        ring_world = center + ring_local @ M.T
-
-        # For each ring point, project along axis onto the cap plane
-        # Line: P = ring_point + t * axis_dir
-        # Plane: dot(P - plane_point, plane_normal) = 0
-        # => t = dot(plane_point - ring_point, plane_normal) / dot(axis_dir, plane_normal)
-        denom = np.dot(axis_dir, plane_normal)
-        if abs(denom) < 1e-10:
-            # Axis is parallel to plane - fall back to flat cap
-            V_world = np.vstack([
-                center + np.array([0.0, y_extent, 0.0]) @ M.T,
-                ring_world
-            ])
-            if is_negative:
-                F = np.array([[0, 1 + (i + 1) % n_theta, 1 + i] for i in range(n_theta)], int)
-            else:
-                F = np.array([[0, 1 + i, 1 + (i + 1) % n_theta] for i in range(n_theta)], int)
-            return V_world.astype(float), F
-
-        # Project ring points onto plane
-        cap_verts = []
-        for ring_pt in ring_world:
-            t = np.dot(plane_point - ring_pt, plane_normal) / denom
-            cap_pt = ring_pt + t * axis_dir
-            cap_verts.append(cap_pt)
-        cap_verts = np.array(cap_verts, float)
-
-        # Cap center: project axis center onto plane
-        axis_pt = center + y_extent * axis_dir
-        t_center = np.dot(plane_point - axis_pt, plane_normal) / denom
-        cap_center = axis_pt + t_center * axis_dir
-
-        V_world = np.vstack([cap_center.reshape(1, 3), cap_verts])
-
-        # Generate fan triangles
-        if is_negative:
-            F = np.array([[0, 1 + (i + 1) % n_theta, 1 + i] for i in range(n_theta)], int)
-        else:
-            F = np.array([[0, 1 + i, 1 + (i + 1) % n_theta] for i in range(n_theta)], int)
+    # Cap center: project axis center onto plane
+    axis_pt = center + y_extent * axis_dir
+    t_center = np.dot(plane_point - axis_pt, plane_normal) / denom
+    cap_center = axis_pt + t_center * axis_dir
 
-        return V_world.astype(float), F
+    V_world = np.vstack([cap_center.reshape(1, 3), cap_verts])
+    return V_world.astype(float), F
 
 def make_box(center: np.ndarray, frame_cols: np.ndarray, dims: Tuple[float,float,float]):
-    a,b,h=dims; u=frame_cols[:,0]; v=frame_cols[:,1]; w=frame_cols[:,2]
-    corners=[]
-    for sx in [-0.5,0.5]:
-      for sy in [-0.5,0.5]:
-        for sz in [-0.5,0.5]:
-          corners.append(center + sx*a*u + sy*b*v + sz*h*w)
-    corners=np.array(corners,float)
-    def vid(sx,sy,sz):
-        ix=0 if sx<0 else 1; iy=0 if sy<0 else 1; iz=0 if sz<0 else 1
-        return ix*4 + iy*2 + iz
-    quads=[
-      [vid( 0.5,-0.5,-0.5), vid( 0.5, 0.5,-0.5), vid( 0.5, 0.5, 0.5), vid( 0.5,-0.5, 0.5)],
-      [vid(-0.5, 0.5,-0.5), vid( 0.5, 0.5,-0.5), vid( 0.5, 0.5, 0.5), vid(-0.5, 0.5, 0.5)],
-      [vid(-0.5,-0.5, 0.5), vid( 0.5,-0.5,  0.5), vid( 0.5, 0.5, 0.5), vid(-0.5, 0.5, 0.5)],
-      [vid(-0.5,-0.5,-0.5), vid( 0.5,-0.5,-0.5), vid( 0.5, 0.5,-0.5), vid(-0.5, 0.5,-0.5)],
-      [vid(-0.5,-0.5,-0.5), vid(-0.5, 0.5,-0.5), vid(-0.5, 0.5, 0.5), vid(-0.5,-0.5, 0.5)],
-      [vid(-0.5,-0.5,-0.5), vid( 0.5,-0.5,-0.5), vid( 0.5,-0.5, 0.5), vid(-0.5,-0.5, 0.5)],
-    ]
-    faces=[]
-    for q in quads: faces.append([q[0],q[1],q[2]]); faces.append([q[0],q[2],q[3]])
-    return corners, np.array(faces,int)
+    # Corner k has signs _BOX_CORNER_SIGNS[k] (x-major, z-minor) along the frame columns
+    local = _BOX_CORNER_SIGNS * np.asarray(dims, float)
+    corners = np.asarray(center, float) + local @ np.asarray(frame_cols, float).T
+    return corners, _BOX_FACES.copy()
 
 def make_sphere(center: np.ndarray, radius: float, n_theta: int=48, n_phi: int=24):
     n_theta=max(8,int(n_theta)); n_phi=max(4,int(n_phi))
-    thetas=np.linspace(0,2*np.pi,n_theta+1); phis=np.linspace(0,np.pi,n_phi+1)
-    V=[]
-    for j in range(n_phi+1):
-        phi=phis[j]
-        for i in range(n_theta+1):
-            th=thetas[i]
-            x=radius*np.sin(phi)*np.cos(th); y=radius*np.sin(phi)*np.sin(th); z=radius*np.cos(phi)
-            V.append([center[0]+x, center[1]+y, center[2]+z])
-    V=np.array(V,float)
-    def idx(i,j): return j*(n_theta+1)+i
-    F=[]
-    for j in range(n_phi):
-        for i in range(n_theta):
-            v00=idx(i,j); v10=idx(i+1,j); v01=idx(i,j+1); v11=idx(i+1,j+1)
-            F.append([v00,v01,v11]); F.append([v00,v11,v10])
-    return V, np.array(F,int)
+    V = np.asarray(center, float) + radius * _sphere_template(n_theta, n_phi)
+    return V, _grid_faces(n_theta, n_phi).copy()
+
+def _ring_segments(radius: float, tess: "TessellationSpec") -> int:
+    """Segments around a circle of ``radius`` meeting the edge-length/chord targets."""
+    n = tess.min_segments
+    if radius > 0 and tess.target_edge_length:
+        n = max(n, math.ceil(2.0 * math.pi * radius / tess.target_edge_length))
+    if radius > 0 and tess.chord_tolerance and tess.chord_tolerance < radius:
+        # Sagitta of a chord spanning angle a is r * (1 - cos(a / 2)).
+        max_angle = 2.0 * math.acos(1.0 - tess.chord_tolerance / radius)
+        n = max(n, math.ceil(2.0 * math.pi / max_angle))
+    return int(min(max(n, tess.min_segments), tess.max_segments))
+
+def _pipe_segments(radius: float, length: float, tess: "TessellationSpec") -> Tuple[int, int]:
+    """(n_theta, n_along) for a pipe of ``radius`` and (truncated) ``length``.
+
+    Along the axis the surface is straight, so spacing follows the target edge
+    length, or the circumferential edge length when only a chord tolerance is
+    given; only ``max_along_segments`` (if set) caps the count.
+    """
+    n_theta = _ring_segments(radius, tess)
+    spacing = tess.target_edge_length or (2.0 * math.pi * radius / n_theta)
+    n_along = max(math.ceil(max(length, 0.0) / spacing) if spacing > 0 else 1, 1)
+    if tess.max_along_segments is not None:
+        n_along = min(n_along, tess.max_along_segments)
+    return n_theta, int(n_along)
+
+def _sphere_segments(radius: float, tess: "TessellationSpec") -> Tuple[int, int]:
+    """(n_theta, n_phi) for a sphere; meridians span half a circumference."""
+    n_theta = _ring_segments(radius, tess)
+    return n_theta, max(4, math.ceil(n_theta / 2))
 
 # --------------- Sloped trench surfaces with ground ---------------
 
 def _ring_from_LR(L: List[np.ndarray], R: List[np.ndarray]) -> np.ndarray:
-    return np.array(L + list(R[::-1]), float)
+    return np.vstack([np.asarray(L, float), np.asarray(R, float)[::-1]])
 
 
 def _extend_polyline_ends(
@@ -894,16 +1332,17 @@ def make_trench_from_path_sloped(path_xy: List[Tuple[float,float]], width_top: f
     shrink = max(0.0, wall_slope * depth)
     half_bot = max(1e-3, half_top - shrink)
 
-    is_closed = _is_path_closed(path_xy)
+    path = _as_trench_path(path_xy)
+    is_closed = path.is_closed
 
     if is_closed:
         # For closed paths (like circles), create outer/inner rings
         # Outer ring: centerline offset outward (positive)
         # Inner ring: centerline offset inward (negative)
-        outer_top = np.array(_offset_closed_polyline(path_xy, half_top), float)
-        inner_top = np.array(_offset_closed_polyline(path_xy, -half_top), float)
-        outer_bot = np.array(_offset_closed_polyline(path_xy, half_bot), float)
-        inner_bot = np.array(_offset_closed_polyline(path_xy, -half_bot), float)
+        outer_top = path.offset_ring(half_top)
+        inner_top = path.offset_ring(-half_top)
+        outer_bot = path.offset_ring(half_bot)
+        inner_bot = path.offset_ring(-half_bot)
 
         # Ensure CCW orientation (outer should be CCW, inner CW for proper normals)
         outer_top = _ensure_ccw(outer_top)
@@ -914,14 +1353,12 @@ def make_trench_from_path_sloped(path_xy: List[Tuple[float,float]], width_top: f
         if _polygon_area_2d(inner_bot) > 0:
             inner_bot = inner_bot[::-1].copy()
 
-        gfun = _ground_fn(ground)
-
         # For closed trenches, we need outer wall, inner wall, and bottom (no cap for annular trench)
         # Actually, for annular trench, the "bottom" is an annulus and the "cap" is also an annulus
-        z_outer_top = np.array([gfun(x,y) for x,y in outer_top])
-        z_inner_top = np.array([gfun(x,y) for x,y in inner_top])
-        z_outer_bot = np.array([gfun(x,y) - depth for x,y in outer_bot])
-        z_inner_bot = np.array([gfun(x,y) - depth for x,y in inner_bot])
+        z_outer_top = _ground_z(ground, outer_top)
+        z_inner_top = _ground_z(ground, inner_top)
+        z_outer_bot = _ground_z(ground, outer_bot) - depth
+        z_inner_bot = _ground_z(ground, inner_bot) - depth
 
         # Triangulate annular cap and bottom
         cap_verts, cap_faces = _triangulate_annulus(outer_top, inner_top[::-1])  # reverse inner for CCW
@@ -933,36 +1370,13 @@ def make_trench_from_path_sloped(path_xy: List[Tuple[float,float]], width_top: f
         # Floor normals point UP (+z) into the trench void for correct SDF sign
         F_bottom = _ensure_upward_normals(V_bottom, bot_faces)
 
-        # Outer wall: connects outer_top to outer_bot (facing outward from trench)
-        n_outer = len(outer_top)
-        walls_V = []
-        walls_F = []
-        for i in range(n_outer):
-            j = (i + 1) % n_outer
-            A_top = np.array([outer_top[i,0], outer_top[i,1], z_outer_top[i]])
-            B_top = np.array([outer_top[j,0], outer_top[j,1], z_outer_top[j]])
-            A_bot = np.array([outer_bot[i,0], outer_bot[i,1], z_outer_bot[i]])
-            B_bot = np.array([outer_bot[j,0], outer_bot[j,1], z_outer_bot[j]])
-            base = len(walls_V)
-            walls_V.extend([A_top, B_top, B_bot, A_bot])
-            # Winding for outward-facing (away from center)
-            walls_F.extend([[base, base+1, base+2], [base, base+2, base+3]])
-
-        # Inner wall: connects inner_top to inner_bot (facing inward toward center)
-        n_inner = len(inner_top)
-        for i in range(n_inner):
-            j = (i + 1) % n_inner
-            A_top = np.array([inner_top[i,0], inner_top[i,1], z_inner_top[i]])
-            B_top = np.array([inner_top[j,0], inner_top[j,1], z_inner_top[j]])
-            A_bot = np.array([inner_bot[i,0], inner_bot[i,1], z_inner_bot[i]])
-            B_bot = np.array([inner_bot[j,0], inner_bot[j,1], z_inner_bot[j]])
-            base = len(walls_V)
-            walls_V.extend([A_top, B_top, B_bot, A_bot])
-            # Winding for inward-facing (toward center) - reverse winding
-            walls_F.extend([[base, base+2, base+1], [base, base+3, base+2]])
-
-        V_walls = np.array(walls_V, float)
-        F_walls = np.array(walls_F, int)
+        # Outer wall faces outward (away from center); inner wall faces the center
+        V_outer, F_outer = _wall_strip(outer_top, z_outer_top, outer_bot, z_outer_bot)
+        V_inner, F_inner = _wall_strip(
+            inner_top, z_inner_top, inner_bot, z_inner_bot, reverse=True
+        )
+        V_walls = np.vstack([V_outer, V_inner])
+        F_walls = np.vstack([F_outer, F_inner + len(V_outer)])
 
         # Inner column lid: cap the top of the inner column at ground level
         # Reverse inner_top to get CCW winding for upward-facing normals
@@ -987,17 +1401,14 @@ def make_trench_from_path_sloped(path_xy: List[Tuple[float,float]], width_top: f
         }
     else:
         # Original logic for open paths
-        L_top, R_top = _offset_polyline(path_xy, half_top)
-        L_bot, R_bot = _offset_polyline(path_xy, half_bot)
-        poly_top = _ensure_ccw(_ring_from_LR(L_top, R_top))
-        poly_bot = _ensure_ccw(_ring_from_LR(L_bot, R_bot))
+        poly_top = _ensure_ccw(path.footprint_ring(half_top))
+        poly_bot = _ensure_ccw(path.footprint_ring(half_bot))
 
-        gfun = _ground_fn(ground)
         # Top and bottom rings lie on the ground plane and ground-depth respectively
-        z_top = np.array([gfun(x,y) for x,y in poly_top])
-        z_bot = np.array([gfun(x,y) - depth for x,y in poly_bot])
-        tris_top = _ear_clipping_triangulation(poly_top)
-        tris_bot = _ear_clipping_triangulation(poly_bot)
+        z_top = _ground_z(ground, poly_top)
+        z_bot = _ground_z(ground, poly_bot) - depth
+        tris_top = _triangulate_polygon_earcut(poly_top)
+        tris_bot = _triangulate_polygon_earcut(poly_bot)
         V_cap = np.column_stack([poly_top, z_top])
         V_bottom = np.column_stack([poly_bot, z_bot])
         F_cap = tris_top
@@ -1005,21 +1416,8 @@ def make_trench_from_path_sloped(path_xy: List[Tuple[float,float]], width_top: f
         F_bottom = _ensure_upward_normals(V_bottom, tris_bot)
 
         # Walls: connect corresponding indices
-        N = len(poly_top)
-        assert N == len(poly_bot)
-        walls_V = []
-        walls_F = []
-        for i in range(N):
-            j = (i+1) % N
-            A_top = np.array([poly_top[i,0], poly_top[i,1], z_top[i]])
-            B_top = np.array([poly_top[j,0], poly_top[j,1], z_top[j]])
-            A_bot = np.array([poly_bot[i,0], poly_bot[i,1], z_bot[i]])
-            B_bot = np.array([poly_bot[j,0], poly_bot[j,1], z_bot[j]])
-            base = len(walls_V)
-            walls_V.extend([A_top, B_top, B_bot, A_bot])
-            walls_F.extend([[base, base+1, base+2], [base, base+2, base+3]])
-        V_walls = np.array(walls_V, float)
-        F_walls = np.array(walls_F, int)
+        assert len(poly_top) == len(poly_bot)
+        V_walls, F_walls = _wall_strip(poly_top, z_top, poly_bot, z_bot)
 
         extra = {
             "width_top": width_top,
@@ -1041,6 +1439,44 @@ def make_trench_from_path_sloped(path_xy: List[Tuple[float,float]], width_top: f
 
     return groups, poly_top, poly_bot, extra
 
+def _wall_strip(
+    top_xy: np.ndarray, z_top: np.ndarray,
+    bot_xy: np.ndarray, z_bot: np.ndarray,
+    reverse: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Quad strip joining matching vertices of a closed top and bottom ring.
+
+    Edge i -> i+1 gets its own four vertices (A_top, B_top, B_bot, A_bot)
+    and two triangles; ``reverse`` flips the winding for inward-facing walls.
+    """
+    top = np.column_stack([top_xy, z_top])
+    bot = np.column_stack([bot_xy, z_bot])
+    nxt = np.roll(np.arange(len(top)), -1)
+    V = np.stack([top, top[nxt], bot[nxt], bot], axis=1).reshape(-1, 3)
+    tri = np.array([[0, 2, 1], [0, 3, 2]] if reverse else [[0, 1, 2], [0, 2, 3]], int)
+    base = 4 * np.arange(len(top))
+    F = (base[:, None, None] + tri[None, :, :]).reshape(-1, 3)
+    return V.astype(float), F
+
+def _ground_quad_strip(
+    side_a: np.ndarray, side_b: np.ndarray, ground: GroundSpec
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Ground quads between two matching open polylines, lifted to the ground.
+
+    Segment i gets its own four vertices (A_i, A_i+1, B_i+1, B_i), reversed
+    where needed so every quad is CCW in XY, and two triangles.
+    """
+    A = np.column_stack([side_a, _ground_z(ground, side_a)])
+    B = np.column_stack([side_b, _ground_z(ground, side_b)])
+    Q = np.stack([A[:-1], A[1:], B[1:], B[:-1]], axis=1)
+    x, y = Q[:, :, 0], Q[:, :, 1]
+    area = 0.5 * (np.sum(x * np.roll(y, -1, axis=1), axis=1) - np.sum(y * np.roll(x, -1, axis=1), axis=1))
+    Q[area < 0] = Q[area < 0, ::-1]
+    tri = np.array([[0, 1, 2], [0, 2, 3]], int)
+    base = 4 * np.arange(len(Q))
+    F = (base[:, None, None] + tri[None, :, :]).reshape(-1, 3)
+    return Q.reshape(-1, 3), F
+
 def _ensure_upward_normals(V: np.ndarray, F: np.ndarray) -> np.ndarray:
     """Ensure all faces have upward-pointing normals (+z).
 
@@ -1095,6 +1531,32 @@ def _triangulate_polygon_fan(polygon: np.ndarray) -> Tuple[np.ndarray, np.ndarra
     return verts, np.array(tris, dtype=int)
 
 
+def _triangulate_polygon_earcut(poly_xy: np.ndarray) -> np.ndarray:
+    """Triangulate a simple polygon with earcut, keeping CCW triangle winding.
+
+    Indices refer to the rows of ``poly_xy``. Every returned triangle has
+    non-negative signed area, so a CCW polygon yields upward-facing
+    triangles. Falls back to a vertex fan when earcut finds no triangles
+    (fully degenerate outline).
+    """
+    import mapbox_earcut as earcut
+
+    coords = np.asarray(poly_xy, dtype=np.float64)
+    n = len(coords)
+    tris = np.array(
+        earcut.triangulate_float64(coords, np.array([n], dtype=np.uint32)), dtype=int
+    ).reshape(-1, 3)
+    if len(tris) == 0 and n >= 3:
+        k = np.arange(1, n - 1)
+        tris = np.column_stack([np.zeros(n - 2, int), k, k + 1])
+
+    a, b, c = coords[tris[:, 0]], coords[tris[:, 1]], coords[tris[:, 2]]
+    signed = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+    flip = signed < 0
+    tris[flip] = tris[flip][:, [0, 2, 1]]
+    return tris
+
+
 def _triangulate_annulus(outer: np.ndarray, inner: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     """Triangulate the annular region between outer and inner polygons.
 
@@ -1151,18 +1613,17 @@ def make_ground_surface_plane(path_xy: List[Tuple[float,float]], width_top: floa
     """
     half_top = width_top / 2.0
     m = float(max(0.5, ground.size_margin))
-    gfun = _ground_fn(ground)
-    is_closed = _is_path_closed(path_xy)
+    path = _as_trench_path(path_xy)
 
-    if is_closed:
+    if path.is_closed:
         # For closed paths, ground is an annulus from outer boundary to trench edge.
         # Optionally, if fill_interior is set, also fill the interior island.
 
         # Trench outer boundary (edge of trench opening)
-        trench_outer = np.array(_offset_closed_polyline(path_xy, half_top), float)
+        trench_outer = path.offset_ring(half_top)
 
         # Ground outer boundary (edge of ground surface)
-        ground_outer = np.array(_offset_closed_polyline(path_xy, half_top + m), float)
+        ground_outer = path.offset_ring(half_top + m)
 
         # Ensure proper orientations
         trench_outer = _ensure_ccw(trench_outer)
@@ -1170,17 +1631,17 @@ def make_ground_surface_plane(path_xy: List[Tuple[float,float]], width_top: floa
 
         # Outer ground annulus: from ground_outer to trench_outer
         outer_xy, outer_tris = _triangulate_annulus(ground_outer, trench_outer)
-        Vg_outer = np.array([[x, y, gfun(x, y)] for (x, y) in outer_xy], float)
+        Vg_outer = np.column_stack([outer_xy, _ground_z(ground, outer_xy)])
         outer_tris = _ensure_upward_normals(Vg_outer, outer_tris)
 
         result = {"ground_surface": (Vg_outer, outer_tris)}
 
         # Optionally fill the interior island (for loop trenches, not wells/pits)
         if getattr(ground, 'fill_interior', False):
-            trench_inner = np.array(_offset_closed_polyline(path_xy, -half_top), float)
+            trench_inner = path.offset_ring(-half_top)
             trench_inner = _ensure_ccw(trench_inner)
             inner_xy, inner_tris = _triangulate_polygon_fan(trench_inner)
-            Vg_inner = np.array([[x, y, gfun(x, y)] for (x, y) in inner_xy], float)
+            Vg_inner = np.column_stack([inner_xy, _ground_z(ground, inner_xy)])
             inner_tris = _ensure_upward_normals(Vg_inner, inner_tris)
             result["ground_island"] = (Vg_inner, inner_tris)
 
@@ -1193,8 +1654,7 @@ def make_ground_surface_plane(path_xy: List[Tuple[float,float]], width_top: floa
         # that "cut in" at corners, leaving gaps in the ground surface.
 
         # Inner boundary: trench opening at original position (not extended)
-        L_inner, R_inner = _offset_polyline(path_xy, half_top)
-        inner_ring = _ensure_ccw(_ring_from_LR(L_inner, R_inner))
+        inner_ring = _ensure_ccw(path.footprint_ring(half_top))
 
         # Outer boundary: bounding rectangle around trench opening, expanded by margin.
         # This ensures the ground surface is rectangular and fully covers the area
@@ -1216,7 +1676,7 @@ def make_ground_surface_plane(path_xy: List[Tuple[float,float]], width_top: floa
         combined_xy, tris = _triangulate_annulus(outer_ring, inner_ring)
 
         # Apply ground elevation to get 3D vertices
-        Vg = np.array([[x, y, gfun(x, y)] for (x, y) in combined_xy], float)
+        Vg = np.column_stack([combined_xy, _ground_z(ground, combined_xy)])
 
         # Ground normals should point UP (+z) into the air
         tris = _ensure_upward_normals(Vg, tris)
@@ -1242,6 +1702,37 @@ class TrenchLocalFrame:
     wall_slope: float          # Slope of walls
 
 
+@dataclass
+class TrenchLocalFrames:
+    """Batched trench frames: one row per query point (see TrenchLocalFrame)."""
+    centerline_xy: np.ndarray  # (N, 2) closest centerline positions
+    tangent: np.ndarray        # (N, 2) unit tangents of the closest segments
+    left_normal: np.ndarray    # (N, 2) unit normals pointing left
+    top_z: np.ndarray          # (N,) ground elevation at the centerline positions
+    local_u: np.ndarray        # (N,) signed offsets along left_normal
+
+
+def _find_trench_frames(
+    points_xy: np.ndarray,
+    path_xy: List[Tuple[float, float]],
+    ground: GroundSpec,
+) -> TrenchLocalFrames:
+    """Find the trench local frames for a batch of XY positions."""
+    Q = np.asarray(points_xy, float).reshape(-1, 2)
+    pos, tangent, _ = _as_trench_path(path_xy).project(Q)
+    left_normal = np.column_stack([-tangent[:, 1], tangent[:, 0]])
+    sx, sy = ground.slope
+    top_z = ground.z0 + sx * pos[:, 0] + sy * pos[:, 1]
+    local_u = np.einsum("ij,ij->i", Q - pos, left_normal)
+    return TrenchLocalFrames(
+        centerline_xy=pos,
+        tangent=tangent,
+        left_normal=left_normal,
+        top_z=top_z,
+        local_u=local_u,
+    )
+
+
 def _find_trench_frame_at_xy(
     x: float, y: float,
     path_xy: List[Tuple[float, float]],
@@ -1255,38 +1746,17 @@ def _find_trench_frame_at_xy(
     Returns the local coordinate frame and the local 'u' offset (signed
     distance from centerline in left_normal direction).
     """
-    _, total = _polyline_lengths(path_xy)
-
-    # Find closest point on path by sampling
-    best_dist_sq = float("inf")
-    best_s = 0.0
-    n_samples = max(200, int(total * 50))  # ~50 samples per unit length for precision
-    for s_val in np.linspace(0, 1, n_samples):
-        pos, _ = _sample_polyline_at_s(path_xy, s_val)
-        dist_sq = (pos[0] - x) ** 2 + (pos[1] - y) ** 2
-        if dist_sq < best_dist_sq:
-            best_dist_sq = dist_sq
-            best_s = s_val
-
-    pos, tangent = _sample_polyline_at_s(path_xy, best_s)
-    left_normal = _rotate_ccw(tangent)
-    gfun = _ground_fn(ground)
-    top_z = gfun(pos[0], pos[1])
-
-    # Compute local u offset
-    offset_vec = np.array([x - pos[0], y - pos[1]])
-    local_u = float(np.dot(offset_vec, left_normal))
-
+    frames = _find_trench_frames(np.array([[x, y]], float), path_xy, ground)
     frame = TrenchLocalFrame(
-        centerline_xy=pos,
-        tangent=tangent,
-        left_normal=left_normal,
-        top_z=top_z,
+        centerline_xy=frames.centerline_xy[0],
+        tangent=frames.tangent[0],
+        left_normal=frames.left_normal[0],
+        top_z=float(frames.top_z[0]),
         half_width_top=half_top,
         depth=depth,
         wall_slope=wall_slope,
     )
-    return frame, local_u
+    return frame, float(frames.local_u[0])
 
 
 def _point_inside_trench(
@@ -1317,14 +1787,26 @@ def _point_in_polygon_2d(x: float, y: float, polygon: np.ndarray) -> bool:
     Uses the ray-casting algorithm: count how many times a horizontal ray
     from the point intersects the polygon edges. Odd = inside, even = outside.
     """
-    n = len(polygon)
-    inside = False
-    j = n - 1
-    for i in range(n):
-        xi, yi = polygon[i]
-        xj, yj = polygon[j]
-        if ((yi > y) != (yj > y)) and (x < (xj - xi) * (y - yi) / (yj - yi + 1e-12) + xi):
-            inside = not inside
+    return bool(_points_in_polygon_2d(np.array([[x, y]], float), polygon)[0])
+
+
+def _points_in_polygon_2d(points_xy: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """Vectorized ray-casting test for many points against one polygon.
+
+    Edges are visited in the same order as the scalar test and each crossing
+    toggles the parity, so the result matches _point_in_polygon_2d exactly.
+    """
+    Q = np.asarray(points_xy, float).reshape(-1, 2)
+    poly = np.asarray(polygon, float)
+    x = Q[:, 0]
+    y = Q[:, 1]
+    inside = np.zeros(len(Q), dtype=bool)
+    j = len(poly) - 1
+    for i in range(len(poly)):
+        xi, yi = poly[i]
+        xj, yj = poly[j]
+        crosses = ((yi > y) != (yj > y)) & (x < (xj - xi) * (y - yi) / (yj - yi + 1e-12) + xi)
+        inside ^= crosses
         j = i
     return inside
 
@@ -1342,19 +1824,27 @@ def _is_outside_trench_footprint(
 
     Returns True if the point is outside the trench footprint.
     """
-    if _is_path_closed(path_xy):
+    return bool(_outside_trench_footprint_mask(np.array([[x, y]], float), path_xy, half_top)[0])
+
+
+def _outside_trench_footprint_mask(
+    points_xy: np.ndarray,
+    path_xy: List[Tuple[float, float]],
+    half_top: float,
+) -> np.ndarray:
+    """Batched _is_outside_trench_footprint: True where a point lies outside."""
+    path = _as_trench_path(path_xy)
+    if path.is_closed:
         # For closed paths, check if point is between inner and outer rings
-        outer = np.array(_offset_closed_polyline(path_xy, half_top), float)
-        inner = np.array(_offset_closed_polyline(path_xy, -half_top), float)
+        outer = path.offset_ring(half_top)
+        inner = path.offset_ring(-half_top)
         # Point must be inside outer AND outside inner to be in the trench
-        in_outer = _point_in_polygon_2d(x, y, outer)
-        in_inner = _point_in_polygon_2d(x, y, inner)
-        return not (in_outer and not in_inner)
+        in_outer = _points_in_polygon_2d(points_xy, outer)
+        in_inner = _points_in_polygon_2d(points_xy, inner)
+        return ~(in_outer & ~in_inner)
     else:
-        # For open paths, create a closed polygon from left/right offsets
-        L, R = _offset_polyline(path_xy, half_top)
-        footprint = _ring_from_LR(L, R)
-        return not _point_in_polygon_2d(x, y, footprint)
+        # For open paths, use the closed polygon from left/right offsets
+        return ~_points_in_polygon_2d(points_xy, path.footprint_ring(half_top))
 
 
 @dataclass
@@ -1367,6 +1857,134 @@ class TruncationResult:
     was_truncated: bool        # True if any truncation occurred
 
 
+_TRUNCATION_INSET = 1e-6
+
+
+def _affine_feasible_interval(alpha: np.ndarray, beta: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Row-wise interval of t where every ``alpha + beta * t <= 0`` holds.
+
+    ``alpha`` and ``beta`` are (rows, constraints); empty rows get lo > hi.
+    """
+    flat = np.abs(beta) < 1e-15
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root = np.where(flat, 0.0, -alpha / np.where(flat, 1.0, beta))
+    lo = np.where(~flat & (beta < 0), root, -np.inf).max(axis=1)
+    hi = np.where(~flat & (beta > 0), root, np.inf).min(axis=1)
+    hi = np.where((flat & (alpha > 0)).any(axis=1), -np.inf, hi)
+    return lo, hi
+
+
+def _line_polygon_inside_intervals(
+    origin_xy: np.ndarray,
+    dir_xy: np.ndarray,
+    rings: List[np.ndarray],
+) -> List[Tuple[float, float]]:
+    """Parameter intervals where ``origin + t * dir`` lies inside ``rings``.
+
+    Parity over every ring edge, so a closed-path annulus (outer and inner
+    ring together) comes out right. Each edge is tested once.
+    """
+    denom = float(dir_xy @ dir_xy)
+    if denom < 1e-24:
+        inside = any(_points_in_polygon_2d(origin_xy[None, :], ring)[0] for ring in rings)
+        return [(-np.inf, np.inf)] if inside else []
+    crossings = []
+    for ring in rings:
+        P = np.asarray(ring, float) - origin_xy
+        Q = np.roll(P, -1, axis=0)
+        side_p = dir_xy[0] * P[:, 1] - dir_xy[1] * P[:, 0]
+        side_q = dir_xy[0] * Q[:, 1] - dir_xy[1] * Q[:, 0]
+        hit = (side_p > 0) != (side_q > 0)
+        w = side_p[hit] / (side_p[hit] - side_q[hit])
+        X = P[hit] + w[:, None] * (Q[hit] - P[hit])
+        crossings.append(X @ dir_xy / denom)
+    t = np.sort(np.concatenate(crossings))
+    return [(float(t[i]), float(t[i + 1])) for i in range(0, len(t) - 1, 2)]
+
+
+def _pipe_axis_feasible_intervals(
+    center: np.ndarray,
+    axis_dir: np.ndarray,
+    effective_radius: float,
+    path: "TrenchPath",
+    half_top: float,
+    wall_slope: float,
+    ground: GroundSpec,
+    depth: float,
+) -> List[Tuple[float, float]]:
+    """Axis parameters t where a pipe of ``effective_radius`` fits the void.
+
+    Along a straight path segment the ground height, floor, wall offsets and
+    slab bounds are all affine in t, so each segment contributes a single
+    interval; each mitered outer corner adds one more, bounded by the
+    extended wall planes of its two segments. The union is returned
+    unsorted and not yet clipped to the trench footprint.
+    """
+    sx, sy = ground.slope
+    cz, az = float(center[2]), float(axis_dir[2])
+    c_xy = np.asarray(center[:2], float)
+    a_xy = np.asarray(axis_dir[:2], float)
+
+    A = path.points[:-1]
+    T = path.tangents
+    N = path.normals
+    seg_len = path.segment_lengths
+    real = np.flatnonzero(seg_len > 0)
+    if len(real) == 0:
+        return []
+
+    # Along-segment arclength and signed offset, both affine in t.
+    tau0 = np.einsum("ij,ij->i", c_xy - A, T)
+    tau1 = T @ a_xy
+    u0 = np.einsum("ij,ij->i", c_xy - A, N)
+    u1 = N @ a_xy
+
+    def clearance_rows(top0, top1, u_rows):
+        # Floor, ground and sloped walls all hang off the ground height at
+        # the closest centerline point, like placement and the vertex clip.
+        rows = [
+            (top0 - depth - cz + effective_radius, top1 - az),
+            (cz + effective_radius - top0, az - top1),
+        ]
+        half0 = half_top - wall_slope * (top0 - cz)
+        half1 = -wall_slope * (top1 - az)
+        for ua, ub in u_rows:
+            rows.append((ua + effective_radius - half0, ub - half1))
+            rows.append((-ua + effective_radius - half0, -ub - half1))
+        return rows
+
+    # Straight segments: slab 0 <= tau <= length plus clearances.
+    top0 = ground.z0 + sx * (A[:, 0] + tau0 * T[:, 0]) + sy * (A[:, 1] + tau0 * T[:, 1])
+    top1 = tau1 * (sx * T[:, 0] + sy * T[:, 1])
+    rows = [(-tau0, -tau1), (tau0 - seg_len, tau1)]
+    rows += clearance_rows(top0, top1, [(u0, u1)])
+    alpha = np.column_stack([r[0] * np.ones(len(A)) for r in rows])[real]
+    beta = np.column_stack([r[1] * np.ones(len(A)) for r in rows])[real]
+    lo, hi = _affine_feasible_interval(alpha, beta)
+    intervals = [(float(l), float(h)) for l, h in zip(lo, hi) if l <= h]
+
+    # Outer corners: past the end of one segment and before the next one.
+    prev_idx = real[:-1]
+    next_idx = real[1:]
+    if path.is_closed and len(real) > 1:
+        prev_idx = np.append(prev_idx, real[-1])
+        next_idx = np.append(next_idx, real[0])
+    if len(prev_idx):
+        V = path.points[prev_idx + 1]
+        top_v = ground.z0 + sx * V[:, 0] + sy * V[:, 1]
+        rows = [(seg_len[prev_idx] - tau0[prev_idx], -tau1[prev_idx]),
+                (tau0[next_idx], tau1[next_idx])]
+        rows += clearance_rows(
+            top_v, np.zeros(len(V)),
+            [(u0[prev_idx], u1[prev_idx]), (u0[next_idx], u1[next_idx])],
+        )
+        alpha = np.column_stack([r[0] * np.ones(len(V)) for r in rows])
+        beta = np.column_stack([r[1] * np.ones(len(V)) for r in rows])
+        lo, hi = _affine_feasible_interval(alpha, beta)
+        intervals += [(float(l), float(h)) for l, h in zip(lo, hi) if l <= h]
+    return intervals
+
+
 def _compute_pipe_truncation(
     center: np.ndarray,
     axis_dir: np.ndarray,
@@ -1380,9 +1998,10 @@ def _compute_pipe_truncation(
 ) -> TruncationResult:
     """Compute where a pipe axis exits the trench void.
 
-    Samples points along the pipe axis and finds where the pipe surface
-    (considering radius) would exit the trench. Returns truncated extents
-    and the wall/floor planes at each truncation point.
+    Solves for the exact axis parameters where the pipe surface (considering
+    radius) meets the trench floor, ground, sloped walls or footprint edges,
+    with constant work per path segment. Returns truncated extents and the
+    wall/floor planes at each truncation point.
 
     The truncation includes a safety margin to account for cap projection.
     When the pipe is truncated at an angle, the cap vertices project beyond
@@ -1391,88 +2010,58 @@ def _compute_pipe_truncation(
     # Cap safety margin: accounts for cap projection when pipe is at an angle
     # to the trench wall. The margin is proportional to radius with a minimum.
     cap_margin = max(0.02, 0.4 * radius)
+    path = _as_trench_path(path_xy)
+    center = np.asarray(center, float)
+    axis_dir = np.asarray(axis_dir, float)
+
+    # Pipe clearance intervals intersected with the 2D trench footprint
+    # (which handles both path ends AND corners of L/U-shaped trenches).
+    clear = _pipe_axis_feasible_intervals(
+        center, axis_dir, radius + cap_margin, path, half_top, wall_slope, ground, depth
+    )
+    if path.is_closed:
+        rings = [path.offset_ring(half_top), path.offset_ring(-half_top)]
+    else:
+        rings = [path.footprint_ring(half_top)]
+    footprint = _line_polygon_inside_intervals(center[:2], axis_dir[:2], rings)
+    feasible = sorted(
+        (max(a0, b0), min(a1, b1))
+        for a0, a1 in clear for b0, b1 in footprint
+        if max(a0, b0) <= min(a1, b1)
+    )
 
-    def pipe_surface_inside(t: float) -> bool:
-        """Check if pipe surface at axis position t is inside trench.
-
-        Includes cap_margin to ensure angled caps stay inside the boundary.
-        """
-        point = center + t * axis_dir
-        x, y, z = point
-
-        # Get local trench frame
-        frame, local_u = _find_trench_frame_at_xy(
-            x, y, path_xy, half_top, depth, wall_slope, ground
-        )
-
-        # Effective radius includes cap margin for conservative truncation
-        effective_radius = radius + cap_margin
-
-        # Check floor clearance: pipe bottom must be above floor
-        floor_z = frame.top_z - depth
-        if z - effective_radius < floor_z:
-            return False
-
-        # Check ceiling clearance: pipe top must be below ground
-        if z + effective_radius > frame.top_z:
-            return False
-
-        # Check wall clearance: pipe surface must not penetrate walls
-        half_w = _half_width_at_depth(half_top, wall_slope, frame.top_z, z)
-        if abs(local_u) + effective_radius > half_w:
-            return False
-
-        # Check trench footprint: pipe axis must be inside the 2D trench polygon.
-        # This handles both path ends AND internal corners of L/U-shaped trenches.
-        if _is_outside_trench_footprint(x, y, path_xy, half_top):
-            return False
-
-        return True
-
-    def binary_search_boundary(t_inside: float, t_outside: float, tol: float = 0.001) -> float:
-        """Binary search to find boundary between inside and outside."""
-        for _ in range(50):  # Max iterations
-            if abs(t_outside - t_inside) < tol:
-                break
-            t_mid = (t_inside + t_outside) / 2
-            if pipe_surface_inside(t_mid):
-                t_inside = t_mid
-            else:
-                t_outside = t_mid
-        return t_inside
+    # Merge overlapping pieces within the pipe's own length.
+    merged: List[List[float]] = []
+    for a, b in feasible:
+        a, b = max(a, -half_length), min(b, half_length)
+        if a > b:
+            continue
+        if merged and a <= merged[-1][1] + 1e-9:
+            merged[-1][1] = max(merged[-1][1], b)
+        else:
+            merged.append([a, b])
 
-    # Find negative extent
+    # Keep the piece holding the pipe center. If placement left the center
+    # itself infeasible, fall back to the nearest piece, or to a zero-length
+    # pipe when no part of the axis fits; never keep the full length.
     neg_extent = -half_length
-    was_neg_truncated = False
-    if pipe_surface_inside(0):
-        # Search from center toward negative end
-        step = 0.02  # 2cm steps
-        t = 0
-        while t > -half_length:
-            t -= step
-            if not pipe_surface_inside(t):
-                # Found exit, binary search for exact boundary
-                neg_extent = binary_search_boundary(t + step, t)
-                was_neg_truncated = True
-                break
-        if not was_neg_truncated:
-            # Never exited, use full length
-            neg_extent = -half_length
-
-    # Find positive extent
     pos_extent = half_length
-    was_pos_truncated = False
-    if pipe_surface_inside(0):
-        step = 0.02
-        t = 0
-        while t < half_length:
-            t += step
-            if not pipe_surface_inside(t):
-                pos_extent = binary_search_boundary(t - step, t)
-                was_pos_truncated = True
-                break
-        if not was_pos_truncated:
-            pos_extent = half_length
+    if merged:
+        lo, hi = min(merged, key=lambda ab: max(ab[0], -ab[1], 0.0))
+        was_neg_truncated = lo > -half_length
+        was_pos_truncated = hi < half_length
+        # Stop just short of the boundary so the end ring stays strictly
+        # inside the footprint for the vertex clip that follows.
+        if was_neg_truncated:
+            neg_extent = lo + _TRUNCATION_INSET
+        if was_pos_truncated:
+            pos_extent = max(hi - _TRUNCATION_INSET, neg_extent)
+        if lo <= 0.0 <= hi:
+            neg_extent = min(neg_extent, 0.0)
+            pos_extent = max(pos_extent, 0.0)
+    else:
+        neg_extent = pos_extent = 0.0
+        was_neg_truncated = was_pos_truncated = True
 
     # Compute cap planes at truncation points
     neg_cap_plane = None
@@ -1672,49 +2261,34 @@ def _clip_vertices_to_trench(
 
     Any vertex outside the trench is projected back to the nearest boundary.
     This handles edge cases where cap projection pushes vertices outside.
+    The whole (N, 3) array is handled with one frame projection, one wall
+    clamp and one footprint test.
     """
-    V_clipped = V.copy()
-
-    # Pre-compute trench footprint for XY clipping
-    if _is_path_closed(path_xy):
-        outer = np.array(_offset_closed_polyline(path_xy, half_top), float)
-    else:
-        L, R = _offset_polyline(path_xy, half_top)
-        footprint = _ring_from_LR(L, R)
-
-    for i, vert in enumerate(V):
-        x, y, z = vert
-        frame, local_u = _find_trench_frame_at_xy(
-            x, y, path_xy, half_top, depth, wall_slope, ground
-        )
-
-        floor_z = frame.top_z - depth
-        half_w = _half_width_at_depth(half_top, wall_slope, frame.top_z, z)
-
-        # Clip z to floor/ceiling
-        z_clipped = np.clip(z, floor_z, frame.top_z)
-
-        # Clip u to walls (need to update xy)
-        if abs(local_u) > half_w:
-            # Project point back to wall
-            u_clipped = np.sign(local_u) * half_w
-            # Adjust xy: move toward centerline
-            delta_u = u_clipped - local_u
-            x_clipped = x + delta_u * frame.left_normal[0]
-            y_clipped = y + delta_u * frame.left_normal[1]
-        else:
-            x_clipped = x
-            y_clipped = y
-
-        # Also check XY footprint (handles L/U-shaped corners)
-        if _is_outside_trench_footprint(x_clipped, y_clipped, path_xy, half_top):
-            # Project to nearest point on centerline
-            x_clipped = frame.centerline_xy[0]
-            y_clipped = frame.centerline_xy[1]
+    V = np.asarray(V, float)
+    if V.shape[0] == 0:
+        return V.copy()
+
+    frames = _find_trench_frames(V[:, :2], path_xy, ground)
+    z = V[:, 2]
+    floor_z = frames.top_z - depth
+    half_w = np.maximum(1e-6, half_top - wall_slope * (frames.top_z - z))
+
+    # Clip z to floor/ceiling
+    z_clipped = np.clip(z, floor_z, frames.top_z)
+
+    # Clip u to walls: move back toward the centerline along left_normal
+    local_u = frames.local_u
+    beyond_wall = np.abs(local_u) > half_w
+    delta_u = np.sign(local_u) * half_w - local_u
+    xy_clipped = np.where(
+        beyond_wall[:, None], V[:, :2] + delta_u[:, None] * frames.left_normal, V[:, :2]
+    )
 
-        V_clipped[i] = [x_clipped, y_clipped, z_clipped]
+    # Also check XY footprint (handles L/U-shaped corners): project to centerline
+    outside = _outside_trench_footprint_mask(xy_clipped, path_xy, half_top)
+    xy_clipped[outside] = frames.centerline_xy[outside]
 
-    return V_clipped
+    return np.column_stack([xy_clipped, z_clipped])
 
 
 # ---------------- Noise ----------------
@@ -1757,60 +2331,43 @@ def apply_vertex_noise(groups: Dict[str, Tuple[np.ndarray, np.ndarray]], pattern
 
 def _build_surface_groups(
     spec: SceneSpec,
+    timer: Optional[StageTimer] = None,
 ) -> Tuple[Dict[str, Tuple[np.ndarray, np.ndarray]], Dict[str, int], Dict[str, Any]]:
+    """Build every surface group for ``spec``.
+
+    When ``timer`` is given, stage times are charged to it: ``trench``,
+    ``ground``, ``pipe_placement`` (placement and truncation), ``pipe_mesh``,
+    ``pipe_clipping``, ``boxes``, ``spheres`` and ``noise``.
+    """
+    timer = timer if timer is not None else StageTimer()
+    timer.reset_lap()
     groups: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    path = spec.trench_path
 
     trench_groups, _, _, extra = make_trench_from_path_sloped(
-        spec.path_xy, spec.width, spec.depth, spec.wall_slope, spec.ground
+        path, spec.width, spec.depth, spec.wall_slope, spec.ground
     )
     groups.update(trench_groups)
+    timer.lap("trench")
 
     if spec.ground and spec.ground.size_margin > 0:
-        groups.update(make_ground_surface_plane(spec.path_xy, spec.width, spec.ground))
+        groups.update(make_ground_surface_plane(path, spec.width, spec.ground))
     else:
-        L, R = _offset_polyline(spec.path_xy, spec.width / 2.0)
-        gfun = _ground_fn(spec.ground)
-
-        def tri_quad_ccw(v0, v1, v2, v3):
-            poly = np.array([v0, v1, v2, v3], float)
-            if _polygon_area_2d(poly[:, :2]) < 0:
-                poly = poly[::-1]
-            return np.array([[0, 1, 2], [0, 2, 3]], int), poly
-
-        V_left: List[List[float]] = []
-        F_left: List[List[int]] = []
-        for i in range(len(L) - 1):
-            v0 = [L[i][0], L[i][1], gfun(*L[i])]
-            v1 = [L[i + 1][0], L[i + 1][1], gfun(*L[i + 1])]
-            v2 = [spec.path_xy[i + 1][0], spec.path_xy[i + 1][1], gfun(*spec.path_xy[i + 1])]
-            v3 = [spec.path_xy[i][0], spec.path_xy[i][1], gfun(*spec.path_xy[i])]
-            tris, poly = tri_quad_ccw(v0, v1, v2, v3)
-            base = len(V_left)
-            V_left += poly.tolist()
-            F_left += (tris + base).tolist()
-        if V_left:
-            groups["ground_left_strip"] = (np.array(V_left, float), np.array(F_left, int))
-
-        V_right: List[List[float]] = []
-        F_right: List[List[int]] = []
-        for i in range(len(R) - 1):
-            v0 = [spec.path_xy[i][0], spec.path_xy[i][1], gfun(*spec.path_xy[i])]
-            v1 = [spec.path_xy[i + 1][0], spec.path_xy[i + 1][1], gfun(*spec.path_xy[i + 1])]
-            v2 = [R[i + 1][0], R[i + 1][1], gfun(*R[i + 1])]
-            v3 = [R[i][0], R[i][1], gfun(*R[i])]
-            tris, poly = tri_quad_ccw(v0, v1, v2, v3)
-            base = len(V_right)
-            V_right += poly.tolist()
-            F_right += (tris + base).tolist()
-        if V_right:
-            groups["ground_right_strip"] = (np.array(V_right, float), np.array(F_right, int))
+        L, R = path.offset_sides(spec.width / 2.0)
+        for name, side_a, side_b in (
+            ("ground_left_strip", L, path.points),
+            ("ground_right_strip", path.points, R),
+        ):
+            if len(side_a) > 1:
+                groups[name] = _ground_quad_strip(side_a, side_b, spec.ground)
 
     half_top = spec.width * 0.5
     gfun = _ground_fn(spec.ground)
     clearance = 0.02
+    timer.lap("ground")
 
     for idx, p in enumerate(spec.pipes):
-        pos_xy, tangent = _sample_polyline_at_s(spec.path_xy, p.s_center)
+        pos_xy, tangent = path.sample_at_s(p.s_center)
         angle = math.radians(p.angle_deg)
         t_rot = np.array(
             [
@@ -1841,29 +2398,38 @@ def _build_surface_groups(
         # Compute pipe truncation at trench boundaries
         trunc = _compute_pipe_truncation(
             center, axis_dir, p.radius, p.length / 2.0,
-            spec.path_xy, half_top, spec.wall_slope, spec.ground, spec.depth
+            path, half_top, spec.wall_slope, spec.ground, spec.depth
         )
 
+        n_theta, n_along = p.n_theta, p.n_along
+        if spec.tessellation is not None and spec.tessellation.enabled:
+            n_theta, n_along = _pipe_segments(
+                p.radius, trunc.pos_extent - trunc.neg_extent, spec.tessellation
+            )
+        timer.lap("pipe_placement")
+
         cyl = make_cylinder(
             center, axis_dir, p.radius, p.length,
-            p.n_theta, p.n_along, with_caps=True,
+            n_theta, n_along, with_caps=True,
             neg_extent=trunc.neg_extent,
             pos_extent=trunc.pos_extent,
             cap_plane_neg=trunc.neg_cap_plane,
             cap_plane_pos=trunc.pos_cap_plane,
         )
+        timer.lap("pipe_mesh")
         for key, (V, F) in cyl.items():
             # Clip all pipe vertices to trench boundary.
             # This handles both cap projection overshoot AND side vertices that
             # extend beyond the trench footprint due to radial component when
             # the pipe axis is at an angle.
             V = _clip_vertices_to_trench(
-                V, spec.path_xy, half_top, spec.wall_slope, spec.ground, spec.depth
+                V, path, half_top, spec.wall_slope, spec.ground, spec.depth
             )
             groups[f"pipe{idx}_{key}"] = (V, F)
+        timer.lap("pipe_clipping")
 
     for j, b in enumerate(spec.boxes):
-        pos_xy, tangent = _sample_polyline_at_s(spec.path_xy, b.s)
+        pos_xy, tangent = path.sample_at_s(b.s)
         left_normal = _rotate_ccw(tangent)
         top_z = gfun(pos_xy[0], pos_xy[1])
         req_u = float(b.offset_u)
@@ -1880,7 +2446,7 @@ def _build_surface_groups(
         # Compute shrunk box dimensions to fit within trench
         fit_along, fit_across, fit_height = _compute_box_fit(
             center, b.along, b.across, b.height,
-            spec.path_xy, half_top, spec.wall_slope, spec.ground, spec.depth, clearance
+            path, half_top, spec.wall_slope, spec.ground, spec.depth, clearance
         )
 
         # Re-center if height was shrunk
@@ -1898,9 +2464,10 @@ def _build_surface_groups(
         )
         Vb, Fb = make_box(center, frame_cols, (fit_along, fit_across, fit_height))
         groups[f"box{j}"] = (Vb, Fb)
+    timer.lap("boxes")
 
     for k, s in enumerate(spec.spheres):
-        pos_xy, tangent = _sample_polyline_at_s(spec.path_xy, s.s)
+        pos_xy, tangent = path.sample_at_s(s.s)
         left_normal = _rotate_ccw(tangent)
         top_z = gfun(pos_xy[0], pos_xy[1])
         req_u = float(s.offset_u)
@@ -1917,7 +2484,7 @@ def _build_surface_groups(
         # Compute shrunk sphere radius to fit within trench
         fit_radius = _compute_sphere_fit(
             center, s.radius,
-            spec.path_xy, half_top, spec.wall_slope, spec.ground, spec.depth, clearance
+            path, half_top, spec.wall_slope, spec.ground, spec.depth, clearance
         )
 
         # Re-center if radius was shrunk significantly
@@ -1928,8 +2495,12 @@ def _build_surface_groups(
             zc = min(zc, top_z - clearance - fit_radius)  # Also respect ceiling
             center = np.array([ctr_xy[0], ctr_xy[1], zc], float)
 
-        Vs, Fs = make_sphere(center, fit_radius, n_theta=64, n_phi=32)
+        n_theta, n_phi = 64, 32
+        if spec.tessellation is not None and spec.tessellation.enabled:
+            n_theta, n_phi = _sphere_segments(fit_radius, spec.tessellation)
+        Vs, Fs = make_sphere(center, fit_radius, n_theta=n_theta, n_phi=n_phi)
         groups[f"sphere{k}"] = (Vs, Fs)
+    timer.lap("spheres")
 
     if spec.noise and spec.noise.enable:
         groups = apply_vertex_noise(
@@ -1941,6 +2512,7 @@ def _build_surface_groups(
             octaves=spec.noise.octaves,
             gain=spec.noise.gain,
         )
+        timer.lap("noise")
 
     object_counts = {
         "pipes": len(spec.pipes),
@@ -1950,22 +2522,32 @@ def _build_surface_groups(
     return groups, object_counts, extra
 
 
-def generate_surface_mesh(spec: SceneSpec, *, make_preview: bool = False) -> SurfaceMeshResult:
-    groups, object_counts, extra = _build_surface_groups(spec)
-    metrics = _compute_surface_metrics(groups, extra, spec)
+def generate_surface_mesh(
+    spec: SceneSpec, *, make_preview: bool = False, preview_renderer: str = "raster"
+) -> SurfaceMeshResult:
+    timer = StageTimer()
+    groups, object_counts, extra = _build_surface_groups(spec, timer)
+    with timer.stage("metrics"):
+        metrics = _compute_surface_metrics(groups, extra, spec)
     # Exclude internal groups (like cap) from previews to show open-topped trenches
-    previews = _render_surface_previews(groups, exclude_groups=_INTERNAL_GROUPS) if make_preview else {}
+    previews: Dict[str, bytes] = {}
+    if make_preview:
+        with timer.stage("previews"):
+            previews = _render_surface_previews(
+                groups, exclude_groups=_INTERNAL_GROUPS, renderer=preview_renderer
+            )
     return SurfaceMeshResult(
         spec=spec,
         groups=groups,
         object_counts=object_counts,
         metrics=metrics,
         previews=previews,
+        timings=timer.timings,
     )
 
 
-def build_scene(spec: SceneSpec, out_dir: str, make_preview=False):
-    result = generate_surface_mesh(spec, make_preview=make_preview)
+def build_scene(spec: SceneSpec, out_dir: str, make_preview=False, preview_renderer: str = "raster"):
+    result = generate_surface_mesh(spec, make_preview=make_preview, preview_renderer=preview_renderer)
     files = result.persist(out_dir, include_previews=make_preview)
     return {
         "obj_path": files.obj_path.as_posix(),
@@ -1985,11 +2567,16 @@ def scene_spec_from_dict(cfg: Dict[str, Any]) -> SceneSpec:
     noise = NoiseSpec(**noise_cfg) if noise_cfg else NoiseSpec(enable=False)
     ground_cfg = cfg.get("ground", {})
     ground = GroundSpec(**ground_cfg) if ground_cfg else GroundSpec()
+    tess_cfg = cfg.get("tessellation")
+    tessellation = TessellationSpec(**tess_cfg) if tess_cfg else None
+    mesh_size_cfg = cfg.get("mesh_size")
+    mesh_size = MeshSizeSpec(**mesh_size_cfg) if mesh_size_cfg else None
     return SceneSpec(path_xy=[tuple(map(float, p)) for p in cfg["path_xy"]],
                      width=float(cfg["width"]), depth=float(cfg["depth"]),
                      wall_slope=float(cfg.get("wall_slope", 0.0)),
                      ground_margin=float(cfg.get("ground_margin", 0.0)),
-                     pipes=pipes, boxes=boxes, spheres=spheres, noise=noise, ground=ground)
+                     pipes=pipes, boxes=boxes, spheres=spheres, noise=noise, ground=ground,
+                     tessellation=tessellation, mesh_size=mesh_size)
 
 def load_scene_spec_from_json(path: str) -> SceneSpec:
     with open(path,"r") as f: cfg=json.load(f)
@@ -2000,9 +2587,10 @@ def main():
     ap.add_argument("--spec", required=True)
     ap.add_argument("--out", required=True)
     ap.add_argument("--preview", action="store_true")
+    ap.add_argument("--preview-renderer", choices=PREVIEW_RENDERERS, default="raster")
     args=ap.parse_args()
     spec=load_scene_spec_from_json(args.spec)
-    out=build_scene(spec, args.out, make_preview=args.preview)
+    out=build_scene(spec, args.out, make_preview=args.preview, preview_renderer=args.preview_renderer)
     response = {
         "obj_path": out["obj_path"],
         "metrics_path": os.path.join(args.out, "metrics.json"),
@@ -2013,7 +2601,7 @@ def main():
         "footprint_bottom": out["metrics"]["footprint_area_bottom"],
         "trench_from_surface": out["metrics"]["volumes"]["trench_from_surface"]
     }
-    if args.preview and plt is None:
+    if args.preview and args.preview_renderer == "matplotlib" and _load_matplotlib() is None:
         response["preview_note"] = "matplotlib_unavailable"
     print(json.dumps(response, indent=2))
 
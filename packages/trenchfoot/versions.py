@@ -0,0 +1,44 @@
+"""Version stamps shared by the scenario cache and the benchmark harness."""
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+
+
+def source_digest(package_dir: Path = PACKAGE_DIR) -> str:
+    """Short SHA-256 over the names and contents of the package's ``.py`` files."""
+    digest = hashlib.sha256()
+    for src in sorted(Path(package_dir).glob("*.py")):
+        digest.update(src.name.encode())
+        digest.update(src.read_bytes())
+    return "src-" + digest.hexdigest()[:16]
+
+
+def trenchfoot_version() -> str:
+    """Distribution version plus a digest of the package sources.
+
+    The digest is always included: editable and dev installs report the
+    static version from their metadata, so edits to the generator would
+    otherwise never invalidate cached outputs.
+    """
+    source = source_digest()
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:  # pragma: no cover - stdlib always has it on 3.8+
+        return source
+    try:
+        return f"{version('trenchfoot')}+{source}"
+    except PackageNotFoundError:
+        return source
+
+
+def gmsh_version() -> Optional[str]:
+    """Version of the importable gmsh module, or None when it does not load."""
+    try:
+        import gmsh  # type: ignore
+    except Exception:
+        return None
+    return str(getattr(gmsh, "__version__", "unknown"))
@@ -403,6 +403,52 @@ class TestSDFMetadata:
         )
 
 
+    def test_metadata_closed_well_opening_includes_hole(self, tmp_path):
+        """Closed-well openings report the outer ring and the central column as a hole."""
+        s07 = next(s for s in default_scenarios() if s.name == "S07_circular_well")
+        result = generate_surface_mesh(scene_spec_from_dict(s07.spec), make_preview=False)
+        files = result.persist(tmp_path)
+
+        with files.sdf_metadata_path.open() as f:
+            opening = json.load(f)["sdf_metadata"]["trench_opening"]
+
+        outer = np.array(opening["vertices_xy"])
+        assert opening["orientation"] == "ccw"
+        assert len(opening["holes"]) == 1
+        hole = opening["holes"][0]
+        assert hole["orientation"] == "cw"
+        hole_xy = np.array(hole["vertices_xy"])
+        # Outer ring at radius + half width, hole at radius - half width (1.5 -/+ 1.0).
+        assert np.linalg.norm(outer, axis=1).min() > 2.0
+        assert np.linalg.norm(hole_xy, axis=1).max() < 1.0
+
+    def test_boundary_loops_are_vectorized_and_ordered(self):
+        """_extract_boundary_loops returns every loop, chained edge-to-edge, largest first."""
+        from trenchfoot.trench_scene_generator_v3 import _extract_boundary_loops, _extract_boundary_polygon
+
+        n = 40
+        t = np.linspace(0, 2 * np.pi, n, endpoint=False)
+        V = np.r_[np.c_[2 * np.cos(t), 2 * np.sin(t)], np.c_[np.cos(t), np.sin(t)]]
+        V = np.c_[V, np.zeros(2 * n)]
+        i = np.arange(n)
+        j = (i + 1) % n
+        F = np.r_[np.c_[i, j, n + j], np.c_[i, n + j, n + i]]
+
+        loops = _extract_boundary_loops(V, F)
+        assert [loop.orientation for loop in loops] == ["ccw", "cw"]
+        outer, hole = loops
+        assert sorted(outer.indices.tolist()) == list(range(n))
+        assert sorted(hole.indices.tolist()) == list(range(n, 2 * n))
+        # Consecutive loop vertices are mesh neighbours (ring index +/- 1).
+        for loop in loops:
+            steps = (np.diff(np.r_[loop.indices, loop.indices[:1]]) % n)
+            assert set(steps.tolist()) <= {1, n - 1}
+        assert np.allclose(_extract_boundary_polygon(V, F), outer.vertices_xy)
+        closed = np.r_[F, F[:, ::-1]]
+        assert _extract_boundary_loops(V, closed) == []
+        assert _extract_boundary_polygon(V, closed) is None
+
+
 class TestCircularWellNormals:
     """Specific tests for circular well (S07) normal orientation."""
 
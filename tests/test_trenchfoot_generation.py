@@ -871,3 +871,858 @@ def test_no_vertices_outside_trench():
                         f"Vertex {i} of {gname} is outside trench: "
                         f"({x:.3f}, {y:.3f}, {z:.3f})"
                     )
+
+
+def test_trench_frame_projection_is_exact():
+    """Closest-point projection lands exactly on the nearest path segment."""
+    import numpy as np
+    from trenchfoot.trench_scene_generator_v3 import (
+        GroundSpec,
+        _find_trench_frame_at_xy,
+        _find_trench_frames,
+    )
+
+    path_xy = [(0.0, 0.0), (4.0, 0.0), (4.0, 3.0)]
+    ground = GroundSpec(z0=0.5, slope=(0.1, 0.0))
+    points = np.array([[1.234567, 0.3], [4.2, 2.0], [3.9, 0.05], [-1.0, -0.5]], float)
+
+    frames = _find_trench_frames(points, path_xy, ground)
+
+    expected_pos = np.array([[1.234567, 0.0], [4.0, 2.0], [3.9, 0.0], [0.0, 0.0]])
+    np.testing.assert_allclose(frames.centerline_xy, expected_pos, atol=1e-12)
+    np.testing.assert_allclose(frames.local_u, [0.3, -0.2, 0.05, -0.5], atol=1e-12)
+    np.testing.assert_allclose(frames.top_z, 0.5 + 0.1 * expected_pos[:, 0], atol=1e-12)
+
+    for i, (x, y) in enumerate(points):
+        frame, local_u = _find_trench_frame_at_xy(x, y, path_xy, 0.5, 1.0, 0.0, ground)
+        np.testing.assert_allclose(frame.centerline_xy, frames.centerline_xy[i])
+        np.testing.assert_allclose(frame.left_normal, frames.left_normal[i])
+        assert local_u == pytest.approx(frames.local_u[i])
+
+
+def test_clip_vertices_to_trench_batch():
+    """Batch clipping clamps walls/floor/ground and leaves interior points untouched."""
+    import numpy as np
+    from trenchfoot.trench_scene_generator_v3 import GroundSpec, _clip_vertices_to_trench
+
+    path_xy = [(0.0, 0.0), (5.0, 0.0)]
+    V = np.array(
+        [
+            [1.0, 0.2, -0.5],   # inside
+            [2.0, 0.9, -0.5],   # beyond left wall
+            [3.0, -0.7, -1.4],  # beyond right wall and below floor
+            [4.0, 0.0, 0.3],    # above ground
+            [6.0, 0.0, -0.5],   # past the trench end
+        ],
+        float,
+    )
+    clipped = _clip_vertices_to_trench(V, path_xy, 0.5, 0.2, GroundSpec(), 1.0)
+
+    assert clipped.shape == V.shape
+    np.testing.assert_array_equal(clipped[0], V[0])
+    # Sloped walls: half-width is 0.5 - 0.2 * (depth below ground)
+    np.testing.assert_allclose(clipped[1], [2.0, 0.4, -0.5])
+    np.testing.assert_allclose(clipped[2], [3.0, -0.22, -1.0])
+    np.testing.assert_allclose(clipped[3], [4.0, 0.0, 0.0])
+    np.testing.assert_allclose(clipped[4], [5.0, 0.0, -0.5])
+
+
+def test_trench_path_compiled_once_and_vectorized():
+    """TrenchPath is shared per path, memoizes offsets and samples arrays of s."""
+    import numpy as np
+    from trenchfoot.trench_scene_generator_v3 import _is_path_closed, _offset_polyline
+
+    spec = scene_spec_from_dict(_minimal_spec_dict() | {"path_xy": [[0, 0], [4, 0], [4, 3]]})
+    path = spec.trench_path
+    assert path is spec.trench_path
+    assert path is tf.TrenchPath.from_xy([(0.0, 0.0), (4.0, 0.0), (4.0, 3.0)])
+    assert not path.is_closed
+    assert path.total_length == pytest.approx(7.0)
+    np.testing.assert_allclose(path.cum_length, [0.0, 4.0, 7.0])
+
+    s_values = np.array([0.0, 0.25, 4.0 / 7.0, 1.0])
+    pos, tangent = path.sample_at_s(s_values)
+    np.testing.assert_allclose(pos, [[0.0, 0.0], [1.75, 0.0], [4.0, 0.0], [4.0, 3.0]], atol=1e-12)
+    np.testing.assert_allclose(tangent, [[1, 0], [1, 0], [0, 1], [0, 1]], atol=1e-12)
+    for s_val, p_expected in zip(s_values, pos):
+        p_scalar, _ = path.sample_at_s(float(s_val))
+        np.testing.assert_allclose(p_scalar, p_expected)
+
+    L, R = path.offset_sides(0.5)
+    assert path.offset_sides(0.5)[0] is L
+    np.testing.assert_allclose(L, [[0.0, 0.5], [3.5, 0.5], [3.5, 3.0]], atol=1e-12)
+    np.testing.assert_allclose(R, [[0.0, -0.5], [4.5, -0.5], [4.5, 3.0]], atol=1e-12)
+    L_list, _ = _offset_polyline(spec.path_xy, 0.5)
+    np.testing.assert_allclose(np.array(L_list), L)
+
+    # Closure checks accept a compiled path at any threshold.
+    loop = tf.TrenchPath.from_xy([(0.0, 0.0), (4.0, 0.0), (4.0, 3.0), (0.0, 0.05)])
+    assert not _is_path_closed(loop)
+    assert _is_path_closed(loop, threshold=0.1)
+    assert _is_path_closed(path, threshold=10.0)
+
+
+def test_pipe_truncation_is_analytic():
+    """Truncation extents land exactly on walls, path ends and mitered corners."""
+    import numpy as np
+    from trenchfoot.trench_scene_generator_v3 import GroundSpec, _compute_pipe_truncation
+
+    ground = GroundSpec(z0=0.0, slope=(0.0, 0.0))
+    r = 0.1
+    r_eff = r + max(0.02, 0.4 * r)
+    along = np.array([1.0, 0.0, 0.0])
+    across = np.array([0.0, 1.0, 0.0])
+
+    # Straight trench: the footprint ends bound a pipe along the path.
+    straight = [(0.0, 0.0), (6.0, 0.0)]
+    trunc = _compute_pipe_truncation(
+        np.array([3.0, 0.0, -0.5]), along, r, 3.5, straight, 0.6, 0.0, ground, 1.0
+    )
+    assert trunc.was_truncated
+    assert trunc.neg_extent == pytest.approx(-3.0, abs=1e-5)
+    assert trunc.pos_extent == pytest.approx(3.0, abs=1e-5)
+
+    # Across the trench the walls (narrowed by the sloped wall) bound it.
+    trunc = _compute_pipe_truncation(
+        np.array([3.0, 0.0, -0.5]), across, r, 2.0, straight, 0.6, 0.2, ground, 1.0
+    )
+    half_w = 0.6 - 0.2 * 0.5
+    assert trunc.neg_extent == pytest.approx(-(half_w - r_eff), abs=1e-5)
+    assert trunc.pos_extent == pytest.approx(half_w - r_eff, abs=1e-5)
+
+    # L-shaped trench: the outer corner wall stops the pipe, not the footprint.
+    corner = [(0.0, 0.0), (6.0, 0.0), (6.0, 4.0)]
+    trunc = _compute_pipe_truncation(
+        np.array([3.0, 0.0, -0.5]), along, r, 5.0, corner, 0.6, 0.0, ground, 1.0
+    )
+    assert trunc.pos_extent == pytest.approx(3.6 - r_eff, abs=1e-5)
+    assert trunc.pos_cap_plane is not None
+
+    # A short pipe that fits is left untouched.
+    trunc = _compute_pipe_truncation(
+        np.array([3.0, 0.0, -0.5]), along, r, 1.0, straight, 0.6, 0.0, ground, 1.0
+    )
+    assert not trunc.was_truncated
+    assert (trunc.neg_extent, trunc.pos_extent) == (-1.0, 1.0)
+
+
+def test_pipe_truncation_on_sloped_ground():
+    """Placement near a wall on sloped ground still truncates; infeasible centers never span."""
+    import math
+    import numpy as np
+    from trenchfoot.trench_scene_generator_v3 import GroundSpec, _compute_pipe_truncation
+
+    # Centre clamped to the floor against the right wall, like pipe placement
+    # does, with the ground rising across the trench.
+    ground = GroundSpec(z0=0.0, slope=(0.1, 0.0))
+    r = 0.1
+    r_eff = r + max(0.02, 0.4 * r)
+    path = [(0.0, 0.0), (0.0, 10.0)]
+    umax = 0.6 - (r_eff + 0.02)
+    center = np.array([umax, 5.0, -1.0 + r_eff + 0.02])
+    angle = math.radians(60.0)
+    axis = np.array([-math.sin(angle), math.cos(angle), 0.0])
+    trunc = _compute_pipe_truncation(center, axis, r, 1.5, path, 0.6, 0.0, ground, 1.0)
+    assert trunc.was_truncated
+    assert trunc.neg_extent == pytest.approx(-0.02 / math.sin(angle), abs=1e-5)
+    assert 0.0 < trunc.pos_extent < 1.5
+
+    # A centre below the floor leaves nothing that fits: zero length, not full length.
+    trunc = _compute_pipe_truncation(
+        np.array([0.0, 5.0, -1.5]), axis, r, 1.5, path, 0.6, 0.0, ground, 1.0
+    )
+    assert trunc.was_truncated
+    assert trunc.neg_extent == trunc.pos_extent == 0.0
+
+    # A centre past the path end keeps the nearest piece that is inside.
+    trunc = _compute_pipe_truncation(
+        np.array([0.0, -0.5, -0.5]), np.array([0.0, 1.0, 0.0]), r, 1.5, path, 0.6, 0.0, ground, 1.0
+    )
+    assert trunc.was_truncated
+    assert trunc.neg_extent == pytest.approx(0.5, abs=1e-5)
+    assert trunc.pos_extent == 1.5
+
+
+def test_primitive_builders_share_templates():
+    """Cylinders and spheres reuse cached unit templates and keep the grid topology."""
+    import numpy as np
+    from trenchfoot.trench_scene_generator_v3 import _grid_faces, make_box, make_cylinder, make_sphere
+
+    cyl = make_cylinder(np.array([1.0, 2.0, -0.5]), np.array([1.0, 0.0, 0.0]), 0.2, 2.0, 16, 4)
+    V, F = cyl["pipe_side"]
+    assert V.shape == (5 * 17, 3) and F.shape == (2 * 16 * 4, 3)
+    np.testing.assert_array_equal(F[:2], [[0, 17, 18], [0, 18, 1]])
+    np.testing.assert_allclose(np.hypot(V[:, 1] - 2.0, V[:, 2] + 0.5), 0.2)
+    np.testing.assert_allclose([V[:, 0].min(), V[:, 0].max()], [0.0, 2.0])
+    Vc, Fc = cyl["pipe_cap_pos"]
+    assert Vc.shape == (17, 3)
+    np.testing.assert_array_equal(Fc[0], [0, 1, 2])
+
+    # Faces come from the (n_theta, n_along) template but callers get their own copy.
+    F[:] = -1
+    assert _grid_faces(16, 4).min() == 0
+    assert not _grid_faces(16, 4).flags.writeable
+
+    Vs, Fs = make_sphere(np.array([0.0, 0.0, 1.0]), 0.5, n_theta=12, n_phi=6)
+    assert Vs.shape == (7 * 13, 3) and Fs.shape == (2 * 12 * 6, 3)
+    np.testing.assert_allclose(np.linalg.norm(Vs - [0.0, 0.0, 1.0], axis=1), 0.5)
+
+    Vb, Fb = make_box(np.zeros(3), np.eye(3), (2.0, 4.0, 6.0))
+    np.testing.assert_allclose(Vb[0], [-1.0, -2.0, -3.0])
+    np.testing.assert_allclose(Vb[7], [1.0, 2.0, 3.0])
+    assert Fb.shape == (12, 3)
+
+
+def test_long_open_path_cap_and_floor_triangulation():
+    """Cap/floor of a dense open path are covered exactly with CCW triangles."""
+    import numpy as np
+    from trenchfoot.trench_scene_generator_v3 import GroundSpec, make_trench_from_path_sloped
+
+    xs = np.linspace(0.0, 30.0, 1500)
+    path = [(float(x), float(1.5 * np.sin(x / 2.0))) for x in xs]
+    groups, _, _, extra = make_trench_from_path_sloped(path, 1.0, 0.8, 0.1, GroundSpec())
+    for name, area_key in (("trench_cap_for_volume", "area_top"), ("trench_bottom", "area_bottom")):
+        V, F = groups[name]
+        assert len(F) == len(V) - 2
+        cross_z = np.cross(V[F[:, 1]] - V[F[:, 0]], V[F[:, 2]] - V[F[:, 0]])[:, 2]
+        assert np.all(cross_z >= 0.0)
+        assert 0.5 * cross_z.sum() == pytest.approx(extra[area_key], rel=1e-9)
+
+
+def test_ground_fn_accepts_arrays_and_walls_are_strips():
+    """Ground heights evaluate whole arrays; walls and ground strips are quads per edge."""
+    import numpy as np
+    from trenchfoot.trench_scene_generator_v3 import GroundSpec, _ground_fn, make_trench_from_path_sloped
+
+    ground = GroundSpec(z0=0.5, slope=(0.02, -0.01))
+    gfun = _ground_fn(ground)
+    xs = np.array([0.0, 1.5, -2.0])
+    ys = np.array([3.0, -1.0, 0.25])
+    z = gfun(xs, ys)
+    assert isinstance(gfun(1.0, 2.0), float)
+    np.testing.assert_array_equal(z, [gfun(x, y) for x, y in zip(xs, ys)])
+
+    groups, poly_top, _, _ = make_trench_from_path_sloped(
+        [(0.0, 0.0), (4.0, 0.0), (4.0, 3.0)], 1.0, 0.8, 0.1, ground
+    )
+    V, F = groups["trench_walls"]
+    n = len(poly_top)
+    assert V.shape == (4 * n, 3) and F.shape == (2 * n, 3)
+    np.testing.assert_allclose(V[0::4, 2], gfun(poly_top[:, 0], poly_top[:, 1]))
+    np.testing.assert_array_equal(F[:2], [[0, 1, 2], [0, 2, 3]])
+
+    # Legacy ground strips (size_margin 0): one CCW quad per path segment on the ground.
+    spec = scene_spec_from_dict(
+        _minimal_spec_dict()
+        | {"path_xy": [[0, 0], [4, 0], [4, 3]], "ground": {"z0": 0.5, "slope": [0.02, -0.01], "size_margin": 0.0}}
+    )
+    strips = generate_surface_mesh(spec, make_preview=False).groups
+    for name in ("ground_left_strip", "ground_right_strip"):
+        V, F = strips[name]
+        assert V.shape == (8, 3) and F.shape == (4, 3)
+        np.testing.assert_allclose(V[:, 2], gfun(V[:, 0], V[:, 1]))
+        p0, p1, p2 = V[F[:, 0]], V[F[:, 1]], V[F[:, 2]]
+        assert (np.cross(p1 - p0, p2 - p0)[:, 2] > 0).all()
+
+
+def test_write_obj_with_groups_streams_exact_format(tmp_path, monkeypatch):
+    """Streaming OBJ writer keeps the %.9g / 1-based layout across chunk boundaries."""
+    import numpy as np
+    import trenchfoot.trench_scene_generator_v3 as gen
+
+    monkeypatch.setattr(gen, "_OBJ_CHUNK_ROWS", 2)
+    V = np.array([[0.0, -0.0, 1.0], [0.1, 2.5e-12, 123456789.5], [-1.0, 3.0, 7.0]])
+    F = np.array([[0, 1, 2], [2, 1, 0], [0, 2, 1]])
+    path = tmp_path / "groups.obj"
+    gen.write_obj_with_groups(str(path), {"a": (V, F), "empty": (np.zeros((0, 3)), np.zeros((0, 3), int)), "b": (V[:1], F[:0])})
+
+    expected = ["g a"]
+    expected += [f"v {x:.9g} {y:.9g} {z:.9g}" for x, y, z in V]
+    expected += [f"f {a} {b} {c}" for a, b, c in F + 1]
+    expected += ["g empty", "g b", f"v {V[0, 0]:.9g} {V[0, 1]:.9g} {V[0, 2]:.9g}"]
+    assert path.read_bytes() == "\n".join(expected).encode()
+
+
+def test_obj_metrics_parse_each_file_once(tmp_path):
+    """Metric helpers share one cached parse per file version."""
+    import os
+    import numpy as np
+    import trenchfoot.trench_scene_generator_v3 as gen
+
+    V = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+    F = np.array([[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]])
+    path = tmp_path / "tet.obj"
+    gen.write_obj_with_groups(str(path), {"tet": (V, F), "empty": (V[:0], F[:0])})
+
+    parsed_V, parsed = gen.parse_obj_groups(str(path))
+    np.testing.assert_array_equal(parsed_V, V)
+    np.testing.assert_array_equal(parsed["tet"], F)
+    assert parsed["empty"].shape == (0, 3)
+
+    gen._load_obj_groups_cached.cache_clear()
+    areas = gen.surface_area_by_group(str(path))
+    volume = gen.volume_by_groups_as_closed(str(path), ["tet"])
+    flux = gen.flux_volume_from_closed_groups(str(path), ["tet"])
+    assert gen._load_obj_groups_cached.cache_info().misses == 1
+    assert areas["tet"] == pytest.approx(1.5 + np.sqrt(3) / 2)
+    assert volume == pytest.approx(1.0 / 6.0)
+    assert flux == pytest.approx(1.0 / 6.0)
+    cached_V, _ = gen.load_obj_groups(str(path))
+    assert not cached_V.flags.writeable
+
+    # Rewriting the file invalidates the cache entry.
+    gen.write_obj_with_groups(str(path), {"tet": (V * 2.0, F)})
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert gen.volume_by_groups_as_closed(str(path), ["tet"]) == pytest.approx(8.0 / 6.0)
+    assert gen._load_obj_groups_cached.cache_info().misses == 2
+
+
+def test_surface_mesh_binary_roundtrip(tmp_path):
+    """persist(include_binary=True) writes a container that load() memory-maps."""
+    import numpy as np
+    from trenchfoot.array_container import read_array_container, write_array_container
+
+    arrays = {"a": np.arange(6, dtype=np.int32).reshape(2, 3), "empty": np.zeros((0, 3)), "b": np.linspace(0, 1, 5)}
+    container_path = write_array_container(tmp_path / "arrays.bin", arrays, {"note": "x"})
+    container = read_array_container(container_path)
+    assert list(container) == ["a", "empty", "b"] and container.metadata == {"note": "x"}
+    for name, arr in arrays.items():
+        np.testing.assert_array_equal(container[name], arr)
+        assert container[name].dtype == arr.dtype
+    assert not container["a"].flags.writeable
+
+    arrays["zeros"] = np.zeros(4096, dtype=np.int32)
+    packed = read_array_container(write_array_container(tmp_path / "packed.bin", arrays, compress=True))
+    assert packed.is_compressed("zeros") and not packed.is_compressed("empty")
+    assert packed.path.stat().st_size < container_path.stat().st_size + 4096 * 4
+    for mode in ("r", None):
+        reopened = read_array_container(packed.path, mmap_mode=mode)
+        for name, arr in arrays.items():
+            np.testing.assert_array_equal(reopened[name], arr)
+            assert reopened[name].dtype == arr.dtype
+        assert reopened["zeros"].flags.writeable == (mode is None)
+
+    spec = scene_spec_from_dict(_minimal_spec_dict())
+    result = generate_surface_mesh(spec, make_preview=False)
+    files = result.persist(tmp_path / "scene", include_binary=True)
+    assert files.binary_path is not None and files.binary_path.exists()
+
+    loaded = tf.SurfaceMeshResult.load(tmp_path / "scene")
+    assert list(loaded.groups) == list(result.groups)
+    for name, (V, F) in result.groups.items():
+        np.testing.assert_array_equal(loaded.groups[name][0], V)
+        np.testing.assert_array_equal(loaded.groups[name][1], F)
+    assert loaded.spec.path_xy == spec.path_xy
+    assert loaded.metrics == json.loads(json.dumps(result.metrics))
+    assert loaded.object_counts == result.object_counts
+    full_sdf = json.loads(files.sdf_metadata_path.read_text())["sdf_metadata"]
+    assert loaded.sdf_metadata == full_sdf
+    assert not loaded.partial
+
+    subset = tf.SurfaceMeshResult.load(files.binary_path, groups=["trench_walls"])
+    assert list(subset.groups) == ["trench_walls"]
+    assert subset.partial
+    assert subset._build_sdf_metadata()["sdf_metadata"] == full_sdf
+    with pytest.raises(ValueError, match="subset of groups"):
+        subset.persist(tmp_path / "subset")
+    with pytest.raises(KeyError):
+        tf.SurfaceMeshResult.load(files.binary_path, groups=["nope"])
+
+
+def test_generate_scenarios_parallel_jobs_keep_order(tmp_path):
+    """jobs > 1 uses worker processes but reports scenarios in input order."""
+    presets = {d.name: d for d in default_scenarios()}
+    # Slowest first so completion order differs from input order.
+    defs = [presets["S06_bumpy_wide_loop"], presets["S01_straight_vwalls"], presets["S02_straight_slope_pipe"]]
+
+    serial = generate_scenarios(
+        tmp_path / "serial", scenarios=defs, make_preview=False, make_volumes=False
+    )
+    parallel = generate_scenarios(
+        tmp_path / "parallel", scenarios=defs, make_preview=False, make_volumes=False, jobs=3
+    )
+
+    assert [s.name for s in parallel.scenarios] == [d.name for d in defs]
+    summary_json = json.loads((tmp_path / "parallel" / "SUMMARY.json").read_text())
+    assert [s["name"] for s in summary_json["scenarios"]] == [d.name for d in defs]
+    for a, b in zip(serial.scenarios, parallel.scenarios):
+        assert a.object_counts == b.object_counts
+        assert a.trench_from_surface == pytest.approx(b.trench_from_surface)
+        assert b.surface_obj.read_bytes() == a.surface_obj.read_bytes()
+
+
+def test_generate_scenarios_cache_hits_and_misses(tmp_path, monkeypatch):
+    """Unchanged scenarios are reused in place or copied from a shared cache dir."""
+    import importlib
+    import shutil
+    from trenchfoot.generate_scenarios import scenario_cache_key
+    from trenchfoot.versions import source_digest, trenchfoot_version
+
+    spec = _minimal_spec_dict()
+    key = scenario_cache_key(spec, make_preview=False, make_volumes=False, mesh_characteristic_length=0.3)
+
+    # Editing the package sources (e.g. on an editable install) changes the key.
+    pkg = tmp_path / "pkg"
+    shutil.copytree(PKG_ROOT / "trenchfoot", pkg, ignore=shutil.ignore_patterns("scenarios", "__pycache__"))
+    digest = source_digest(pkg)
+    assert source_digest() in trenchfoot_version()
+    with (pkg / "timing.py").open("a") as fh:
+        fh.write("\n# edited\n")
+    assert source_digest(pkg) != digest
+    gs = importlib.import_module("trenchfoot.generate_scenarios")
+    with monkeypatch.context() as m:
+        m.setattr(gs, "trenchfoot_version", lambda: "0.0.0+src-edited")
+        assert scenario_cache_key(spec, make_preview=False, make_volumes=False, mesh_characteristic_length=0.3) != key
+
+    respelled = json.loads(json.dumps(spec).replace("3.0", "3"))
+    assert scenario_cache_key(respelled, make_preview=False, make_volumes=False, mesh_characteristic_length=0.3) == key
+    moved = dict(spec, depth=1.3)
+    assert scenario_cache_key(moved, make_preview=False, make_volumes=False, mesh_characteristic_length=0.3) != key
+    assert scenario_cache_key(spec, make_preview=True, make_volumes=False, mesh_characteristic_length=0.3) != key
+
+    defs = [ScenarioDefinition("a", spec), ScenarioDefinition("b", moved)]
+    cache_dir = tmp_path / "cache"
+    kwargs = dict(make_preview=False, make_volumes=False, cache_dir=cache_dir)
+
+    first = generate_scenarios(tmp_path / "run1", scenarios=defs, **kwargs)
+    assert first.cache_misses == ["a", "b"] and first.cache_hits == []
+
+    obj = first.scenarios[0].surface_obj
+    mtime = obj.stat().st_mtime_ns
+    again = generate_scenarios(tmp_path / "run1", scenarios=defs, **kwargs)
+    assert again.cache_hits == ["a", "b"] and again.cache_misses == []
+    assert obj.stat().st_mtime_ns == mtime
+    assert [s.to_dict() for s in again.scenarios] == [s.to_dict() for s in first.scenarios]
+
+    copied = generate_scenarios(tmp_path / "run2", scenarios=defs[:1], **kwargs)
+    assert copied.cache_hits == ["a"]
+    summary = copied.scenarios[0]
+    assert summary.directory == tmp_path / "run2" / "a"
+    assert summary.surface_obj.read_bytes() == obj.read_bytes()
+    summary_json = json.loads((tmp_path / "run2" / "SUMMARY.json").read_text())
+    assert summary_json["cache"] == {"enabled": True, "hits": ["a"], "misses": []}
+
+    obj.unlink()
+    rebuilt = generate_scenarios(tmp_path / "run1", scenarios=defs[:1], make_preview=False, make_volumes=False, use_cache=True)
+    assert rebuilt.cache_misses == ["a"] and obj.exists()
+
+
+def test_raster_previews_resolve_depth_per_pixel():
+    """The z-buffer rasterizer draws the nearest surface and writes PNG bytes directly."""
+    import struct
+
+    import numpy as np
+    from trenchfoot.preview_raster import PREVIEW_VIEWS, prepare_triangles, render_previews, render_view
+    from trenchfoot.render_colors import color_for_group
+
+    def square(z):
+        V = np.array([[-1, -1, z], [1, -1, z], [1, 1, z], [-1, 1, z]], float)
+        return V, np.array([[0, 1, 2], [0, 2, 3]])
+
+    groups = {"pipe0_pipe_side": square(-0.5), "box0": square(0.5)}
+    tris = prepare_triangles(groups)
+    for projection in ("ortho", "persp"):
+        top = render_view(tris, 90.0, 0.0, size=(64, 48), projection=projection)
+        assert top.shape == (48, 64, 3)
+        box_rgb = np.array([int(color_for_group("box0")[i : i + 2], 16) for i in (1, 3, 5)])
+        # Flat-shaded face lit head-on keeps its hue; the farther pipe must not win.
+        center = top[24, 32].astype(float)
+        assert np.argmax(center) == np.argmax(box_rgb)
+        assert tuple(top[0, 0]) == (255, 255, 255)
+
+    spec = scene_spec_from_dict(_minimal_spec_dict())
+    result = generate_surface_mesh(spec, make_preview=True)
+    assert list(result.previews) == [name for name, _ in PREVIEW_VIEWS]
+    for png in result.previews.values():
+        assert png[:8] == b"\x89PNG\r\n\x1a\n"
+        width, height = struct.unpack(">II", png[16:24])
+        assert (width, height) == (1200, 1050)
+    assert render_previews({}, None) == {}
+
+
+def test_previews_render_views_concurrently_without_pyplot():
+    """Threaded view rendering matches serial output; the matplotlib path avoids pyplot."""
+    import os
+    import subprocess
+    import threading
+
+    from trenchfoot import trench_scene_generator_v3 as gen
+    from trenchfoot.preview_raster import _map_views
+
+    spec = scene_spec_from_dict(_minimal_spec_dict())
+    groups, _, _ = gen._build_surface_groups(spec)
+    serial = gen._render_surface_previews(groups, gen._INTERNAL_GROUPS, max_workers=1)
+    threaded = gen._render_surface_previews(groups, gen._INTERNAL_GROUPS)
+    assert list(threaded) == list(serial) == ["top", "side", "oblique"]
+    assert threaded == serial
+
+    seen = set()
+    views = [("a", (0.0, 0.0)), ("b", (1.0, 0.0)), ("c", (2.0, 0.0))]
+    out = _map_views(lambda v: seen.add(threading.current_thread().name) or b"%d" % v[0], views)
+    assert out == {"a": b"0", "b": b"1", "c": b"2"}
+    assert all(name.startswith("trenchfoot-preview") for name in seen)
+
+    pytest.importorskip("matplotlib")
+    script = (
+        "import sys\n"
+        "from trenchfoot import trench_scene_generator_v3 as gen\n"
+        f"spec = gen.scene_spec_from_dict({_minimal_spec_dict()!r})\n"
+        "groups, _, _ = gen._build_surface_groups(spec)\n"
+        "previews = gen._render_surface_previews(groups, gen._INTERNAL_GROUPS, renderer='matplotlib')\n"
+        "assert list(previews) == ['top', 'side', 'oblique'], list(previews)\n"
+        "assert all(p[:4] == b'\\x89PNG' for p in previews.values())\n"
+        "print('matplotlib.pyplot' in sys.modules)\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": str(PKG_ROOT)},
+        check=True,
+    )
+    assert proc.stdout.strip() == "False"
+
+
+def test_tessellation_tracks_radius_and_length():
+    """A scene-level edge length/chord tolerance sizes each pipe and sphere from its geometry."""
+    import math
+
+    from trenchfoot.trench_scene_generator_v3 import TessellationSpec, _pipe_segments, _ring_segments
+
+    tess = TessellationSpec(target_edge_length=0.05)
+    assert _ring_segments(0.01, tess) == tess.min_segments
+    assert _ring_segments(0.2, tess) == math.ceil(2 * math.pi * 0.2 / 0.05)
+    assert _pipe_segments(0.2, 1.0, tess)[1] == 20
+    # Along the axis only max_along_segments caps the count, not the ring bound.
+    assert _pipe_segments(0.2, 20.0, tess)[1] == 400 > tess.max_segments
+    assert _pipe_segments(0.2, 20.0, TessellationSpec(target_edge_length=0.05, max_along_segments=100))[1] == 100
+    chord = TessellationSpec(chord_tolerance=0.001)
+    n = _ring_segments(0.2, chord)
+    assert 0.2 * (1 - math.cos(math.pi / n)) <= 0.001 < 0.2 * (1 - math.cos(math.pi / (n - 1)))
+    assert _ring_segments(100.0, chord) == chord.max_segments
+
+    base = _minimal_spec_dict()
+    base["pipes"] = [
+        dict(base["pipes"][0], radius=0.02, s_center=0.3),
+        dict(base["pipes"][0], radius=0.2, s_center=0.7),
+    ]
+    base["spheres"] = [{"radius": 0.1, "s": 0.5, "offset_u": 0.0}]
+    legacy = generate_surface_mesh(scene_spec_from_dict(base))
+    assert legacy.groups["pipe0_pipe_side"][1].shape == legacy.groups["pipe1_pipe_side"][1].shape
+
+    spec = scene_spec_from_dict(dict(base, tessellation={"target_edge_length": 0.05}))
+    assert spec.tessellation == TessellationSpec(target_edge_length=0.05)
+    adaptive = generate_surface_mesh(spec)
+    thin = adaptive.groups["pipe0_pipe_side"][1].shape[0]
+    thick = adaptive.groups["pipe1_pipe_side"][1].shape[0]
+    assert thin < thick < legacy.groups["pipe1_pipe_side"][1].shape[0]
+    assert adaptive.groups["sphere0"][1].shape[0] < legacy.groups["sphere0"][1].shape[0]
+
+
+def test_import_trenchfoot_is_lazy():
+    """`import trenchfoot` must not pull in matplotlib, gmsh or plotly."""
+    import os
+    import subprocess
+
+    script = (
+        "import sys\n"
+        "import trenchfoot\n"
+        "heavy = sorted(m for m in ('matplotlib', 'gmsh', 'plotly', 'multiprocessing') if m in sys.modules)\n"
+        "api = all(hasattr(trenchfoot, name) for name in trenchfoot.__all__)\n"
+        "print(repr((heavy, api)))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(PKG_ROOT)}
+    out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env, check=True)
+    heavy, api = eval(out.stdout)
+    assert heavy == []
+    assert api
+
+    if _gmsh_runtime_ready():
+        assert tf.gmsh_available() is True
+        assert tf.VolumeMeshResult is not None
+
+
+def test_stage_timings_reach_results_and_summary(tmp_path):
+    """Stage timers are exposed on the results, SUMMARY.json and the CLI table."""
+    from trenchfoot.generate_scenarios import _format_table
+
+    spec = scene_spec_from_dict(_minimal_spec_dict())
+    result = generate_surface_mesh(spec, make_preview=False)
+    for stage in ("trench", "ground", "pipe_placement", "pipe_mesh", "pipe_clipping", "boxes", "metrics"):
+        assert result.timings[stage] >= 0.0
+    assert "previews" not in result.timings
+    result.persist(tmp_path / "surface")
+    assert {"persist.obj", "persist.metrics", "persist.sdf_metadata"} <= set(result.timings)
+    metrics_json = json.loads((tmp_path / "surface" / "metrics.json").read_text())
+    assert "persist.obj" in metrics_json["timings"]
+    assert "timings" not in result.metrics
+
+    make_volumes = _gmsh_runtime_ready()
+    report = generate_scenarios(
+        tmp_path / "run",
+        scenarios=[ScenarioDefinition("timed", _minimal_spec_dict())],
+        make_preview=False,
+        make_volumes=make_volumes,
+    )
+    timings = report.scenarios[0].timings
+    stage_sum = sum(v for k, v in timings.items() if k != "total")
+    assert 0.0 < stage_sum <= timings["total"]
+    if make_volumes:
+        assert {"volume.geometry", "volume.mesh", "volume.readback"} <= set(timings)
+    summary_json = json.loads((tmp_path / "run" / "SUMMARY.json").read_text())
+    assert summary_json["scenarios"][0]["timings"] == timings
+    assert summary_json["timings"]["total"] == pytest.approx(timings["total"])
+    row = _format_table(report).splitlines()[2]
+    assert f"{timings['total']:.2f}" in row
+    assert max((v, k) for k, v in timings.items() if k != "total")[1] in row
+
+
+def test_benchmark_harness_runs_and_flags_regressions(tmp_path):
+    """The bench harness writes per-stage JSON and its compare mode fails on slowdowns."""
+    from trenchfoot.benchmarks import compare_results, has_regressions, main as bench_main, run_benchmarks
+
+    results = run_benchmarks(quick=True, pattern=r"^(path_vertices/10|noise/on)$", volumes=False)
+    cases = {c["name"]: c for c in results["cases"]}
+    assert list(cases) == ["path_vertices/10", "noise/on"]
+    for case in cases.values():
+        assert case["error"] is None and case["total"] > 0.0
+        assert case["size"]["triangles"] > 0
+    assert "surface.noise" in cases["noise/on"]["stages"]
+    assert results["options"]["repeat"] == 1
+
+    imported = run_benchmarks(quick=True, families=("import",))["cases"]
+    assert [c["name"] for c in imported] == ["import/trenchfoot"]
+    assert imported[0]["error"] is None
+    assert 0.0 < imported[0]["stages"]["import.trenchfoot"] < imported[0]["total"]
+    assert imported[0]["size"]["modules"] > 0
+
+    slower = json.loads(json.dumps(results))
+    case = slower["cases"][1]
+    case["total"] = case["total"] * 3 + 1.0
+    case["stages"]["surface.noise"] = case["stages"]["surface.noise"] * 3 + 1.0
+    slower["cases"].append(dict(case, name="noise/extra"))
+    rows = compare_results(results, slower)
+    flagged = {(r.case, r.stage): r.status for r in rows if r.status != "ok"}
+    assert flagged == {
+        ("noise/on", "total"): "regression",
+        ("noise/on", "surface.noise"): "regression",
+        ("noise/extra", "total"): "new",
+    }
+    assert has_regressions(rows)
+    assert not has_regressions(compare_results(results, results))
+
+    base_path, cur_path = tmp_path / "base.json", tmp_path / "cur.json"
+    base_path.write_text(json.dumps(results))
+    cur_path.write_text(json.dumps(slower))
+    assert bench_main(["compare", str(base_path), str(base_path)]) == 0
+    assert bench_main(["compare", str(base_path), str(cur_path)]) == 1
+
+
+def test_graded_mesh_size_refines_pipes_only():
+    """Distance/threshold fields keep pipe-side resolution with far fewer tetrahedra."""
+    import numpy as np
+
+    from trenchfoot.generate_scenarios import scenario_cache_key
+
+    spec = _minimal_spec_dict()
+    spec["pipes"][0]["mesh_size"] = 0.08
+    spec["mesh_size"] = {"growth": 0.5}
+    scene = scene_spec_from_dict(spec)
+    assert scene.mesh_size == tf.MeshSizeSpec(growth=0.5)
+    assert scene.pipes[0].mesh_size == 0.08
+    key_args = dict(make_preview=False, make_volumes=True, mesh_characteristic_length=0.4)
+    assert scenario_cache_key(spec, **key_args) != scenario_cache_key(_minimal_spec_dict(), **key_args)
+
+    _require_gmsh_runtime()
+
+    def pipe_tets(result):
+        tets = next(b for b in result.element_blocks if b.gmsh_type == 4)
+        pipe_tags = next(g for g in result.physical_groups if g.name == "Pipe0").element_tags[4]
+        order = np.argsort(result.node_tags)
+        conn = tets.node_tags[np.isin(tets.element_tags, pipe_tags)]
+        index = order[np.searchsorted(result.node_tags, conn, sorter=order)]
+        return len(tets.element_tags), result.nodes[index]
+
+    graded = tf.generate_trench_volume(spec, lc=0.4)
+    assert graded.mesh_size == {"far_size": 0.4, "wall_size": None, "pipe_sizes": [0.08], "growth": 0.5}
+    uniform = tf.generate_trench_volume(spec, lc=0.08, mesh_size={"enable": False})
+    assert uniform.mesh_size is None
+
+    n_graded, graded_pipe = pipe_tets(graded)
+    n_uniform, uniform_pipe = pipe_tets(uniform)
+    assert n_graded * 4 < n_uniform
+
+    def median_edge(P):
+        return float(np.median(np.linalg.norm(P[:, 0] - P[:, 1], axis=1)))
+
+    assert median_edge(graded_pipe) == pytest.approx(median_edge(uniform_pipe), rel=0.25)
+
+
+def test_mesher_pool_reuses_workers_and_isolates_failures(tmp_path):
+    """Pool workers keep gmsh alive across jobs; timeouts and bad specs fail only their job."""
+    _require_gmsh_runtime()
+    spec = _minimal_spec_dict()
+    bad = dict(spec, pipes=[dict(spec["pipes"][0], clearance_scale=-1.0)])
+    direct = tf.generate_trench_volume(spec, lc=0.4)
+
+    with tf.MesherPool(workers=2, timeout=60) as pool:
+        results = pool.map([spec, bad, spec], lc=0.4, return_exceptions=True)
+        assert isinstance(results[1], ValueError)
+        assert any("mesher worker" in note for note in results[1].__notes__)
+        for result in (results[0], results[2]):
+            assert result.nodes.shape == direct.nodes.shape
+            assert [g.name for g in result.physical_groups] == [g.name for g in direct.physical_groups]
+
+        slow = pool.submit(spec, lc=0.02, timeout=0.05)
+        with pytest.raises(TimeoutError):
+            slow.result()
+        out = tmp_path / "pooled.msh"
+        after = pool.submit(spec, lc=0.4, persist_path=out).result()
+        assert after.persisted_path == out and out.exists()
+        with pytest.raises(TypeError):
+            pool.submit(spec, finalize=True)
+
+    with pytest.raises(RuntimeError):
+        pool.submit(spec)
+
+
+def test_mesh_threads_and_algorithms_are_applied_and_recorded(tmp_path):
+    """gmsh threading/algorithm options reach the mesher and are reported back."""
+    from trenchfoot.generate_scenarios import scenario_cache_key
+
+    spec = _minimal_spec_dict()
+    key_args = dict(make_preview=False, make_volumes=True, mesh_characteristic_length=0.4)
+    assert scenario_cache_key(spec, **key_args) == scenario_cache_key(spec, mesh_options={"threads": 4}, **key_args)
+    assert scenario_cache_key(spec, **key_args) != scenario_cache_key(
+        spec, mesh_options={"algorithm_3d": "hxt"}, **key_args
+    )
+    with pytest.raises(ValueError, match="3D mesh algorithm"):
+        tf.generate_trench_volume(spec, algorithm_3d="octree")
+
+    _require_gmsh_runtime()
+    result = tf.generate_trench_volume(spec, lc=0.4, threads=2, algorithm_2d=6, algorithm_3d="hxt")
+    assert result.mesh_options == {
+        "threads": 2,
+        "occ_parallel": True,
+        "algorithm_2d": "frontal-delaunay",
+        "algorithm_3d": "hxt",
+    }
+    assert any(b.gmsh_type == 4 and len(b.element_tags) for b in result.element_blocks)
+
+    default = tf.generate_trench_volume(spec, lc=0.4)
+    assert default.mesh_options["algorithm_3d"] == "delaunay"
+
+    # On a live session, options left out are reset rather than inherited.
+    import gmsh
+
+    try:
+        tf.generate_trench_volume(spec, lc=0.4, threads=2, algorithm_3d="hxt", finalize=False)
+        gmsh.clear()
+        reused = tf.generate_trench_volume(spec, lc=0.4, finalize=False)
+        assert reused.mesh_options == default.mesh_options
+        assert reused.mesh_options["threads"] == 1 and not reused.mesh_options["occ_parallel"]
+    finally:
+        if gmsh.isInitialized():
+            gmsh.finalize()
+
+
+def test_volume_readback_is_int32_with_physical_ids():
+    """Readback keeps gmsh arrays as compact numpy and tags each element with its physical group."""
+    import numpy as np
+
+    _require_gmsh_runtime()
+    result = tf.generate_trench_volume(_minimal_spec_dict(), lc=0.4)
+    assert result.node_tags.dtype == np.int32 and result.nodes.shape == (len(result.node_tags), 3)
+    tets = next(b for b in result.element_blocks if b.gmsh_type == 4)
+    assert tets.element_tags.dtype == np.int32 and tets.node_tags.dtype == np.int32
+    assert tets.node_tags.shape == (len(tets.element_tags), 4)
+    assert np.isin(tets.node_tags, result.node_tags).all()
+    assert tets.physical_tags.shape == tets.element_tags.shape
+    assert (tets.physical_tags > 0).all()
+
+    for group in result.physical_groups:
+        assert group.dimension == 3
+        expected = tets.element_tags[tets.physical_tags == group.tag]
+        assert np.array_equal(np.sort(group.element_tags[4]), np.sort(expected))
+    assert sum(len(g.element_tags[4]) for g in result.physical_groups) == len(tets.element_tags)
+    for block in result.element_blocks:
+        if block.gmsh_type != 4:
+            assert not block.physical_tags.any()
+
+
+def test_volume_mesh_binary_msh_and_container_roundtrip(tmp_path):
+    """Binary .msh output plus a .tfmesh container that load() maps without gmsh."""
+    import os
+    import subprocess
+
+    import numpy as np
+
+    _require_gmsh_runtime()
+    out = tmp_path / "vol" / "trench_volume.msh"
+    result = tf.generate_trench_volume(
+        _minimal_spec_dict(), lc=0.4, persist_path=out, binary_msh=True, include_binary=True
+    )
+    assert out.read_bytes().startswith(b"$MeshFormat\n4.1 1 8\n")  # file-type 1 = binary
+    assert result.binary_path == out.with_suffix(".tfmesh") and "write_binary" in result.timings
+
+    loaded = tf.VolumeMeshResult.load(out.parent)
+    np.testing.assert_array_equal(loaded.node_tags, result.node_tags)
+    np.testing.assert_array_equal(loaded.nodes, result.nodes)
+    assert not loaded.nodes.flags.writeable
+    for got, want in zip(loaded.element_blocks, result.element_blocks, strict=True):
+        assert got.gmsh_type == want.gmsh_type
+        for name in ("element_tags", "node_tags", "physical_tags"):
+            np.testing.assert_array_equal(getattr(got, name), getattr(want, name))
+            assert getattr(got, name).dtype == getattr(want, name).dtype
+    for got, want in zip(loaded.physical_groups, result.physical_groups, strict=True):
+        assert (got.dimension, got.tag, got.name, got.entity_tags) == (want.dimension, want.tag, want.name, want.entity_tags)
+        assert got.element_tags.keys() == want.element_tags.keys()
+    assert loaded.pipe_clearances == json.loads(json.dumps(result.pipe_clearances))
+    assert loaded.persisted_path == out and loaded.mesh_options == result.mesh_options
+
+    packed = result.write_binary(tmp_path / "packed.tfmesh", compress=True)
+    assert packed.stat().st_size < result.binary_path.stat().st_size
+    np.testing.assert_array_equal(tf.VolumeMeshResult.load(packed).element_blocks[-1].node_tags, result.element_blocks[-1].node_tags)
+    with pytest.raises(ValueError):
+        tf.VolumeMeshResult.load(packed, mmap_mode="r+")
+
+    script = (
+        "import sys\n"
+        "sys.modules['gmsh'] = None\n"
+        "from trenchfoot.gmsh_sloped_trench_mesher import VolumeMeshResult\n"
+        f"r = VolumeMeshResult.load({str(out.parent)!r})\n"
+        "print(len(r.nodes), 'gmsh' in sys.modules and sys.modules['gmsh'] is not None)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(PKG_ROOT)}
+    proc = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env, check=True)
+    assert proc.stdout.split() == [str(len(result.nodes)), "False"]
+
+
+def test_volume_levels_share_geometry_and_refine(tmp_path):
+    """One geometry build meshes every lc like separate runs; refinement levels split each tet in eight."""
+    generate_trench_volume_levels = tf.generate_trench_volume_levels
+    with pytest.raises(ValueError):
+        generate_trench_volume_levels(_minimal_spec_dict(), [])
+    # Refinement always starts from the last level, so it must be the finest.
+    with pytest.raises(ValueError, match="descending"):
+        generate_trench_volume_levels(_minimal_spec_dict(), [0.25, 0.4], refine_levels=1)
+    with pytest.raises(ValueError, match="finest"):
+        generate_trench_volume_levels(_minimal_spec_dict(), [0.4, None], refine_levels=1)
+    _require_gmsh_runtime()
+    spec = _minimal_spec_dict()
+
+    def tets(result):
+        return len(next(b for b in result.element_blocks if b.gmsh_type == 4).element_tags)
+
+    levels = generate_trench_volume_levels(spec, [0.4, 0.25], refine_levels=1, persist_dir=tmp_path, include_binary=True)
+    assert [r.mesh_characteristic_length for r in levels] == [0.4, 0.25, 0.125]
+    assert [r.refinement_level for r in levels] == [0, 0, 1]
+    assert [tets(r) for r in levels[:2]] == [tets(tf.generate_trench_volume(spec, lc=lc)) for lc in (0.4, 0.25)]
+    assert tets(levels[2]) == 8 * tets(levels[1])
+    assert [g.name for g in levels[2].physical_groups] == [g.name for g in levels[0].physical_groups]
+    assert "geometry" in levels[0].timings and "geometry" not in levels[1].timings
+    assert "refine" in levels[2].timings
+    for i, result in enumerate(levels):
+        assert result.persisted_path == tmp_path / f"level{i}" / "trench_volume.msh"
+        assert tf.VolumeMeshResult.load(tmp_path / f"level{i}").refinement_level == result.refinement_level